@@ -0,0 +1,427 @@
+"""Benchmark the table driven /current decoder against the legacy if-chain.
+
+Run from the repository root with the development requirements installed:
+
+    python -m benchmarks.bench_decoder
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+import timeit
+
+from custom_components.weatherlink.const import (
+    SENSOR_TYPE_AIRLINK,
+    SENSOR_TYPE_VUE_AND_VANTAGE_PRO,
+    DataKey,
+)
+from custom_components.weatherlink.decoder import decode_current
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def legacy_preprocess(indata: dict, primary_tx_id: int) -> dict:  # noqa: C901
+    """Decode like the v2 branch of _preprocess did before the decoder."""
+    outdata = {}
+    tx_id = primary_tx_id
+    outdata.setdefault(tx_id, {})
+    outdata[DataKey.UUID] = indata["station_id_uuid"]
+    for sensor in indata["sensors"]:
+        # Vue
+        if (
+            sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
+            or sensor["sensor_type"] == 55
+        ) and sensor["data_structure_type"] == 10:
+            # _LOGGER.debug("Sensor: %s | %s", sensor["sensor_type"], sensor)
+            tx_id = sensor["data"][0]["tx_id"]
+            outdata.setdefault(tx_id, {})
+            outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
+            outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor["data_structure_type"]
+            outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
+            outdata[tx_id][DataKey.TEMP_OUT] = sensor["data"][0]["temp"]
+            outdata[tx_id][DataKey.HUM_OUT] = sensor["data"][0]["hum"]
+            outdata[tx_id][DataKey.WIND_MPH] = sensor["data"][0]["wind_speed_last"]
+            outdata[tx_id][DataKey.WIND_GUST_MPH] = sensor["data"][0][
+                "wind_speed_hi_last_10_min"
+            ]
+            outdata[tx_id][DataKey.WIND_DIR] = sensor["data"][0]["wind_dir_last"]
+            outdata[tx_id][DataKey.DEWPOINT] = sensor["data"][0]["dew_point"]
+            outdata[tx_id][DataKey.HEAT_INDEX] = sensor["data"][0]["heat_index"]
+            outdata[tx_id][DataKey.THW_INDEX] = sensor["data"][0]["thw_index"]
+            outdata[tx_id][DataKey.THSW_INDEX] = sensor["data"][0]["thsw_index"]
+            outdata[tx_id][DataKey.WET_BULB] = sensor["data"][0]["wet_bulb"]
+            outdata[tx_id][DataKey.WIND_CHILL] = sensor["data"][0]["wind_chill"]
+            outdata[tx_id][DataKey.RAIN_DAY] = sensor["data"][0].get(
+                "rainfall_daily_in", 0.0
+            )
+
+            if (xx := sensor["data"][0].get("rain_storm_in", 0.0)) is None:
+                xx = 0.0
+            outdata[tx_id][DataKey.RAIN_STORM] = xx
+            outdata[tx_id][DataKey.RAIN_STORM_START] = sensor["data"][0].get(
+                "rain_storm_start_at"
+            )
+            if (xx := sensor["data"][0].get("rain_storm_last_in", 0.0)) is None:
+                xx = 0.0
+            outdata[tx_id][DataKey.RAIN_STORM_LAST] = xx
+            outdata[tx_id][DataKey.RAIN_STORM_LAST_START] = sensor["data"][0].get(
+                "rain_storm_last_start_at"
+            )
+            outdata[tx_id][DataKey.RAIN_STORM_LAST_END] = sensor["data"][0].get(
+                "rain_storm_last_end_at"
+            )
+
+            outdata[tx_id][DataKey.RAIN_RATE] = sensor["data"][0]["rain_rate_last_in"]
+            outdata[tx_id][DataKey.RAIN_MONTH] = sensor["data"][0][
+                "rainfall_monthly_in"
+            ]
+            outdata[tx_id][DataKey.RAIN_YEAR] = sensor["data"][0]["rainfall_year_in"]
+            outdata[tx_id][DataKey.TRANS_BATTERY_FLAG] = sensor["data"][0][
+                "trans_battery_flag"
+            ]
+            outdata[tx_id][DataKey.UV_INDEX] = sensor["data"][0]["uv_index"]
+            outdata[tx_id][DataKey.SOLAR_RADIATION] = sensor["data"][0]["solar_rad"]
+            outdata[tx_id][DataKey.ET_DAY] = sensor["data"][0].get("et_day")
+            outdata[tx_id][DataKey.ET_MONTH] = sensor["data"][0].get("et_month")
+            outdata[tx_id][DataKey.ET_YEAR] = sensor["data"][0].get("et_year")
+
+        # ----------- Data structure 2
+        if (
+            sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
+            and sensor["data_structure_type"] == 2
+        ):
+            tx_id = sensor["data"][0].get("tx_id", 1)
+            outdata.setdefault(tx_id, {})
+            outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
+            outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor["data_structure_type"]
+            outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
+            outdata[tx_id][DataKey.TEMP_OUT] = sensor["data"][0]["temp_out"]
+            outdata[tx_id][DataKey.TEMP_IN] = sensor["data"][0]["temp_in"]
+            for numb in range(1, 7 + 1):
+                outdata[tx_id][f"{DataKey.TEMP_EXTRA}_{numb}"] = sensor["data"][0][
+                    f"temp_extra_{numb}"
+                ]
+            for numb in range(1, 4 + 1):
+                outdata[tx_id][f"{DataKey.TEMP_LEAF}_{numb}"] = sensor["data"][0][
+                    f"temp_leaf_{numb}"
+                ]
+            for numb in range(1, 4 + 1):
+                outdata[tx_id][f"{DataKey.TEMP_SOIL}_{numb}"] = sensor["data"][0][
+                    f"temp_soil_{numb}"
+                ]
+            for numb in range(1, 7 + 1):
+                outdata[tx_id][f"{DataKey.HUM_EXTRA}_{numb}"] = sensor["data"][0][
+                    f"hum_extra_{numb}"
+                ]
+            for numb in range(1, 4 + 1):
+                outdata[tx_id][f"{DataKey.MOIST_SOIL}_{numb}"] = sensor["data"][0][
+                    f"moist_soil_{numb}"
+                ]
+            for numb in range(1, 4 + 1):
+                outdata[tx_id][f"{DataKey.WET_LEAF}_{numb}"] = sensor["data"][0][
+                    f"wet_leaf_{numb}"
+                ]
+            outdata[tx_id][DataKey.BAR_SEA_LEVEL] = sensor["data"][0]["bar"]
+            if (xx := sensor["data"][0].get("bar_trend", 0)) is not None:
+                xx = xx / 1000
+            outdata[tx_id][DataKey.BAR_TREND] = xx
+            outdata[tx_id][DataKey.HUM_OUT] = sensor["data"][0]["hum_out"]
+            outdata[tx_id][DataKey.HUM_IN] = sensor["data"][0]["hum_in"]
+            outdata[tx_id][DataKey.WIND_MPH] = sensor["data"][0]["wind_speed"]
+            outdata[tx_id][DataKey.WIND_GUST_MPH] = sensor["data"][0][
+                "wind_gust_10_min"
+            ]
+            outdata[tx_id][DataKey.WIND_DIR] = sensor["data"][0]["wind_dir"]
+            outdata[tx_id][DataKey.DEWPOINT] = sensor["data"][0]["dew_point"]
+            outdata[tx_id][DataKey.HEAT_INDEX] = sensor["data"][0]["heat_index"]
+            outdata[tx_id][DataKey.WIND_CHILL] = sensor["data"][0]["wind_chill"]
+            outdata[tx_id][DataKey.RAIN_DAY] = sensor["data"][0].get("rain_day_in")
+            if (xx := sensor["data"][0].get("rain_storm_in", 0.0)) is None:
+                xx = 0.0
+            outdata[tx_id][DataKey.RAIN_STORM] = xx
+            outdata[tx_id][DataKey.RAIN_STORM_START] = sensor["data"][0].get(
+                "rain_storm_start_date"
+            )
+            outdata[tx_id][DataKey.RAIN_RATE] = sensor["data"][0]["rain_rate_in"]
+            outdata[tx_id][DataKey.RAIN_MONTH] = sensor["data"][0]["rain_month_in"]
+            outdata[tx_id][DataKey.RAIN_YEAR] = sensor["data"][0]["rain_year_in"]
+            outdata[tx_id][DataKey.SOLAR_RADIATION] = sensor["data"][0]["solar_rad"]
+            outdata[tx_id][DataKey.UV_INDEX] = sensor["data"][0]["uv"]
+            outdata[tx_id][DataKey.ET_DAY] = sensor["data"][0]["et_day"]
+            outdata[tx_id][DataKey.ET_MONTH] = sensor["data"][0]["et_month"]
+            outdata[tx_id][DataKey.ET_YEAR] = sensor["data"][0]["et_year"]
+
+        # ----------- Data structure 6 - EnviroMonitor
+        if (
+            sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
+            and sensor["data_structure_type"] == 6
+        ):
+            tx_id = sensor["data"][0].get("tx_id", 1)
+            outdata.setdefault(tx_id, {})
+            outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
+            outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor["data_structure_type"]
+            outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
+            outdata[tx_id][DataKey.TEMP_OUT] = sensor["data"][0]["temp_out"]
+            outdata[tx_id][DataKey.BAR_SEA_LEVEL] = sensor["data"][0]["bar"]
+            if (xx := sensor["data"][0].get("bar_trend", 0)) is not None:
+                xx = xx / 1000
+            outdata[tx_id][DataKey.BAR_TREND] = xx
+            outdata[tx_id][DataKey.HUM_OUT] = sensor["data"][0]["hum_out"]
+            outdata[tx_id][DataKey.WIND_MPH] = sensor["data"][0]["wind_speed"]
+            outdata[tx_id][DataKey.WIND_GUST_MPH] = sensor["data"][0][
+                "wind_gust_10_min"
+            ]
+            outdata[tx_id][DataKey.WIND_DIR] = sensor["data"][0]["wind_dir"]
+            outdata[tx_id][DataKey.DEWPOINT] = sensor["data"][0]["dew_point"]
+            outdata[tx_id][DataKey.HEAT_INDEX] = sensor["data"][0]["heat_index"]
+            outdata[tx_id][DataKey.WIND_CHILL] = sensor["data"][0]["wind_chill"]
+            outdata[tx_id][DataKey.RAIN_DAY] = sensor["data"][0].get("rain_day_in")
+            if (xx := sensor["data"][0].get("rain_storm_in", 0.0)) is None:
+                xx = 0.0
+            outdata[tx_id][DataKey.RAIN_STORM] = xx
+            outdata[tx_id][DataKey.RAIN_STORM_START] = sensor["data"][0].get(
+                "rain_storm_start_date"
+            )
+            outdata[tx_id][DataKey.RAIN_RATE] = sensor["data"][0]["rain_rate_in"]
+            outdata[tx_id][DataKey.SOLAR_RADIATION] = sensor["data"][0]["solar_rad"]
+            outdata[tx_id][DataKey.UV_INDEX] = sensor["data"][0]["uv"]
+            outdata[tx_id][DataKey.ET_DAY] = sensor["data"][0]["et_day"]
+            outdata[tx_id][DataKey.THSW_INDEX] = sensor["data"][0]["thsw_index"]
+            outdata[tx_id][DataKey.WET_BULB] = sensor["data"][0]["wet_bulb"]
+
+        if (
+            sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
+            or sensor["sensor_type"] == 55
+        ) and sensor["data_structure_type"] == 23:
+            tx_id = sensor["data"][0]["tx_id"]
+            outdata.setdefault(tx_id, {})
+            outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
+            outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor["data_structure_type"]
+            outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
+            outdata[tx_id][DataKey.TEMP_OUT] = sensor["data"][0]["temp"]
+            outdata[tx_id][DataKey.HUM_OUT] = sensor["data"][0]["hum"]
+            outdata[tx_id][DataKey.WIND_MPH] = sensor["data"][0]["wind_speed_last"]
+            outdata[tx_id][DataKey.WIND_GUST_MPH] = sensor["data"][0][
+                "wind_speed_hi_last_10_min"
+            ]
+            outdata[tx_id][DataKey.WIND_DIR] = sensor["data"][0]["wind_dir_last"]
+            outdata[tx_id][DataKey.DEWPOINT] = sensor["data"][0]["dew_point"]
+            outdata[tx_id][DataKey.HEAT_INDEX] = sensor["data"][0]["heat_index"]
+            outdata[tx_id][DataKey.THW_INDEX] = sensor["data"][0]["thw_index"]
+            outdata[tx_id][DataKey.THSW_INDEX] = sensor["data"][0]["thsw_index"]
+            outdata[tx_id][DataKey.WET_BULB] = sensor["data"][0]["wet_bulb"]
+            outdata[tx_id][DataKey.WIND_CHILL] = sensor["data"][0]["wind_chill"]
+            outdata[tx_id][DataKey.RAIN_DAY] = sensor["data"][0].get(
+                "rainfall_day_in", 0.0
+            )
+            if (xx := sensor["data"][0].get("rain_storm_current_in", 0.0)) is None:
+                xx = 0.0
+            outdata[tx_id][DataKey.RAIN_STORM] = xx
+            outdata[tx_id][DataKey.RAIN_STORM_START] = sensor["data"][0].get(
+                "rain_storm_current_start_at"
+            )
+            if (xx := sensor["data"][0].get("rain_storm_last_in", 0.0)) is None:
+                xx = 0.0
+            outdata[tx_id][DataKey.RAIN_STORM_LAST] = xx
+            outdata[tx_id][DataKey.RAIN_STORM_LAST_START] = sensor["data"][0].get(
+                "rain_storm_last_start_at"
+            )
+            outdata[tx_id][DataKey.RAIN_STORM_LAST_END] = sensor["data"][0].get(
+                "rain_storm_last_end_at"
+            )
+
+            outdata[tx_id][DataKey.RAIN_RATE] = sensor["data"][0]["rain_rate_last_in"]
+            outdata[tx_id][DataKey.RAIN_MONTH] = sensor["data"][0]["rainfall_month_in"]
+            outdata[tx_id][DataKey.RAIN_YEAR] = sensor["data"][0]["rainfall_year_in"]
+            outdata[tx_id][DataKey.TRANS_BATTERY_FLAG] = sensor["data"][0][
+                "trans_battery_flag"
+            ]
+            outdata[tx_id][DataKey.TRANS_BATTERY_VOLT] = sensor["data"][0][
+                "trans_battery_volt"
+            ]
+            outdata[tx_id][DataKey.SUPERCAP_VOLT] = sensor["data"][0]["supercap_volt"]
+            outdata[tx_id][DataKey.SOLAR_PANEL_VOLT] = sensor["data"][0][
+                "solar_panel_volt"
+            ]
+            outdata[tx_id][DataKey.SOLAR_RADIATION] = sensor["data"][0]["solar_rad"]
+            outdata[tx_id][DataKey.UV_INDEX] = sensor["data"][0]["uv_index"]
+            outdata[tx_id][DataKey.ET_DAY] = sensor["data"][0]["et_day"]
+            outdata[tx_id][DataKey.ET_MONTH] = sensor["data"][0]["et_month"]
+            outdata[tx_id][DataKey.ET_YEAR] = sensor["data"][0]["et_year"]
+
+        if sensor["sensor_type"] == 56 and sensor["data_structure_type"] == 12:
+            tx_id = sensor["data"][0]["tx_id"]
+            outdata.setdefault(tx_id, {})
+            outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
+            outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor["data_structure_type"]
+            outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
+            for numb in range(1, 4 + 1):
+                outdata[tx_id][f"{DataKey.TEMP}_{numb}"] = sensor["data"][0][
+                    f"temp_{numb}"
+                ]
+            for numb in range(1, 4 + 1):
+                outdata[tx_id][f"{DataKey.MOIST_SOIL}_{numb}"] = sensor["data"][0][
+                    f"moist_soil_{numb}"
+                ]
+            for numb in range(1, 2 + 1):
+                outdata[tx_id][f"{DataKey.WET_LEAF}_{numb}"] = sensor["data"][0][
+                    f"wet_leaf_{numb}"
+                ]
+
+        if sensor["sensor_type"] == 56 and sensor["data_structure_type"] == 25:
+            tx_id = sensor["data"][0]["tx_id"]
+            outdata.setdefault(tx_id, {})
+            outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
+            outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor["data_structure_type"]
+            outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
+            for numb in range(1, 4 + 1):
+                outdata[tx_id][f"{DataKey.TEMP}_{numb}"] = sensor["data"][0][
+                    f"temp_{numb}"
+                ]
+            for numb in range(1, 4 + 1):
+                outdata[tx_id][f"{DataKey.MOIST_SOIL}_{numb}"] = sensor["data"][0][
+                    f"moist_soil_{numb}"
+                ]
+            for numb in range(1, 2 + 1):
+                outdata[tx_id][f"{DataKey.WET_LEAF}_{numb}"] = sensor["data"][0][
+                    f"wet_leaf_{numb}"
+                ]
+            outdata[tx_id][DataKey.TRANS_BATTERY_FLAG] = sensor["data"][0][
+                "trans_battery_flag"
+            ]
+
+        if sensor["sensor_type"] == 365 and sensor["data_structure_type"] == 21:
+            tx_id = primary_tx_id
+            outdata[tx_id][DataKey.TEMP_IN] = sensor["data"][0]["temp_in"]
+            outdata[tx_id][DataKey.HUM_IN] = sensor["data"][0]["hum_in"]
+        if sensor["sensor_type"] == 243 and sensor["data_structure_type"] == 12:
+            tx_id = primary_tx_id
+            outdata[tx_id][DataKey.TEMP_IN] = sensor["data"][0]["temp_in"]
+            outdata[tx_id][DataKey.HUM_IN] = sensor["data"][0]["hum_in"]
+        if sensor["sensor_type"] == 242 and sensor["data_structure_type"] == 12:
+            tx_id = primary_tx_id
+            outdata[tx_id][DataKey.BAR_SEA_LEVEL] = sensor["data"][0]["bar_sea_level"]
+            outdata[tx_id][DataKey.BAR_TREND] = sensor["data"][0]["bar_trend"]
+        if sensor["sensor_type"] == 242 and sensor["data_structure_type"] == 19:
+            tx_id = primary_tx_id
+            outdata[tx_id][DataKey.BAR_SEA_LEVEL] = sensor["data"][0]["bar_sea_level"]
+            outdata[tx_id][DataKey.BAR_TREND] = sensor["data"][0]["bar_trend"]
+
+        if (
+            sensor["sensor_type"] in SENSOR_TYPE_AIRLINK
+            and sensor["data_structure_type"] == 16
+        ):
+            tx_id = primary_tx_id
+            tx_id = sensor["lsid"]
+            outdata.setdefault(tx_id, {})
+            outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
+            outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor["data_structure_type"]
+            outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
+            outdata[tx_id][DataKey.TEMP] = sensor["data"][0]["temp"]
+            outdata[tx_id][DataKey.HUM] = sensor["data"][0]["hum"]
+            outdata[tx_id][DataKey.DEWPOINT] = sensor["data"][0]["dew_point"]
+            outdata[tx_id][DataKey.HEAT_INDEX] = sensor["data"][0]["heat_index"]
+            outdata[tx_id][DataKey.WET_BULB] = sensor["data"][0]["wet_bulb"]
+            outdata[tx_id][DataKey.PM_1] = sensor["data"][0]["pm_1"]
+            outdata[tx_id][DataKey.PM_2P5] = sensor["data"][0]["pm_2p5"]
+            outdata[tx_id][DataKey.PM_2P5_24H] = sensor["data"][0]["pm_2p5_24_hour"]
+            outdata[tx_id][DataKey.PM_10] = sensor["data"][0]["pm_10"]
+            outdata[tx_id][DataKey.PM_10_24H] = sensor["data"][0]["pm_10_24_hour"]
+            outdata[tx_id][DataKey.AQI_VAL] = sensor["data"][0]["aqi_val"]
+            outdata[tx_id][DataKey.AQI_NOWCAST_VAL] = sensor["data"][0][
+                "aqi_nowcast_val"
+            ]
+    return outdata
+
+
+def airlink_sensor(lsid: int) -> dict:
+    """Build an AirLink current record."""
+    return {
+        "lsid": lsid,
+        "sensor_type": SENSOR_TYPE_AIRLINK[0],
+        "data_structure_type": 16,
+        "data": [
+            {
+                "ts": 1735386900,
+                "temp": 60.1,
+                "hum": 40.2,
+                "dew_point": 35.0,
+                "heat_index": 59.0,
+                "wet_bulb": 45.0,
+                "pm_1": 1.0,
+                "pm_2p5": 2.5,
+                "pm_2p5_24_hour": 3.0,
+                "pm_10": 10.0,
+                "pm_10_24_hour": 9.0,
+                "aqi_val": 10.4,
+                "aqi_nowcast_val": 11.2,
+            }
+        ],
+    }
+
+
+def synthetic_payload(transmitters: int = 8, airlinks: int = 4) -> dict:
+    """Build a large hub payload with many transmitters and unknown sensors."""
+    base = json.loads((FIXTURES / "strp81_current.json").read_text())
+    iss, inside, baro, health = (
+        next(s for s in base["sensors"] if s["sensor_type"] == sensor_type)
+        for sensor_type in (37, 365, 242, 509)
+    )
+    sensors = [inside, baro]
+    lsid = 800000
+    for tx_id in range(1, transmitters + 1):
+        sensor = copy.deepcopy(iss)
+        sensor["lsid"] = lsid = lsid + 1
+        sensor["sensor_type"] = 55 if tx_id > 1 else 37
+        sensor["data"][0]["tx_id"] = tx_id
+        sensors.append(sensor)
+        soil = {
+            "lsid": (lsid := lsid + 1),
+            "sensor_type": 56,
+            "data_structure_type": 25,
+            "data": [
+                {
+                    "tx_id": tx_id + 100,
+                    "ts": 1735386900,
+                    "trans_battery_flag": 0,
+                    **{f"temp_{numb}": 50.0 + numb for numb in range(1, 5)},
+                    **{f"moist_soil_{numb}": 10 * numb for numb in range(1, 5)},
+                    **{f"wet_leaf_{numb}": 0.5 * numb for numb in range(1, 3)},
+                }
+            ],
+        }
+        sensors.append(soil)
+        sensors.append(copy.deepcopy(health))
+    sensors.extend(airlink_sensor(lsid + 1 + numb) for numb in range(airlinks))
+    return {**base, "sensors": sensors}
+
+
+def run(name: str, payload: dict, number: int) -> None:
+    """Time both decoders on one payload and print the result."""
+    assert decode_current(payload, 1) == legacy_preprocess(payload, 1)
+    legacy = min(
+        timeit.repeat(lambda: legacy_preprocess(payload, 1), number=number, repeat=5)
+    )
+    table = min(
+        timeit.repeat(lambda: decode_current(payload, 1), number=number, repeat=5)
+    )
+    print(  # noqa: T201
+        f"{name:<28} sensors={len(payload['sensors']):>4} "
+        f"legacy={legacy / number * 1e6:8.1f} us "
+        f"table={table / number * 1e6:8.1f} us "
+        f"speedup={legacy / table:4.2f}x"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    fixture = json.loads((FIXTURES / "strp81_current.json").read_text())
+    run("strp81_current.json", fixture, 20000)
+    run("synthetic 8 tx + 4 airlink", synthetic_payload(), 2000)
+    run("synthetic 64 tx + 32 airlink", synthetic_payload(64, 32), 200)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark JSON decoding of the bundled API responses.
+
+Compares the decode of aiohttp's res.json(), which decodes the body to text
+and parses it with the stdlib, to decoding the raw bytes with each available
+decoder. Time is the best of several runs, memory is the peak traced by
+tracemalloc during one decode. Run from the repository root with the
+development requirements installed:
+
+    python -m benchmarks.bench_json
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import partial
+import json
+from pathlib import Path
+import timeit
+import tracemalloc
+from typing import Any
+
+from custom_components.weatherlink.pyweatherlink import json_loads
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def decoders() -> dict[str, Callable[[bytes], Any]]:
+    """Return the decoders that can be imported."""
+    found: dict[str, Callable[[bytes], Any]] = {
+        "res.json()": lambda body: json.loads(body.decode("utf-8")),
+        "json bytes": json.loads,
+    }
+    try:
+        import orjson  # noqa: PLC0415
+    except ImportError:
+        pass
+    else:
+        found["orjson"] = orjson.loads
+    # The decoder used by the hubs
+    found["msgspec"] = json_loads
+    return found
+
+
+def peak_memory(loads: Callable[[bytes], Any], body: bytes) -> int:
+    """Return the peak memory allocated while decoding body."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    result = loads(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def run(path: Path, found: dict[str, Callable[[bytes], Any]]) -> None:
+    """Decode one fixture with each decoder."""
+    body = path.read_bytes()
+    number = max(10, 2_000_000 // len(body))
+    baseline_time = baseline_memory = 0.0
+    for name, loads in found.items():
+        elapsed = min(timeit.repeat(partial(loads, body), number=number, repeat=5))
+        elapsed /= number
+        memory = peak_memory(loads, body)
+        if not baseline_time:
+            baseline_time, baseline_memory = elapsed, memory
+        print(  # noqa: T201
+            f"{path.name:<28} {len(body):>6} B {name:<11} "
+            f"{elapsed * 1e6:8.1f} us  x{baseline_time / elapsed:4.1f}  "
+            f"peak {memory / 1024:7.1f} KiB  "
+            f"saved {1 - memory / baseline_memory:6.1%}"
+        )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    found = decoders()
+    for path in sorted(FIXTURES.glob("*.json")):
+        run(path, found)
+
+
+if __name__ == "__main__":
+    main()
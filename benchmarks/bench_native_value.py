@@ -0,0 +1,172 @@
+"""Benchmark reading the values of sensor entities.
+
+Reads the value of 1,000 entities, built from the sensor descriptions that
+apply to the decoded Strp81 response, as a refresh writing all states does.
+The legacy read compares the key against lists and converts the value on
+every read. The accessor is bound once per entity and reads values that are
+derived once per refresh, whose cost is reported separately. Run from the
+repository root with the development requirements installed:
+
+    python -m benchmarks.bench_native_value
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from itertools import cycle, islice
+import json
+from pathlib import Path
+import timeit
+from types import SimpleNamespace
+from typing import Any
+
+from custom_components.weatherlink.const import DataKey
+from custom_components.weatherlink.decoder import decode_current
+from custom_components.weatherlink.derived import DERIVED_FROM, derive_values
+from custom_components.weatherlink.sensor import (
+    SENSOR_TYPES,
+    WLSensorDescription,
+    source_tag,
+    value_accessor,
+)
+from homeassistant.util import dt as dt_util
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+ENTITIES = 1000
+
+
+def is_float(in_string: Any) -> bool:
+    """Check if string is float."""
+    try:
+        float(in_string)
+    except ValueError:
+        return False
+    return True
+
+
+def legacy_native_value(  # noqa: C901
+    coordinator: Any, tx_id: int, description: WLSensorDescription
+) -> Any:
+    """Return the value like WLSensor.native_value did.
+
+    The description has the tag the value is derived from, as before.
+    """
+    if description.key not in [
+        "LastUpdate",
+        "WindDir",
+        "BarTrend",
+        "WindGust",
+    ]:
+        return coordinator.data[tx_id].get(description.tag)
+
+    if description.tag == DataKey.WIND_GUST_MPH:
+        if (
+            coordinator.data[tx_id].get(description.tag) is None
+            or float(coordinator.data[tx_id].get(description.tag)) < 0
+        ):
+            return None
+        if float(coordinator.data[tx_id].get(description.tag)) < 0:
+            return 0.0
+        return coordinator.data[tx_id].get(description.tag)
+
+    if description.tag == DataKey.WIND_DIR:
+        if coordinator.data[tx_id][description.tag] is None:
+            return None
+        directions = [
+            "n",
+            "nne",
+            "ne",
+            "ene",
+            "e",
+            "ese",
+            "se",
+            "sse",
+            "s",
+            "ssw",
+            "sw",
+            "wsw",
+            "w",
+            "wnw",
+            "nw",
+            "nnw",
+        ]
+        index = int(
+            ((float(coordinator.data[tx_id][description.tag]) + 11.25) % 360) // 22.5
+        )
+        return directions[index]
+
+    if description.key == "BarTrend":
+        bar_trend = coordinator.data[tx_id].get(description.tag)
+        if bar_trend is None:
+            return None
+        if is_float(bar_trend):
+            if bar_trend >= 0.060:
+                return "rising_rapidly"
+            if bar_trend >= 0.020:
+                return "rising_slowly"
+            if bar_trend > -0.020:
+                return "steady"
+            if bar_trend > -0.060:
+                return "falling_slowly"
+            return "falling_rapidly"
+        return str(bar_trend).lower().replace(" ", "_")
+
+    if description.key == "LastUpdate":
+        return dt_util.utc_from_timestamp(
+            coordinator.data[tx_id].get(DataKey.TIMESTAMP)
+        )
+
+    return None
+
+
+def main() -> None:
+    """Run the benchmark."""
+    indata = json.loads((FIXTURES / "strp81_current.json").read_text())
+    data = derive_values(decode_current(indata, 1))
+    coordinator = SimpleNamespace(data=data)
+    descriptions = [
+        description
+        for description in SENSOR_TYPES
+        if data[1].get(source_tag(description)) is not None
+    ]
+    entities = list(islice(cycle(descriptions), ENTITIES))
+    legacy_entities = [
+        replace(description, tag=source_tag(description)) for description in entities
+    ]
+
+    accessors = [
+        value_accessor(coordinator, 1, description) for description in entities
+    ]
+    assert [accessor() for accessor in accessors] == [
+        legacy_native_value(coordinator, 1, description)
+        for description in legacy_entities
+    ]
+
+    def legacy() -> None:
+        for description in legacy_entities:
+            legacy_native_value(coordinator, 1, description)
+
+    def bound() -> None:
+        for accessor in accessors:
+            accessor()
+
+    results = {
+        name: min(timeit.repeat(read, number=100, repeat=5)) / 100
+        for name, read in (("legacy", legacy), ("accessor", bound))
+    }
+    derived = decode_current(indata, 1)
+    derive = min(timeit.repeat(lambda: derive_values(derived), number=100, repeat=5))
+    special = sum(description.tag in DERIVED_FROM for description in entities)
+    print(  # noqa: T201
+        f"entities={ENTITIES} transformed={special} "
+        + " ".join(
+            f"{name}={elapsed * 1e6:7.1f} us" for name, elapsed in results.items()
+        )
+        + f" speedup={results['legacy'] / results['accessor']:4.1f}x"
+        + f" derive per refresh={derive / 100 * 1e6:5.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark typed struct decoding of /current responses against dicts.
+
+Both paths start from the raw response bytes. The dict path parses the
+whole body with the JSON decoder of the hubs and runs decode_current, the
+typed path decodes into structs and runs decode_current_struct. Memory is
+the peak traced by tracemalloc during one refresh and the size of the
+parsed response kept for diagnostics. The typed response also keeps the
+body alive through its raw record spans, which is not counted. Run from the repository root with
+the development requirements installed:
+
+    python -m benchmarks.bench_schema
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import timeit
+import tracemalloc
+from typing import Any
+
+from custom_components.weatherlink.decoder import decode_current
+from custom_components.weatherlink.pyweatherlink import json_loads
+from custom_components.weatherlink.schema import CURRENT_DECODER, decode_current_struct
+
+from .bench_decoder import synthetic_payload
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def dict_refresh(body: bytes) -> tuple[Any, dict]:
+    """Decode a refresh through dicts."""
+    payload = json_loads(body)
+    return payload, decode_current(payload, 1)
+
+
+def struct_refresh(body: bytes) -> tuple[Any, dict]:
+    """Decode a refresh through typed structs."""
+    current = CURRENT_DECODER.decode(body)
+    return current, decode_current_struct(current, 1)
+
+
+def traced(refresh, body: bytes) -> tuple[int, int]:
+    """Return peak memory of a refresh and the memory of its parsed response."""
+    tracemalloc.start()
+    parsed = refresh(body)[0]
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+    return peak, retained
+
+
+def run(name: str, payload: dict, number: int) -> None:
+    """Time both paths on one payload and print the result."""
+    body = json.dumps(payload).encode()
+    assert dict_refresh(body)[1] == struct_refresh(body)[1]
+    results = {}
+    for label, refresh in (("dict", dict_refresh), ("struct", struct_refresh)):
+        elapsed = min(timeit.repeat(lambda r=refresh: r(body), number=number, repeat=5))
+        results[label] = (elapsed / number, *traced(refresh, body))
+    (dict_time, dict_peak, dict_kept) = results["dict"]
+    (struct_time, struct_peak, struct_kept) = results["struct"]
+    print(  # noqa: T201
+        f"{name:<28} {len(body) / 1024:6.1f} KiB "
+        f"dict={dict_time * 1e6:8.1f} us struct={struct_time * 1e6:8.1f} us "
+        f"speedup={dict_time / struct_time:4.2f}x "
+        f"peak {dict_peak / 1024:6.1f} -> {struct_peak / 1024:6.1f} KiB "
+        f"parsed {dict_kept / 1024:6.1f} -> {struct_kept / 1024:6.1f} KiB"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    fixture = json.loads((FIXTURES / "strp81_current.json").read_text())
+    run("strp81_current.json", fixture, 20000)
+    run("synthetic 8 tx + 4 airlink", synthetic_payload(), 2000)
+    run("synthetic 64 tx + 32 airlink", synthetic_payload(64, 32), 200)
+
+
+if __name__ == "__main__":
+    main()
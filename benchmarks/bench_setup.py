@@ -0,0 +1,221 @@
+"""Benchmark entity naming, model lookups and device info at setup.
+
+A synthetic station with 500 sensors is set up the way the platforms
+do: descriptions are matched to the sensors and each entity looks up the
+name and model of its device. The legacy lookups scan the sensor metadata
+for every entity and build a DeviceInfo of their own, the index is built
+once and its DeviceInfo shared by the entities of a transmitter. The
+memory held by the device info of all entities is reported too. Run from
+the repository root with the development requirements installed:
+
+    python -m benchmarks.bench_setup
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import timeit
+import tracemalloc
+
+from custom_components.weatherlink.binary_sensor import (
+    AUX_SENSOR_TYPES as AUX_BINARY_SENSOR_TYPES,
+    SENSOR_TYPES as BINARY_SENSOR_TYPES,
+)
+from custom_components.weatherlink.const import (
+    CONFIG_URL,
+    DOMAIN,
+    MANUFACTURER,
+    SENSOR_TYPE_AIRLINK,
+    SENSOR_TYPE_VUE_AND_VANTAGE_PRO,
+    ApiVersion,
+    DataKey,
+)
+from custom_components.weatherlink.sensor import AUX_SENSOR_TYPES, SENSOR_TYPES
+from custom_components.weatherlink.station_index import build_topology, gateway_type
+from homeassistant.helpers.device_registry import DeviceInfo
+
+PRIMARY_TX_ID = 1
+
+
+def synthetic_station(sensors: int = 500) -> tuple[dict, list[dict]]:
+    """Build station data and metadata of a station with many sensors."""
+    station_data = {
+        "stations": [
+            {
+                "station_id": 1,
+                "station_name": "Synthetic",
+                "product_number": "6100",
+                "firmware_version": "1.0",
+                "gateway_id_hex": "001D0A000001",
+            }
+        ]
+    }
+    metadata = [
+        {
+            "lsid": 1000,
+            "sensor_type": 37,
+            "tx_id": PRIMARY_TX_ID,
+            "product_name": "Vantage Vue, Wireless",
+            "parent_device_name": "Synthetic",
+        }
+    ]
+    kinds = (
+        (55, "Sensor Suite"),
+        (56, "Leaf/Soil"),
+        (SENSOR_TYPE_AIRLINK[0], "AirLink"),
+    )
+    for numb in range(1, sensors):
+        sensor_type, product_name = kinds[numb % len(kinds)]
+        metadata.append(
+            {
+                "lsid": 1000 + numb,
+                "sensor_type": sensor_type,
+                "tx_id": None if sensor_type in SENSOR_TYPE_AIRLINK else 1 + numb,
+                "product_name": product_name,
+                "parent_device_name": "Synthetic",
+            }
+        )
+    return station_data, metadata
+
+
+def legacy_name(station_data: dict, sensors: list[dict], tx_id: int) -> str:
+    """Return the device name like WLEntity.generate_name did."""
+    if tx_id == PRIMARY_TX_ID:
+        return station_data["stations"][0]["station_name"]
+    for sensor in sensors:
+        if sensor["sensor_type"] in (55, 56) and sensor["tx_id"] == tx_id:
+            return f"{sensor['product_name']} ID{sensor['tx_id']}"
+        if sensor["sensor_type"] in SENSOR_TYPE_AIRLINK and sensor["lsid"] == tx_id:
+            return f"{sensor['product_name']} {sensor['parent_device_name']}"
+    return "Unknown devicename"
+
+
+def legacy_model(station_data: dict, sensors: list[dict], tx_id: int) -> str:
+    """Return the device model like WLEntity.generate_model did."""
+    product_name = ""
+    for sensor in sensors:
+        if (
+            sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
+            and sensor["tx_id"] is None
+            or sensor["tx_id"] == tx_id
+        ):
+            product_name = sensor.get("product_name")
+            break
+        if sensor["sensor_type"] in SENSOR_TYPE_AIRLINK and sensor["lsid"] == tx_id:
+            product_name = sensor.get("product_name")
+            break
+    gateway = gateway_type(station_data["stations"][0].get("product_number"))
+    return f"{gateway} / {product_name}" if tx_id == PRIMARY_TX_ID else product_name
+
+
+def legacy_device_info(
+    station_data: dict, sensors: list[dict], data: dict, tx_id: int
+) -> DeviceInfo:
+    """Return the device info of an entity like WLEntity.__init__ built it."""
+    station = station_data["stations"][0]
+    unique_id_base = data[DataKey.UUID]
+    tx_id_part = f"-{tx_id}" if tx_id != PRIMARY_TX_ID else ""
+    if (
+        legacy_model(station_data, sensors, tx_id).startswith("AirLink")
+        and data.get(1) == {}
+    ):
+        tx_id_part = ""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"{unique_id_base}{tx_id_part}")},
+        name=legacy_name(station_data, sensors, tx_id),
+        manufacturer=MANUFACTURER,
+        model=legacy_model(station_data, sensors, tx_id),
+        sw_version=station.get("firmware_version"),
+        serial_number=station.get("gateway_id_hex"),
+        configuration_url=CONFIG_URL,
+        via_device=(DOMAIN, unique_id_base) if tx_id_part != "" else None,
+    )
+
+
+def entities(sensors: list[dict], by_type: Callable[[dict], tuple]) -> list[tuple]:
+    """Return (tx_id, description) of the entities of the auxiliary sensors."""
+    return [
+        (sensor["tx_id"] or sensor["lsid"], description)
+        for sensor in sensors
+        if sensor["tx_id"] != PRIMARY_TX_ID
+        for description in by_type(sensor)
+    ]
+
+
+def run(sensors: int) -> None:
+    """Time the setup of the entities of a station."""
+    station_data, metadata = synthetic_station(sensors)
+    data = {DataKey.UUID: "uuid", PRIMARY_TX_ID: {"temp": 1}}
+
+    def legacy() -> list[DeviceInfo]:
+        found = entities(
+            metadata,
+            lambda sensor: tuple(
+                description
+                for description in (*SENSOR_TYPES, *BINARY_SENSOR_TYPES)
+                if sensor["sensor_type"] in description.aux_sensors
+            ),
+        )
+        return [
+            legacy_device_info(station_data, metadata, data, tx_id)
+            for tx_id, _ in found
+        ]
+
+    def indexed() -> list[DeviceInfo]:
+        topology = build_topology(
+            ApiVersion.API_V2, station_data, metadata, PRIMARY_TX_ID, data
+        )
+        found = entities(
+            metadata,
+            lambda sensor: (
+                *AUX_SENSOR_TYPES.get(sensor["sensor_type"], ()),
+                *AUX_BINARY_SENSOR_TYPES.get(sensor["sensor_type"], ()),
+            ),
+        )
+        return [topology.device(tx_id).device_info for tx_id, _ in found]
+
+    assert legacy() == indexed()
+    topology = build_topology(
+        ApiVersion.API_V2, station_data, metadata, PRIMARY_TX_ID, data
+    )
+    for tx_id, device in topology.devices.items():
+        assert device.device_info["name"] == legacy_name(station_data, metadata, tx_id)
+        assert device.device_info["model"] == legacy_model(
+            station_data, metadata, tx_id
+        )
+    results = {}
+    memory = {}
+    for name, setup in (("legacy scan", legacy), ("index", indexed)):
+        results[name] = min(timeit.repeat(setup, number=3, repeat=3)) / 3
+        memory[name] = retained(setup)
+    print(  # noqa: T201
+        f"sensors={sensors:>4} entities={len(indexed()):>5} "
+        + " ".join(
+            f"{name}={elapsed * 1000:8.2f} ms {memory[name] / 1024:7.0f} KiB"
+            for name, elapsed in results.items()
+        )
+        + f" speedup={results['legacy scan'] / results['index']:6.1f}x"
+    )
+
+
+def retained(setup: Callable[[], list[DeviceInfo]]) -> int:
+    """Return the memory held by the device info a setup returns."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        device_infos = setup()
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del device_infos
+    return held
+
+
+def main() -> None:
+    """Run the benchmark."""
+    for sensors in (50, 500):
+        run(sensors)
+
+
+if __name__ == "__main__":
+    main()
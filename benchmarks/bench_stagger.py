@@ -0,0 +1,126 @@
+"""Peak concurrent requests and event loop lag of staggered refreshes.
+
+Refreshes of 200 entries are run against a local mock of the /current
+endpoint, each fetching with WLHubV2 and decoding the response. Without
+staggering all entries refresh on the same moments, as coordinators aligned
+to the same uploads do. With staggering each entry waits for its slot. The
+interval is shortened so that a run takes seconds. Run from the repository
+root with the development requirements installed:
+
+    python -m benchmarks.bench_stagger
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from statistics import quantiles
+from time import time
+
+from aiohttp import ClientSession, TCPConnector, web
+from aiohttp.test_utils import TestServer
+
+from custom_components.weatherlink import pyweatherlink
+from custom_components.weatherlink.pyweatherlink import WLHubV2
+from custom_components.weatherlink.ratelimit import WLRateLimiter
+from custom_components.weatherlink.schema import decode_current_struct
+from custom_components.weatherlink.stagger import WLRefreshStagger
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+ENTRIES = 200
+INTERVAL = 2.0
+CYCLES = 3
+# Latency of the mock API
+LATENCY = 0.05
+LAG_PROBE = 0.005
+
+
+class MockApi:
+    """The /current endpoint counting requests in flight."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.body = (FIXTURES / "strp81_current.json").read_bytes()
+        self.in_flight = 0
+        self.peak = 0
+
+    async def current(self, request: web.Request) -> web.Response:
+        """Answer after the latency of the API."""
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(LATENCY)
+            return web.Response(body=self.body, content_type="application/json")
+        finally:
+            self.in_flight -= 1
+
+
+async def probe_lag(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(LAG_PROBE)
+        lags.append(loop.time() - start - LAG_PROBE)
+
+
+async def run(staggered: bool) -> None:
+    """Refresh all entries for a few intervals."""
+    api = MockApi()
+    app = web.Application()
+    app.router.add_get("/v2/current/{station_id}", api.current)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    pyweatherlink.API_V2_URL = str(server.make_url("/v2/"))
+
+    stagger = WLRefreshStagger()
+    station_ids = [str(167531 + index) for index in range(ENTRIES)]
+    for station_id in station_ids:
+        stagger.async_add(station_id, station_id)
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+    # No connection limit, so that the peak is not capped by the pool
+    async with ClientSession(connector=TCPConnector(limit=0)) as session:
+
+        async def entry(station_id: str) -> None:
+            # Each entry has a key of its own, like separate accounts
+            hub = WLHubV2(
+                api_key_v2=station_id,
+                api_secret="secret",
+                websession=session,
+                station_id=station_id,
+                limiter=WLRateLimiter(rate=100, burst=100, budget=10000),
+            )
+            for _ in range(CYCLES):
+                delay = (
+                    stagger.delay(station_id, time(), INTERVAL)
+                    if staggered
+                    else INTERVAL - time() % INTERVAL
+                )
+                await asyncio.sleep(delay)
+                decode_current_struct(await hub.get_current(), 1)
+
+        probe = asyncio.create_task(probe_lag(lags, stop))
+        await asyncio.gather(*(entry(station_id) for station_id in station_ids))
+        stop.set()
+        await probe
+    await server.close()
+
+    p99 = quantiles(lags, n=100)[98]
+    print(  # noqa: T201
+        f"{'staggered' if staggered else 'aligned':<10} entries={ENTRIES} "
+        f"peak requests={api.peak:>4} "
+        f"loop lag p99={p99 * 1000:6.1f} ms max={max(lags) * 1000:6.1f} ms"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    asyncio.run(run(staggered=False))
+    asyncio.run(run(staggered=True))
+
+
+if __name__ == "__main__":
+    main()
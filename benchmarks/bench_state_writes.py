@@ -0,0 +1,110 @@
+"""Count state writes per refresh with change aware listener notification.
+
+Every refresh of the synthetic hub payload advances all timestamps and
+moves the fast changing ISS and AirLink values, while soil, leaf, rain and
+ET values stay put. Run from the repository root with the development
+requirements installed:
+
+    python -m benchmarks.bench_state_writes
+"""
+
+from __future__ import annotations
+
+import copy
+import random
+import timeit
+
+from custom_components.weatherlink.binary_sensor import (
+    SENSOR_TYPES as BINARY_SENSOR_TYPES,
+)
+from custom_components.weatherlink.coordinator import changed_keys, context_changed
+from custom_components.weatherlink.decoder import decode_current
+from custom_components.weatherlink.sensor import SENSOR_TYPES
+
+from .bench_decoder import synthetic_payload
+
+REFRESHES = 48
+MOVING = {
+    "temp",
+    "hum",
+    "dew_point",
+    "wet_bulb",
+    "heat_index",
+    "wind_chill",
+    "thw_index",
+    "thsw_index",
+    "wind_speed_last",
+    "wind_dir_last",
+    "wind_speed_hi_last_10_min",
+    "solar_rad",
+    "temp_in",
+    "bar_sea_level",
+    "pm_1",
+    "pm_2p5",
+    "pm_10",
+    "aqi_val",
+    "aqi_nowcast_val",
+}
+
+
+def entity_contexts(data: dict) -> list[tuple]:
+    """Return listener contexts for the entities a setup would create."""
+    return [
+        (tx_id, frozenset((description.tag, *description.extra_tags)))
+        for tx_id, values in data.items()
+        if isinstance(values, dict)
+        for description in (*SENSOR_TYPES, *BINARY_SENSOR_TYPES)
+        if values.get(description.tag) is not None
+    ]
+
+
+def refreshes(payload: dict, count: int) -> list[dict]:
+    """Build successive uploads of a payload."""
+    rng = random.Random(1)
+    uploads = []
+    for numb in range(1, count + 1):
+        upload = copy.deepcopy(payload)
+        for sensor in upload["sensors"]:
+            for record in sensor["data"]:
+                record["ts"] += 60 * numb
+                for key, value in record.items():
+                    if key in MOVING and isinstance(value, float | int):
+                        record[key] = round(value + rng.choice((-0.1, 0, 0.1)), 1)
+        uploads.append(upload)
+    return uploads
+
+
+def run(name: str, payload: dict) -> None:
+    """Count listener calls with and without change detection."""
+    previous = decode_current(payload, 1)
+    contexts = entity_contexts(previous)
+    decoded = [decode_current(upload, 1) for upload in refreshes(payload, REFRESHES)]
+
+    def notified() -> int:
+        calls = 0
+        last = previous
+        for data in decoded:
+            changed = changed_keys(last, data)
+            calls += sum(context_changed(context, changed) for context in contexts)
+            last = data
+        return calls
+
+    writes = notified()
+    elapsed = min(timeit.repeat(notified, number=10, repeat=5)) / 10
+    print(  # noqa: T201
+        f"{name:<28} entities={len(contexts):>5} "
+        f"writes/refresh all={len(contexts):>5} "
+        f"changed={writes / REFRESHES:7.1f} "
+        f"reduction={1 - writes / REFRESHES / len(contexts):5.1%} "
+        f"diff={elapsed / REFRESHES * 1e6:7.1f} us/refresh"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    run("synthetic 8 tx + 4 airlink", synthetic_payload())
+    run("synthetic 64 tx + 32 airlink", synthetic_payload(64, 32))
+
+
+if __name__ == "__main__":
+    main()
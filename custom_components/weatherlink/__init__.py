@@ -3,33 +3,63 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
 from datetime import timedelta
 from email.utils import mktime_tz, parsedate_tz
+from functools import partial
 import logging
+from time import time
 
-from aiohttp import ClientError, ClientResponseError
+from aiohttp import ClientError, ClientResponseError, ClientSession
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceEntry
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.update_coordinator import UpdateFailed
 
+from .account import (
+    WLAccount,
+    async_create_hub,
+    async_get_account,
+    async_release_account,
+)
+from .backfill import BACKFILL_MIN_GAP, async_backfill
 from .const import (
+    ALL_STATIONS,
     CONF_API_KEY_V2,
     CONF_API_SECRET,
     CONF_API_TOKEN,
     CONF_API_VERSION,
+    CONF_REALTIME,
+    CONF_REALTIME_INTERVAL,
     CONF_STATION_ID,
+    DEFAULT_REALTIME_INTERVAL,
     DOMAIN,
+    FAMILY_UPDATE_INTERVAL,
+    LOCAL_UPDATE_INTERVAL,
+    SENSOR_TYPE_AIRLINK,
+    SENSOR_TYPE_SOIL_LEAF,
+    SENSOR_TYPE_VUE_AND_VANTAGE_PRO,
+    STATIONS_CONCURRENCY,
     ApiVersion,
     DataKey,
+    SensorFamily,
 )
-from .pyweatherlink import WLHub, WLHubV2
+from .coordinator import WLDataUpdateCoordinator
+from .decoder import decode_local, local_metadata
+from .pyweatherlink import WLHub, WLHubLocal, WLHubV2
+from .realtime import WLRealtimeListener
+from .scheduler import UploadScheduler
+from .schema import Current, decode_current_struct
+from .session import async_acquire_session, async_release_session
+from .stagger import STAGGER_WINDOW, async_add_entry, async_get_stagger
+from .station_index import WLTopology, build_topology
+from .storage import WLMetadataStore, WLSnapshotStore, topology
 
 type WLConfigEntry = ConfigEntry[WLData]
 
@@ -38,48 +68,26 @@ type WLConfigEntry = ConfigEntry[WLData]
 class WLData:
     """WIP."""
 
-    api: WLHub | WLHubV2
+    api: WLHub | WLHubV2 | WLHubLocal
     primary_tx_id: int
     station_data: dict
     sensors_metadata: dict
-    coordinator: DataUpdateCoordinator
-    current: dict
+    coordinator: WLDataUpdateCoordinator
+    current: dict | Current
+    realtime: WLRealtimeListener | None = None
+    account: WLAccount | None = None
+    stations: dict[str, WLData] = field(default_factory=dict)
+    families: dict[SensorFamily, WLDataUpdateCoordinator] = field(default_factory=dict)
+    tx_families: dict[int, SensorFamily] = field(default_factory=dict)
+    topology: WLTopology | None = None
+    scheduler: UploadScheduler | None = None
 
+    def coordinator_for(self, tx_id: int) -> WLDataUpdateCoordinator:
+        """Return the coordinator of the sensor family of a transmitter."""
+        return self.families.get(self.tx_families.get(tx_id), self.coordinator)
 
-PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
-SENSOR_TYPE_VUE_AND_VANTAGE_PRO = (
-    23,
-    24,
-    27,
-    28,
-    33,
-    34,
-    37,
-    43,
-    44,
-    45,
-    46,
-    48,
-    49,
-    50,
-    51,
-    76,
-    77,
-    78,
-    79,
-    80,
-    81,
-    82,
-    83,
-    84,
-    85,
-    87,
-)
 
-SENSOR_TYPE_AIRLINK = (
-    323,
-    326,
-)
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -96,9 +104,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: WLConfigEntry) -> bool:
         current={},
     )
 
+    if entry.data[CONF_API_VERSION] != ApiVersion.API_LOCAL:
+        websession = async_acquire_session(hass, entry).session
+        entry.async_on_unload(partial(async_release_session, hass, entry))
+
     if entry.data[CONF_API_VERSION] == ApiVersion.API_V1:
         entry.runtime_data.api = WLHub(
-            websession=async_get_clientsession(hass),
+            websession=websession,
             username=entry.data[CONF_USERNAME],
             password=entry.data[CONF_PASSWORD],
             apitoken=entry.data[CONF_API_TOKEN],
@@ -107,51 +119,62 @@ async def async_setup_entry(hass: HomeAssistant, entry: WLConfigEntry) -> bool:
         tx_ids = [1]
 
     if entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-        entry.runtime_data.api = WLHubV2(
+        entry.runtime_data.api = async_create_hub(
+            hass,
+            entry.data[CONF_API_KEY_V2],
+            entry.data[CONF_API_SECRET],
+            entry.data[CONF_STATION_ID],
+            websession,
+        )
+        account = entry.runtime_data.account = async_get_account(
+            hass, entry, websession
+        )
+        entry.async_on_unload(lambda: async_release_account(hass, entry))
+
+    if entry.data.get(CONF_STATION_ID) == ALL_STATIONS:
+        entry.runtime_data.api = account.api
+        await async_setup_stations(hass, entry, account, websession)
+        tx_ids = []
+    elif entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
+        store = WLMetadataStore(hass, entry)
+        if (station := await store.async_load()) is None:
+            station = await async_get_station(entry, account)
+            await store.async_save(*station)
+        else:
+            entry.async_create_background_task(
+                hass,
+                async_revalidate_station(hass, entry, account, store, station),
+                "weatherlink_revalidate_station",
+            )
+        entry.runtime_data.station_data, sensors = station
+
+        tx_ids = vantage_tx_ids(sensors)
+        entry.runtime_data.sensors_metadata = sensors
+        # todo Make primary_tx_id configurable by user - perhaps in config flow.
+        entry.runtime_data.primary_tx_id = min(tx_ids)
+
+    if entry.data[CONF_API_VERSION] == ApiVersion.API_LOCAL:
+        # Local entries poll the device on the LAN. The manifest keeps
+        # cloud_polling as iot_class, as it takes a single class and the
+        # API v1 and v2 entries of the integration poll the cloud.
+        entry.runtime_data.api = WLHubLocal(
+            host=entry.data[CONF_HOST],
             websession=async_get_clientsession(hass),
-            station_id=entry.data[CONF_STATION_ID],
-            api_key_v2=entry.data[CONF_API_KEY_V2],
-            api_secret=entry.data[CONF_API_SECRET],
         )
         try:
-            entry.runtime_data.station_data = await entry.runtime_data.api.get_station()
-
-            all_sensors = await entry.runtime_data.api.get_all_sensors()
-        except ClientResponseError as err:
-            if err.status == 401:
-                raise ConfigEntryAuthFailed(
-                    translation_domain=DOMAIN,
-                    translation_key="config_entry_auth_failed",
-                ) from err
-            raise ConfigEntryNotReady(
-                translation_domain=DOMAIN,
-                translation_key="config_entry_not_ready",
-            ) from err
-        except ClientError as err:
+            async with asyncio.timeout(10):
+                conditions = await entry.runtime_data.api.get_data()
+        except (ClientError, TimeoutError) as err:
             raise ConfigEntryNotReady(
                 translation_domain=DOMAIN,
                 translation_key="config_entry_not_ready",
             ) from err
-
-        sensors = []
-        tx_ids = []
-        for sensor in all_sensors["sensors"]:
-            if (
-                sensor["station_id"]
-                == entry.runtime_data.station_data["stations"][0]["station_id"]
-            ):
-                sensors.append(sensor)
-                if (
-                    sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
-                    and sensor["tx_id"] is not None
-                    and sensor["tx_id"] not in tx_ids
-                ):
-                    tx_ids.append(sensor["tx_id"])
+        entry.runtime_data.station_data, sensors = local_metadata(
+            conditions, entry.title
+        )
         entry.runtime_data.sensors_metadata = sensors
-        # todo Make primary_tx_id configurable by user - perhaps in config flow.
-        if len(tx_ids) == 0:
-            tx_ids = [1]
-        entry.runtime_data.primary_tx_id = min(tx_ids)
+        tx_ids = [sensor["tx_id"] for sensor in sensors if sensor["sensor_type"] == 55]
+        entry.runtime_data.primary_tx_id = min(tx_ids, default=1)
 
     _LOGGER.debug("Primary tx_ids: %s", tx_ids)
     coordinator = await get_coordinator(hass, entry)
@@ -159,28 +182,321 @@ async def async_setup_entry(hass: HomeAssistant, entry: WLConfigEntry) -> bool:
         await coordinator.async_config_entry_first_refresh()
     _LOGGER.debug("First data: %s", coordinator.data)
 
+    if entry.data[CONF_API_VERSION] == ApiVersion.API_V2 and not (
+        entry.runtime_data.stations
+    ):
+        async_setup_families(hass, entry)
+
     device_registry = dr.async_get(hass)
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, get_unique_id_base(entry))},
-        name=entry.title,
-    )
+    for station in entry_stations(entry):
+        if station.coordinator.data is None:
+            continue
+        station.topology = build_topology(
+            entry.data[CONF_API_VERSION],
+            station.station_data,
+            station.sensors_metadata,
+            station.primary_tx_id,
+            station.coordinator.data,
+        )
+        device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={(DOMAIN, station.topology.unique_id_base)},
+            name=entry.title
+            if station is entry.runtime_data
+            else station.station_data["stations"][0]["station_name"],
+        )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if coordinator.restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), "weatherlink_first_refresh"
+        )
+
+    if (
+        entry.data[CONF_API_VERSION] == ApiVersion.API_LOCAL
+        and entry.options.get(CONF_REALTIME, True)
+        and any(sensor["sensor_type"] == 55 for sensor in sensors)
+    ):
+        await async_start_realtime(hass, entry)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     return True
 
 
-def get_unique_id_base(entry: WLConfigEntry):
-    """Generate base for unique_id."""
-    unique_base = None
-    if entry.data[CONF_API_VERSION] == ApiVersion.API_V1:
-        unique_base = entry.runtime_data.coordinator.data[
-            entry.runtime_data.primary_tx_id
-        ]["DID"]
-    if entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-        unique_base = entry.runtime_data.coordinator.data[DataKey.UUID]
-    return unique_base
+async def async_start_realtime(hass: HomeAssistant, entry: WLConfigEntry) -> None:
+    """Listen for the real-time broadcast of wind and rain of a WeatherLink Live.
+
+    The entry keeps polling when the device cannot be reached by broadcast.
+    """
+    listener = WLRealtimeListener(
+        hass,
+        entry.runtime_data.api,
+        entry.runtime_data.coordinator,
+        entry.runtime_data.coordinator.data[DataKey.UUID],
+        entry.options.get(CONF_REALTIME_INTERVAL, DEFAULT_REALTIME_INTERVAL),
+    )
+    entry.async_on_unload(listener.async_stop)
+    try:
+        async with asyncio.timeout(10):
+            await listener.async_start()
+    except (ClientError, TimeoutError, OSError) as err:
+        _LOGGER.warning("Real-time broadcast of %s not available: %s", entry.title, err)
+        listener.async_stop()
+        return
+    entry.runtime_data.realtime = listener
+
+
+async def async_update_options(hass: HomeAssistant, entry: WLConfigEntry) -> None:
+    """Reload the entry when the options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def vantage_tx_ids(sensors: list[dict]) -> list[int]:
+    """Return the transmitter ids of the Vantage sensors of a station."""
+    tx_ids = []
+    for sensor in sensors:
+        if (
+            sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
+            and sensor["tx_id"] is not None
+            and sensor["tx_id"] not in tx_ids
+        ):
+            tx_ids.append(sensor["tx_id"])
+    return tx_ids or [1]
+
+
+def sensor_families(sensors: list[dict]) -> dict[int, SensorFamily]:
+    """Return the sensor family of the transmitters that are not ISS.
+
+    AirLink data is keyed by lsid, other sensors by tx_id.
+    """
+    families = {}
+    for sensor in sensors:
+        if sensor["sensor_type"] in SENSOR_TYPE_AIRLINK:
+            families[sensor["lsid"]] = SensorFamily.AIRLINK
+        elif (
+            sensor["sensor_type"] in SENSOR_TYPE_SOIL_LEAF
+            and sensor["tx_id"] is not None
+        ):
+            families[sensor["tx_id"]] = SensorFamily.SOIL_LEAF
+    return families
+
+
+@callback
+def async_setup_families(hass: HomeAssistant, entry: WLConfigEntry) -> None:
+    """Set up a coordinator for each sensor family of a station but the ISS.
+
+    The ISS family is refreshed by the coordinator of the entry on the upload
+    interval. The other families take the /current response of each refresh
+    of the entry, and only call the listeners of their own entities. A family
+    whose interval is shorter than the upload period also fetches /current on
+    its own when the entry has not refreshed within its interval.
+    """
+    runtime_data = entry.runtime_data
+    runtime_data.tx_families = sensor_families(runtime_data.sensors_metadata)
+    stagger = async_get_stagger(hass)
+    decode = partial(decode_current_struct, primary_tx_id=runtime_data.primary_tx_id)
+
+    def fetches_on_its_own(family: SensorFamily) -> bool:
+        scheduler = runtime_data.scheduler
+        return scheduler is None or FAMILY_UPDATE_INTERVAL[family] < scheduler.period
+
+    async def async_fetch(family: SensorFamily) -> dict:
+        api = runtime_data.api
+        coordinator = runtime_data.families[family]
+        try:
+            async with asyncio.timeout(api.retry.deadline):
+                current = await api.get_current()
+        except ClientResponseError as exc:
+            raise UpdateFailed(exc) from exc
+        interval = max(
+            FAMILY_UPDATE_INTERVAL[family],
+            api.limiter.suggested_interval(
+                refreshing_coordinators(hass, runtime_data.account)
+            ),
+        )
+        coordinator.update_interval = timedelta(
+            seconds=stagger.delay(entry.entry_id, time(), interval)
+        )
+        return coordinator.async_decode(current, decode)
+
+    @callback
+    def async_take_refresh(family: SensorFamily) -> None:
+        coordinator = runtime_data.families[family]
+        if not fetches_on_its_own(family):
+            coordinator.update_interval = None
+        elif coordinator.update_interval is None:
+            coordinator.update_interval = timedelta(
+                seconds=FAMILY_UPDATE_INTERVAL[family]
+            )
+        coordinator.async_take_refresh(runtime_data.coordinator)
+
+    for family in set(runtime_data.tx_families.values()):
+        coordinator = runtime_data.families[family] = WLDataUpdateCoordinator(
+            hass,
+            update_method=partial(async_fetch, family),
+            update_interval=timedelta(seconds=FAMILY_UPDATE_INTERVAL[family])
+            if fetches_on_its_own(family)
+            else None,
+        )
+        # Start from the data of the first refresh of the entry
+        coordinator.async_follow(runtime_data.coordinator)
+        entry.async_on_unload(
+            runtime_data.coordinator.async_add_listener(
+                partial(async_take_refresh, family)
+            )
+        )
+        _LOGGER.debug(
+            "Refreshing %s with the entry, and on its own every %s s",
+            family,
+            coordinator.update_interval,
+        )
+
+
+def refreshing_coordinators(hass: HomeAssistant, account: WLAccount) -> int:
+    """Return the number of coordinators refreshing with the key of an account.
+
+    An all stations entry refreshes each of its stations, and the families
+    that fetch on their own count next to the coordinator of their entry.
+    """
+    consumers = 0
+    for entry_id in account.entry_ids:
+        if (other := hass.config_entries.async_get_entry(entry_id)) is None:
+            continue
+        runtime_data: WLData = other.runtime_data
+        if runtime_data.stations:
+            consumers += len(runtime_data.stations)
+            continue
+        consumers += 1 + sum(
+            family.update_interval is not None
+            for family in runtime_data.families.values()
+        )
+    return consumers
+
+
+def entry_stations(entry: WLConfigEntry) -> list[WLData]:
+    """Return the runtime data of each station of a config entry."""
+    return list(entry.runtime_data.stations.values()) or [entry.runtime_data]
+
+
+async def async_get_metadata[T](call: Awaitable[T]) -> T:
+    """Await an account call, raising the config entry errors of setup."""
+    try:
+        return await call
+    except ClientResponseError as err:
+        if err.status == 401:
+            raise ConfigEntryAuthFailed(
+                translation_domain=DOMAIN,
+                translation_key="config_entry_auth_failed",
+            ) from err
+        raise ConfigEntryNotReady(
+            translation_domain=DOMAIN,
+            translation_key="config_entry_not_ready",
+        ) from err
+    except ClientError as err:
+        raise ConfigEntryNotReady(
+            translation_domain=DOMAIN,
+            translation_key="config_entry_not_ready",
+        ) from err
+
+
+async def async_setup_stations(
+    hass: HomeAssistant,
+    entry: WLConfigEntry,
+    account: WLAccount,
+    websession: ClientSession,
+) -> None:
+    """Set up each station on the API key of an all stations entry.
+
+    Stations with a config entry of their own are left to it. The stations
+    share the metadata of the account, so setup makes the same requests
+    whatever the number of stations.
+    """
+    stations = await async_get_metadata(account.async_get_stations())
+    configured = {
+        other.unique_id
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    }
+    for station_id, (station_data, sensors) in stations.items():
+        if station_id in configured:
+            _LOGGER.debug("Station %s has its own config entry", station_id)
+            continue
+        station = WLData(
+            api=async_create_hub(
+                hass,
+                entry.data[CONF_API_KEY_V2],
+                entry.data[CONF_API_SECRET],
+                station_id,
+                websession,
+            ),
+            primary_tx_id=min(vantage_tx_ids(sensors)),
+            station_data=station_data,
+            sensors_metadata=sensors,
+            coordinator=None,
+            current={},
+        )
+        station.coordinator = WLDataUpdateCoordinator(
+            hass,
+            update_method=partial(async_refresh_station, entry, station_id),
+            update_interval=None,
+        )
+        entry.runtime_data.stations[station_id] = station
+
+
+async def async_refresh_station(entry: WLConfigEntry, station_id: str) -> dict:
+    """Refresh a station of an all stations entry by refreshing all of them."""
+    parent = entry.runtime_data.coordinator
+    await parent.async_refresh()
+    if not parent.last_update_success:
+        raise UpdateFailed(parent.last_exception)
+    if isinstance(result := parent.data.get(station_id), Exception):
+        raise UpdateFailed(result) from result
+    return entry.runtime_data.stations[station_id].coordinator.data
+
+
+async def async_get_station(
+    entry: WLConfigEntry, account: WLAccount
+) -> tuple[dict, list[dict]]:
+    """Fetch station data and sensors of the station of a config entry."""
+    station = await async_get_metadata(
+        account.async_get_station(entry.data[CONF_STATION_ID])
+    )
+    if station is None:
+        _LOGGER.warning(
+            "Station %s was not found on the account", entry.data[CONF_STATION_ID]
+        )
+        raise ConfigEntryNotReady(
+            translation_domain=DOMAIN,
+            translation_key="config_entry_not_ready",
+        )
+    return station
+
+
+async def async_revalidate_station(
+    hass: HomeAssistant,
+    entry: WLConfigEntry,
+    account: WLAccount,
+    store: WLMetadataStore,
+    stored: tuple[dict, list[dict]],
+) -> None:
+    """Refresh stored station metadata and reload if the topology changed."""
+    try:
+        station = await account.async_get_station(entry.data[CONF_STATION_ID])
+    except ClientError as err:
+        _LOGGER.debug("Revalidation of station metadata failed: %s", err)
+        return
+    if station is None:
+        _LOGGER.warning(
+            "Station %s was not found on the account", entry.data[CONF_STATION_ID]
+        )
+        return
+    await store.async_save(*station)
+    if topology(*station) != topology(*stored):
+        _LOGGER.info("Sensors of station %s changed, reloading", entry.title)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    entry.runtime_data.station_data, entry.runtime_data.sensors_metadata = station
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: WLConfigEntry) -> bool:
@@ -194,12 +510,18 @@ DCO = "davis_current_observation"
 async def get_coordinator(  # noqa: C901
     hass: HomeAssistant,
     entry: WLConfigEntry,
-) -> DataUpdateCoordinator:
+) -> WLDataUpdateCoordinator:
     """Get the data update coordinator."""
 
     if entry.runtime_data.coordinator is not None:
         return entry.runtime_data.coordinator
 
+    stagger = async_get_stagger(hass)
+    entry.async_on_unload(async_add_entry(hass, entry))
+
+    if entry.data.get(CONF_STATION_ID) == ALL_STATIONS:
+        return await get_stations_coordinator(hass, entry)
+
     def _preprocess(indata: str):  # noqa: C901
         outdata = {}
         # _LOGGER.debug("Received data: %s", indata)
@@ -240,412 +562,199 @@ async def get_coordinator(  # noqa: C901
             )
 
         if entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-            primary_tx_id = tx_id = entry.runtime_data.primary_tx_id
-            outdata.setdefault(tx_id, {})
-            outdata[DataKey.UUID] = indata["station_id_uuid"]
-            for sensor in indata["sensors"]:
-                # Vue
-                if (
-                    sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
-                    or sensor["sensor_type"] == 55
-                ) and sensor["data_structure_type"] == 10:
-                    # _LOGGER.debug("Sensor: %s | %s", sensor["sensor_type"], sensor)
-                    tx_id = sensor["data"][0]["tx_id"]
-                    outdata.setdefault(tx_id, {})
-                    outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
-                    outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor[
-                        "data_structure_type"
-                    ]
-                    outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
-                    outdata[tx_id][DataKey.TEMP_OUT] = sensor["data"][0]["temp"]
-                    outdata[tx_id][DataKey.HUM_OUT] = sensor["data"][0]["hum"]
-                    outdata[tx_id][DataKey.WIND_MPH] = sensor["data"][0][
-                        "wind_speed_last"
-                    ]
-                    outdata[tx_id][DataKey.WIND_GUST_MPH] = sensor["data"][0][
-                        "wind_speed_hi_last_10_min"
-                    ]
-                    outdata[tx_id][DataKey.WIND_DIR] = sensor["data"][0][
-                        "wind_dir_last"
-                    ]
-                    outdata[tx_id][DataKey.DEWPOINT] = sensor["data"][0]["dew_point"]
-                    outdata[tx_id][DataKey.HEAT_INDEX] = sensor["data"][0]["heat_index"]
-                    outdata[tx_id][DataKey.THW_INDEX] = sensor["data"][0]["thw_index"]
-                    outdata[tx_id][DataKey.THSW_INDEX] = sensor["data"][0]["thsw_index"]
-                    outdata[tx_id][DataKey.WET_BULB] = sensor["data"][0]["wet_bulb"]
-                    outdata[tx_id][DataKey.WIND_CHILL] = sensor["data"][0]["wind_chill"]
-                    outdata[tx_id][DataKey.RAIN_DAY] = sensor["data"][0].get(
-                        "rainfall_daily_in", 0.0
-                    )
-
-                    if (xx := sensor["data"][0].get("rain_storm_in", 0.0)) is None:
-                        xx = 0.0
-                    outdata[tx_id][DataKey.RAIN_STORM] = xx
-                    outdata[tx_id][DataKey.RAIN_STORM_START] = sensor["data"][0].get(
-                        "rain_storm_start_at"
-                    )
-                    if (xx := sensor["data"][0].get("rain_storm_last_in", 0.0)) is None:
-                        xx = 0.0
-                    outdata[tx_id][DataKey.RAIN_STORM_LAST] = xx
-                    outdata[tx_id][DataKey.RAIN_STORM_LAST_START] = sensor["data"][
-                        0
-                    ].get("rain_storm_last_start_at")
-                    outdata[tx_id][DataKey.RAIN_STORM_LAST_END] = sensor["data"][0].get(
-                        "rain_storm_last_end_at"
-                    )
-
-                    outdata[tx_id][DataKey.RAIN_RATE] = sensor["data"][0][
-                        "rain_rate_last_in"
-                    ]
-                    outdata[tx_id][DataKey.RAIN_MONTH] = sensor["data"][0][
-                        "rainfall_monthly_in"
-                    ]
-                    outdata[tx_id][DataKey.RAIN_YEAR] = sensor["data"][0][
-                        "rainfall_year_in"
-                    ]
-                    outdata[tx_id][DataKey.TRANS_BATTERY_FLAG] = sensor["data"][0][
-                        "trans_battery_flag"
-                    ]
-                    outdata[tx_id][DataKey.UV_INDEX] = sensor["data"][0]["uv_index"]
-                    outdata[tx_id][DataKey.SOLAR_RADIATION] = sensor["data"][0][
-                        "solar_rad"
-                    ]
-                    outdata[tx_id][DataKey.ET_DAY] = sensor["data"][0].get("et_day")
-                    outdata[tx_id][DataKey.ET_MONTH] = sensor["data"][0].get("et_month")
-                    outdata[tx_id][DataKey.ET_YEAR] = sensor["data"][0].get("et_year")
-
-                # ----------- Data structure 2
-                if (
-                    sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
-                    and sensor["data_structure_type"] == 2
-                ):
-                    tx_id = sensor["data"][0].get("tx_id", 1)
-                    outdata.setdefault(tx_id, {})
-                    outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
-                    outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor[
-                        "data_structure_type"
-                    ]
-                    outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
-                    outdata[tx_id][DataKey.TEMP_OUT] = sensor["data"][0]["temp_out"]
-                    outdata[tx_id][DataKey.TEMP_IN] = sensor["data"][0]["temp_in"]
-                    for numb in range(1, 7 + 1):
-                        outdata[tx_id][f"{DataKey.TEMP_EXTRA}_{numb}"] = sensor["data"][
-                            0
-                        ][f"temp_extra_{numb}"]
-                    for numb in range(1, 4 + 1):
-                        outdata[tx_id][f"{DataKey.TEMP_LEAF}_{numb}"] = sensor["data"][
-                            0
-                        ][f"temp_leaf_{numb}"]
-                    for numb in range(1, 4 + 1):
-                        outdata[tx_id][f"{DataKey.TEMP_SOIL}_{numb}"] = sensor["data"][
-                            0
-                        ][f"temp_soil_{numb}"]
-                    for numb in range(1, 7 + 1):
-                        outdata[tx_id][f"{DataKey.HUM_EXTRA}_{numb}"] = sensor["data"][
-                            0
-                        ][f"hum_extra_{numb}"]
-                    for numb in range(1, 4 + 1):
-                        outdata[tx_id][f"{DataKey.MOIST_SOIL}_{numb}"] = sensor["data"][
-                            0
-                        ][f"moist_soil_{numb}"]
-                    for numb in range(1, 4 + 1):
-                        outdata[tx_id][f"{DataKey.WET_LEAF}_{numb}"] = sensor["data"][
-                            0
-                        ][f"wet_leaf_{numb}"]
-                    outdata[tx_id][DataKey.BAR_SEA_LEVEL] = sensor["data"][0]["bar"]
-                    if (xx := sensor["data"][0].get("bar_trend", 0)) is not None:
-                        xx = xx / 1000
-                    outdata[tx_id][DataKey.BAR_TREND] = xx
-                    outdata[tx_id][DataKey.HUM_OUT] = sensor["data"][0]["hum_out"]
-                    outdata[tx_id][DataKey.HUM_IN] = sensor["data"][0]["hum_in"]
-                    outdata[tx_id][DataKey.WIND_MPH] = sensor["data"][0]["wind_speed"]
-                    outdata[tx_id][DataKey.WIND_GUST_MPH] = sensor["data"][0][
-                        "wind_gust_10_min"
-                    ]
-                    outdata[tx_id][DataKey.WIND_DIR] = sensor["data"][0]["wind_dir"]
-                    outdata[tx_id][DataKey.DEWPOINT] = sensor["data"][0]["dew_point"]
-                    outdata[tx_id][DataKey.HEAT_INDEX] = sensor["data"][0]["heat_index"]
-                    outdata[tx_id][DataKey.WIND_CHILL] = sensor["data"][0]["wind_chill"]
-                    outdata[tx_id][DataKey.RAIN_DAY] = sensor["data"][0].get(
-                        "rain_day_in"
-                    )
-                    if (xx := sensor["data"][0].get("rain_storm_in", 0.0)) is None:
-                        xx = 0.0
-                    outdata[tx_id][DataKey.RAIN_STORM] = xx
-                    outdata[tx_id][DataKey.RAIN_STORM_START] = sensor["data"][0].get(
-                        "rain_storm_start_date"
-                    )
-                    outdata[tx_id][DataKey.RAIN_RATE] = sensor["data"][0][
-                        "rain_rate_in"
-                    ]
-                    outdata[tx_id][DataKey.RAIN_MONTH] = sensor["data"][0][
-                        "rain_month_in"
-                    ]
-                    outdata[tx_id][DataKey.RAIN_YEAR] = sensor["data"][0][
-                        "rain_year_in"
-                    ]
-                    outdata[tx_id][DataKey.SOLAR_RADIATION] = sensor["data"][0][
-                        "solar_rad"
-                    ]
-                    outdata[tx_id][DataKey.UV_INDEX] = sensor["data"][0]["uv"]
-                    outdata[tx_id][DataKey.ET_DAY] = sensor["data"][0]["et_day"]
-                    outdata[tx_id][DataKey.ET_MONTH] = sensor["data"][0]["et_month"]
-                    outdata[tx_id][DataKey.ET_YEAR] = sensor["data"][0]["et_year"]
-
-                # ----------- Data structure 6 - EnviroMonitor
-                if (
-                    sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
-                    and sensor["data_structure_type"] == 6
-                ):
-                    tx_id = sensor["data"][0].get("tx_id", 1)
-                    outdata.setdefault(tx_id, {})
-                    outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
-                    outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor[
-                        "data_structure_type"
-                    ]
-                    outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
-                    outdata[tx_id][DataKey.TEMP_OUT] = sensor["data"][0]["temp_out"]
-                    outdata[tx_id][DataKey.BAR_SEA_LEVEL] = sensor["data"][0]["bar"]
-                    if (xx := sensor["data"][0].get("bar_trend", 0)) is not None:
-                        xx = xx / 1000
-                    outdata[tx_id][DataKey.BAR_TREND] = xx
-                    outdata[tx_id][DataKey.HUM_OUT] = sensor["data"][0]["hum_out"]
-                    outdata[tx_id][DataKey.WIND_MPH] = sensor["data"][0]["wind_speed"]
-                    outdata[tx_id][DataKey.WIND_GUST_MPH] = sensor["data"][0][
-                        "wind_gust_10_min"
-                    ]
-                    outdata[tx_id][DataKey.WIND_DIR] = sensor["data"][0]["wind_dir"]
-                    outdata[tx_id][DataKey.DEWPOINT] = sensor["data"][0]["dew_point"]
-                    outdata[tx_id][DataKey.HEAT_INDEX] = sensor["data"][0]["heat_index"]
-                    outdata[tx_id][DataKey.WIND_CHILL] = sensor["data"][0]["wind_chill"]
-                    outdata[tx_id][DataKey.RAIN_DAY] = sensor["data"][0].get(
-                        "rain_day_in"
-                    )
-                    if (xx := sensor["data"][0].get("rain_storm_in", 0.0)) is None:
-                        xx = 0.0
-                    outdata[tx_id][DataKey.RAIN_STORM] = xx
-                    outdata[tx_id][DataKey.RAIN_STORM_START] = sensor["data"][0].get(
-                        "rain_storm_start_date"
-                    )
-                    outdata[tx_id][DataKey.RAIN_RATE] = sensor["data"][0][
-                        "rain_rate_in"
-                    ]
-                    outdata[tx_id][DataKey.SOLAR_RADIATION] = sensor["data"][0][
-                        "solar_rad"
-                    ]
-                    outdata[tx_id][DataKey.UV_INDEX] = sensor["data"][0]["uv"]
-                    outdata[tx_id][DataKey.ET_DAY] = sensor["data"][0]["et_day"]
-                    outdata[tx_id][DataKey.THSW_INDEX] = sensor["data"][0]["thsw_index"]
-                    outdata[tx_id][DataKey.WET_BULB] = sensor["data"][0]["wet_bulb"]
-
-                if (
-                    sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
-                    or sensor["sensor_type"] == 55
-                ) and sensor["data_structure_type"] == 23:
-                    tx_id = sensor["data"][0]["tx_id"]
-                    outdata.setdefault(tx_id, {})
-                    outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
-                    outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor[
-                        "data_structure_type"
-                    ]
-                    outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
-                    outdata[tx_id][DataKey.TEMP_OUT] = sensor["data"][0]["temp"]
-                    outdata[tx_id][DataKey.HUM_OUT] = sensor["data"][0]["hum"]
-                    outdata[tx_id][DataKey.WIND_MPH] = sensor["data"][0][
-                        "wind_speed_last"
-                    ]
-                    outdata[tx_id][DataKey.WIND_GUST_MPH] = sensor["data"][0][
-                        "wind_speed_hi_last_10_min"
-                    ]
-                    outdata[tx_id][DataKey.WIND_DIR] = sensor["data"][0][
-                        "wind_dir_last"
-                    ]
-                    outdata[tx_id][DataKey.DEWPOINT] = sensor["data"][0]["dew_point"]
-                    outdata[tx_id][DataKey.HEAT_INDEX] = sensor["data"][0]["heat_index"]
-                    outdata[tx_id][DataKey.THW_INDEX] = sensor["data"][0]["thw_index"]
-                    outdata[tx_id][DataKey.THSW_INDEX] = sensor["data"][0]["thsw_index"]
-                    outdata[tx_id][DataKey.WET_BULB] = sensor["data"][0]["wet_bulb"]
-                    outdata[tx_id][DataKey.WIND_CHILL] = sensor["data"][0]["wind_chill"]
-                    outdata[tx_id][DataKey.RAIN_DAY] = sensor["data"][0].get(
-                        "rainfall_day_in", 0.0
-                    )
-                    if (
-                        xx := sensor["data"][0].get("rain_storm_current_in", 0.0)
-                    ) is None:
-                        xx = 0.0
-                    outdata[tx_id][DataKey.RAIN_STORM] = xx
-                    outdata[tx_id][DataKey.RAIN_STORM_START] = sensor["data"][0].get(
-                        "rain_storm_current_start_at"
-                    )
-                    if (xx := sensor["data"][0].get("rain_storm_last_in", 0.0)) is None:
-                        xx = 0.0
-                    outdata[tx_id][DataKey.RAIN_STORM_LAST] = xx
-                    outdata[tx_id][DataKey.RAIN_STORM_LAST_START] = sensor["data"][
-                        0
-                    ].get("rain_storm_last_start_at")
-                    outdata[tx_id][DataKey.RAIN_STORM_LAST_END] = sensor["data"][0].get(
-                        "rain_storm_last_end_at"
-                    )
-
-                    outdata[tx_id][DataKey.RAIN_RATE] = sensor["data"][0][
-                        "rain_rate_last_in"
-                    ]
-                    outdata[tx_id][DataKey.RAIN_MONTH] = sensor["data"][0][
-                        "rainfall_month_in"
-                    ]
-                    outdata[tx_id][DataKey.RAIN_YEAR] = sensor["data"][0][
-                        "rainfall_year_in"
-                    ]
-                    outdata[tx_id][DataKey.TRANS_BATTERY_FLAG] = sensor["data"][0][
-                        "trans_battery_flag"
-                    ]
-                    outdata[tx_id][DataKey.TRANS_BATTERY_VOLT] = sensor["data"][0][
-                        "trans_battery_volt"
-                    ]
-                    outdata[tx_id][DataKey.SUPERCAP_VOLT] = sensor["data"][0][
-                        "supercap_volt"
-                    ]
-                    outdata[tx_id][DataKey.SOLAR_PANEL_VOLT] = sensor["data"][0][
-                        "solar_panel_volt"
-                    ]
-                    outdata[tx_id][DataKey.SOLAR_RADIATION] = sensor["data"][0][
-                        "solar_rad"
-                    ]
-                    outdata[tx_id][DataKey.UV_INDEX] = sensor["data"][0]["uv_index"]
-                    outdata[tx_id][DataKey.ET_DAY] = sensor["data"][0]["et_day"]
-                    outdata[tx_id][DataKey.ET_MONTH] = sensor["data"][0]["et_month"]
-                    outdata[tx_id][DataKey.ET_YEAR] = sensor["data"][0]["et_year"]
-
-                if sensor["sensor_type"] == 56 and sensor["data_structure_type"] == 12:
-                    tx_id = sensor["data"][0]["tx_id"]
-                    outdata.setdefault(tx_id, {})
-                    outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
-                    outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor[
-                        "data_structure_type"
-                    ]
-                    outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
-                    for numb in range(1, 4 + 1):
-                        outdata[tx_id][f"{DataKey.TEMP}_{numb}"] = sensor["data"][0][
-                            f"temp_{numb}"
-                        ]
-                    for numb in range(1, 4 + 1):
-                        outdata[tx_id][f"{DataKey.MOIST_SOIL}_{numb}"] = sensor["data"][
-                            0
-                        ][f"moist_soil_{numb}"]
-                    for numb in range(1, 2 + 1):
-                        outdata[tx_id][f"{DataKey.WET_LEAF}_{numb}"] = sensor["data"][
-                            0
-                        ][f"wet_leaf_{numb}"]
-
-                if sensor["sensor_type"] == 56 and sensor["data_structure_type"] == 25:
-                    tx_id = sensor["data"][0]["tx_id"]
-                    outdata.setdefault(tx_id, {})
-                    outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
-                    outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor[
-                        "data_structure_type"
-                    ]
-                    outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
-                    for numb in range(1, 4 + 1):
-                        outdata[tx_id][f"{DataKey.TEMP}_{numb}"] = sensor["data"][0][
-                            f"temp_{numb}"
-                        ]
-                    for numb in range(1, 4 + 1):
-                        outdata[tx_id][f"{DataKey.MOIST_SOIL}_{numb}"] = sensor["data"][
-                            0
-                        ][f"moist_soil_{numb}"]
-                    for numb in range(1, 2 + 1):
-                        outdata[tx_id][f"{DataKey.WET_LEAF}_{numb}"] = sensor["data"][
-                            0
-                        ][f"wet_leaf_{numb}"]
-                    outdata[tx_id][DataKey.TRANS_BATTERY_FLAG] = sensor["data"][0][
-                        "trans_battery_flag"
-                    ]
-
-                if sensor["sensor_type"] == 365 and sensor["data_structure_type"] == 21:
-                    tx_id = primary_tx_id
-                    outdata[tx_id][DataKey.TEMP_IN] = sensor["data"][0]["temp_in"]
-                    outdata[tx_id][DataKey.HUM_IN] = sensor["data"][0]["hum_in"]
-                if sensor["sensor_type"] == 243 and sensor["data_structure_type"] == 12:
-                    tx_id = primary_tx_id
-                    outdata[tx_id][DataKey.TEMP_IN] = sensor["data"][0]["temp_in"]
-                    outdata[tx_id][DataKey.HUM_IN] = sensor["data"][0]["hum_in"]
-                if sensor["sensor_type"] == 242 and sensor["data_structure_type"] == 12:
-                    tx_id = primary_tx_id
-                    outdata[tx_id][DataKey.BAR_SEA_LEVEL] = sensor["data"][0][
-                        "bar_sea_level"
-                    ]
-                    outdata[tx_id][DataKey.BAR_TREND] = sensor["data"][0]["bar_trend"]
-                if sensor["sensor_type"] == 242 and sensor["data_structure_type"] == 19:
-                    tx_id = primary_tx_id
-                    outdata[tx_id][DataKey.BAR_SEA_LEVEL] = sensor["data"][0][
-                        "bar_sea_level"
-                    ]
-                    outdata[tx_id][DataKey.BAR_TREND] = sensor["data"][0]["bar_trend"]
-
-                if (
-                    sensor["sensor_type"] in SENSOR_TYPE_AIRLINK
-                    and sensor["data_structure_type"] == 16
-                ):
-                    tx_id = primary_tx_id
-                    tx_id = sensor["lsid"]
-                    outdata.setdefault(tx_id, {})
-                    outdata[tx_id][DataKey.SENSOR_TYPE] = sensor["sensor_type"]
-                    outdata[tx_id][DataKey.DATA_STRUCTURE] = sensor[
-                        "data_structure_type"
-                    ]
-                    outdata[tx_id][DataKey.TIMESTAMP] = sensor["data"][0]["ts"]
-                    outdata[tx_id][DataKey.TEMP] = sensor["data"][0]["temp"]
-                    outdata[tx_id][DataKey.HUM] = sensor["data"][0]["hum"]
-                    outdata[tx_id][DataKey.DEWPOINT] = sensor["data"][0]["dew_point"]
-                    outdata[tx_id][DataKey.HEAT_INDEX] = sensor["data"][0]["heat_index"]
-                    outdata[tx_id][DataKey.WET_BULB] = sensor["data"][0]["wet_bulb"]
-                    outdata[tx_id][DataKey.PM_1] = sensor["data"][0]["pm_1"]
-                    outdata[tx_id][DataKey.PM_2P5] = sensor["data"][0]["pm_2p5"]
-                    outdata[tx_id][DataKey.PM_2P5_24H] = sensor["data"][0][
-                        "pm_2p5_24_hour"
-                    ]
-                    outdata[tx_id][DataKey.PM_10] = sensor["data"][0]["pm_10"]
-                    outdata[tx_id][DataKey.PM_10_24H] = sensor["data"][0][
-                        "pm_10_24_hour"
-                    ]
-                    outdata[tx_id][DataKey.AQI_VAL] = sensor["data"][0]["aqi_val"]
-                    outdata[tx_id][DataKey.AQI_NOWCAST_VAL] = sensor["data"][0][
-                        "aqi_nowcast_val"
-                    ]
+            outdata = decode_current_struct(indata, entry.runtime_data.primary_tx_id)
 
             # Test data can be injected here
 
-            # tx_id = primary_tx_id
+            # tx_id = entry.runtime_data.primary_tx_id
             # outdata[tx_id][DataKey.PM_1] = 10
             # outdata[tx_id][DataKey.PM_2P5] = 20
             # outdata[tx_id][DataKey.PM_10] = 50
             # outdata[tx_id][DataKey.AQI_VAL] = 101
             # outdata[tx_id][DataKey.AQI_NOWCAST_VAL] = 102
 
+        if entry.data[CONF_API_VERSION] == ApiVersion.API_LOCAL:
+            outdata = decode_local(indata, entry.runtime_data.primary_tx_id)
+
         return outdata
 
+    stations = entry.runtime_data.station_data.get("stations") or [{}]
+    scheduler = entry.runtime_data.scheduler = (
+        UploadScheduler(stations[0].get("recording_interval"))
+        if entry.data[CONF_API_VERSION] != ApiVersion.API_LOCAL
+        else None
+    )
+    snapshots = WLSnapshotStore(hass, entry)
+
     async def async_fetch():
         api = entry.runtime_data.api
+        # Retries of v2 requests happen within the refresh
+        timeout = (
+            api.retry.deadline
+            if entry.data[CONF_API_VERSION] == ApiVersion.API_V2
+            else 10
+        )
         try:
-            async with asyncio.timeout(10):
-                json_data = await api.get_data()
+            async with asyncio.timeout(timeout):
+                json_data = await (
+                    api.get_current()
+                    if entry.data[CONF_API_VERSION] == ApiVersion.API_V2
+                    else api.get_data()
+                )
                 entry.runtime_data.current = json_data
-                return _preprocess(json_data)
+                outdata = entry.runtime_data.coordinator.async_decode(
+                    json_data, _preprocess
+                )
         except ClientResponseError as exc:
             _LOGGER.warning("API fetch failed. Status: %s, - %s", exc.code, exc.message)
             raise UpdateFailed(exc) from exc
+        if outdata is not (previous := entry.runtime_data.coordinator.data):
+            snapshots.async_schedule_save(outdata)
+            if previous is not None:
+                async_schedule_backfill(hass, entry, previous, outdata)
+        if scheduler is not None:
+            interval = scheduler.update(newest_timestamp(outdata))
+            if (account := entry.runtime_data.account) is not None:
+                interval = max(
+                    interval,
+                    timedelta(
+                        seconds=api.limiter.suggested_interval(
+                            refreshing_coordinators(hass, account)
+                        )
+                    ),
+                )
+            interval += timedelta(
+                seconds=stagger.offset(entry.entry_id, STAGGER_WINDOW)
+            )
+        else:
+            interval = timedelta(
+                seconds=stagger.delay(entry.entry_id, time(), LOCAL_UPDATE_INTERVAL)
+            )
+        entry.runtime_data.coordinator.update_interval = interval
+        return outdata
 
-    entry.runtime_data.coordinator = DataUpdateCoordinator(
+    entry.runtime_data.coordinator = WLDataUpdateCoordinator(
         hass,
-        logging.getLogger(__name__),
-        name=DOMAIN,
         update_method=async_fetch,
-        update_interval=timedelta(minutes=5),
+        update_interval=timedelta(seconds=LOCAL_UPDATE_INTERVAL)
+        if scheduler is None
+        else timedelta(minutes=5),
     )
+    if (
+        snapshot := await snapshots.async_load()
+    ) and entry.runtime_data.primary_tx_id in snapshot:
+        _LOGGER.debug("Using stored data until the first refresh")
+        entry.runtime_data.coordinator.async_restore(snapshot)
+        return entry.runtime_data.coordinator
     await entry.runtime_data.coordinator.async_refresh()
     return entry.runtime_data.coordinator
 
 
+async def get_stations_coordinator(
+    hass: HomeAssistant,
+    entry: WLConfigEntry,
+) -> WLDataUpdateCoordinator:
+    """Get the coordinator refreshing all stations of an all stations entry.
+
+    Its data maps each station id to the decoded data of the station or the
+    error fetching it. Results are passed on to the coordinators of the
+    stations, so that a failing station does not fail the others.
+    """
+    stations = entry.runtime_data.stations
+    account = entry.runtime_data.account
+    semaphore = asyncio.Semaphore(STATIONS_CONCURRENCY)
+
+    async def async_fetch_station(station: WLData) -> dict:
+        async with semaphore, asyncio.timeout(station.api.retry.deadline):
+            station.current = await station.api.get_current()
+        return station.coordinator.async_decode(
+            station.current,
+            partial(decode_current_struct, primary_tx_id=station.primary_tx_id),
+        )
+
+    async def async_fetch() -> dict[str, dict | Exception]:
+        results = await asyncio.gather(
+            *(async_fetch_station(station) for station in stations.values()),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+        if results and all(isinstance(result, Exception) for result in results):
+            raise UpdateFailed(results[0]) from results[0]
+        interval = max(
+            300,
+            account.api.limiter.suggested_interval(
+                refreshing_coordinators(hass, account)
+            ),
+        )
+        coordinator.update_interval = timedelta(
+            seconds=async_get_stagger(hass).delay(entry.entry_id, time(), interval)
+        )
+        return dict(zip(stations, results, strict=True))
+
+    @callback
+    def async_dispatch() -> None:
+        for station_id, station in stations.items():
+            if not coordinator.last_update_success:
+                station.coordinator.async_set_update_error(coordinator.last_exception)
+            elif isinstance(result := coordinator.data[station_id], Exception):
+                _LOGGER.debug("Refresh of station %s failed: %s", station_id, result)
+                station.coordinator.async_set_update_error(result)
+            elif (
+                result is not station.coordinator.data
+                or not station.coordinator.last_update_success
+            ):
+                station.coordinator.async_set_updated_data(result)
+
+    coordinator = entry.runtime_data.coordinator = WLDataUpdateCoordinator(
+        hass,
+        update_method=async_fetch,
+        update_interval=timedelta(minutes=5),
+        always_update=True,
+    )
+    entry.async_on_unload(coordinator.async_add_listener(async_dispatch))
+    await coordinator.async_refresh()
+    return coordinator
+
+
+@callback
+def async_schedule_backfill(
+    hass: HomeAssistant, entry: WLConfigEntry, previous: dict, data: dict
+) -> None:
+    """Backfill statistics when observations resume after a gap."""
+    if (
+        entry.data[CONF_API_VERSION] != ApiVersion.API_V2
+        or "recorder" not in hass.config.components
+        or (start := newest_timestamp(previous)) is None
+        or (end := newest_timestamp(data)) is None
+        or end - start < BACKFILL_MIN_GAP
+    ):
+        return
+    entry.async_create_background_task(
+        hass, async_backfill(hass, entry, start, end), "weatherlink_backfill"
+    )
+
+
+def newest_timestamp(data: dict) -> int | None:
+    """Return the newest observation timestamp in preprocessed data."""
+    return max(
+        (
+            values[DataKey.TIMESTAMP]
+            for values in data.values()
+            if isinstance(values, dict) and values.get(DataKey.TIMESTAMP) is not None
+        ),
+        default=None,
+    )
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: WLConfigEntry) -> None:
+    """Remove stored metadata and data when a config entry is removed."""
+    if entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
+        await WLMetadataStore(hass, entry).async_remove()
+    await WLSnapshotStore(hass, entry).async_remove()
+
+
 async def async_migrate_entry(hass, config_entry: ConfigEntry):
     """Migrate old entry."""
     _LOGGER.info("Migrating from version %s", config_entry.version)
@@ -666,9 +775,10 @@ async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry: ConfigEntry, device_entry: DeviceEntry
 ) -> bool:
     """Remove config entry from a device."""
-    api_data = config_entry.runtime_data.coordinator.data
     return not any(
         identifier
+        for station in entry_stations(config_entry)
+        if (api_data := station.coordinator.data) is not None
         for _, identifier in device_entry.identifiers
         if identifier in api_data
     )
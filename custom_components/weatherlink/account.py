@@ -0,0 +1,159 @@
+"""Account level data shared by config entries using the same API key."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+from time import monotonic
+from typing import Any
+
+from aiohttp import ClientSession
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .cache import async_get_response_cache, async_remove_response_caches
+from .const import CONF_API_KEY_V2, CONF_API_SECRET, DOMAIN
+from .pyweatherlink import API_V2_HOST, WLHubV2
+from .ratelimit import async_get_rate_limiter, async_remove_rate_limiter
+from .retry import async_get_circuit_breaker, async_remove_circuit_breakers
+
+_LOGGER = logging.getLogger(__name__)
+
+METADATA_MAX_AGE = 60
+
+
+@dataclass
+class WLAccount:
+    """Station and sensor metadata for one API key, indexed by station_id."""
+
+    api: WLHubV2
+    entry_ids: set[str] = field(default_factory=set)
+    stations: dict[str, dict[str, Any]] = field(default_factory=dict)
+    sensors: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    generated_at: int | None = None
+    fetched_at: float | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    async def async_refresh(self) -> None:
+        """Fetch all stations and sensors on the account."""
+        all_stations = await self.api.get_all_stations()
+        all_sensors = await self.api.get_all_sensors()
+
+        stations = {
+            str(station["station_id"]): station for station in all_stations["stations"]
+        }
+        sensors: dict[str, list[dict[str, Any]]] = {
+            station_id: [] for station_id in stations
+        }
+        for sensor in all_sensors["sensors"]:
+            sensors.setdefault(str(sensor["station_id"]), []).append(sensor)
+
+        self.stations = stations
+        self.sensors = sensors
+        self.generated_at = all_stations.get("generated_at")
+        self.fetched_at = monotonic()
+        _LOGGER.debug(
+            "Fetched metadata for %s stations and %s sensors",
+            len(stations),
+            len(all_sensors["sensors"]),
+        )
+
+    async def async_ensure_fresh(self) -> None:
+        """Fetch stations and sensors unless fetched recently."""
+        async with self.lock:
+            if self.fetched_at is None or monotonic() - self.fetched_at > (
+                METADATA_MAX_AGE
+            ):
+                await self.async_refresh()
+
+    def station(
+        self, station_id: str
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]] | None:
+        """Return station data and sensors of a station from fetched metadata.
+
+        The station data has the same shape as the /stations/{station_id} response.
+        """
+        if (station := self.stations.get(str(station_id))) is None:
+            return None
+        station_data = {"stations": [station], "generated_at": self.generated_at}
+        return station_data, self.sensors.get(str(station_id), [])
+
+    async def async_get_station(
+        self, station_id: str
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]] | None:
+        """Return station data and sensors for a station, fetching if stale."""
+        await self.async_ensure_fresh()
+        return self.station(station_id)
+
+    async def async_get_stations(
+        self,
+    ) -> dict[str, tuple[dict[str, Any], list[dict[str, Any]]]]:
+        """Return station data and sensors of all stations, fetching if stale."""
+        await self.async_ensure_fresh()
+        return {station_id: self.station(station_id) for station_id in self.stations}
+
+
+@callback
+def async_create_hub(
+    hass: HomeAssistant,
+    api_key: str,
+    api_secret: str,
+    station_id: str | None = None,
+    websession: ClientSession | None = None,
+) -> WLHubV2:
+    """Create a hub sharing rate limit, circuit breaker and cache of its API key.
+
+    Without a websession the shared session of Home Assistant is used.
+    """
+    return WLHubV2(
+        websession=websession or async_get_clientsession(hass),
+        station_id=station_id,
+        api_key_v2=api_key,
+        api_secret=api_secret,
+        limiter=async_get_rate_limiter(hass, api_key),
+        breaker=async_get_circuit_breaker(hass, API_V2_HOST),
+        cache=async_get_response_cache(hass, api_key, api_secret),
+    )
+
+
+@callback
+def async_get_account(
+    hass: HomeAssistant, entry: ConfigEntry, websession: ClientSession | None = None
+) -> WLAccount:
+    """Get or create the shared account for the API key of a config entry."""
+    accounts: dict[str, WLAccount] = hass.data.setdefault(DOMAIN, {})
+    if (account := accounts.get(entry.data[CONF_API_KEY_V2])) is None:
+        account = accounts[entry.data[CONF_API_KEY_V2]] = WLAccount(
+            api=async_create_hub(
+                hass,
+                entry.data[CONF_API_KEY_V2],
+                entry.data[CONF_API_SECRET],
+                websession=websession,
+            )
+        )
+    account.entry_ids.add(entry.entry_id)
+    return account
+
+
+@callback
+def async_release_account(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Release the shared account and drop it when no entry uses it.
+
+    The rate limiter and response caches of the API key are dropped with the
+    account, and the circuit breakers with the last account.
+    """
+    api_key = entry.data[CONF_API_KEY_V2]
+    accounts: dict[str, WLAccount] = hass.data.get(DOMAIN, {})
+    if (account := accounts.get(api_key)) is None:
+        return
+    account.entry_ids.discard(entry.entry_id)
+    if not account.entry_ids:
+        accounts.pop(api_key)
+        async_remove_rate_limiter(hass, api_key)
+        async_remove_response_caches(hass, api_key)
+    if not accounts:
+        hass.data.pop(DOMAIN, None)
+        async_remove_circuit_breakers(hass)
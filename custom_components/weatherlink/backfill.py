@@ -0,0 +1,119 @@
+"""Backfill of gaps in the statistics from Weatherlink archive records."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientError
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfIrradiance,
+    UnitOfPressure,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, DataKey
+from .decoder import decode_historic
+
+if TYPE_CHECKING:
+    from . import WLConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+# Shorter gaps are covered by the recorded states
+BACKFILL_MIN_GAP = 2 * 3600
+BACKFILL_MAX_SECONDS = 7 * 24 * 3600
+
+STATISTICS: dict[str, str] = {
+    DataKey.TEMP_OUT: UnitOfTemperature.FAHRENHEIT,
+    DataKey.HUM_OUT: PERCENTAGE,
+    DataKey.DEWPOINT: UnitOfTemperature.FAHRENHEIT,
+    DataKey.TEMP_IN: UnitOfTemperature.FAHRENHEIT,
+    DataKey.HUM_IN: PERCENTAGE,
+    DataKey.BAR_SEA_LEVEL: UnitOfPressure.INHG,
+    DataKey.WIND_MPH: UnitOfSpeed.MILES_PER_HOUR,
+    DataKey.SOLAR_RADIATION: UnitOfIrradiance.WATTS_PER_SQUARE_METER,
+}
+
+
+def statistic_id(unique_id_base: str, tx_id: Any, key: str) -> str:
+    """Return the external statistic id of a value."""
+    return f"{DOMAIN}:{slugify(f'{unique_id_base}_{tx_id}_{key}')}"
+
+
+def hourly_statistics(
+    indata: dict[str, Any], primary_tx_id: int
+) -> dict[tuple[Any, str], dict[int, list[float]]]:
+    """Aggregate archive records into hourly sum, count, min and max."""
+    hours: dict[tuple[Any, str], dict[int, list[float]]] = {}
+    for tx_id, timestamp, values in decode_historic(indata, primary_tx_id):
+        hour = timestamp - timestamp % 3600
+        for key in STATISTICS:
+            if (value := values.get(key)) is None:
+                continue
+            series = hours.setdefault((tx_id, key), {})
+            if (row := series.get(hour)) is None:
+                series[hour] = [value, 1, value, value]
+                continue
+            row[0] += value
+            row[1] += 1
+            row[2] = min(row[2], value)
+            row[3] = max(row[3], value)
+    return hours
+
+
+async def async_backfill(
+    hass: HomeAssistant, entry: WLConfigEntry, start: int, end: int
+) -> int:
+    """Import hourly statistics from archive records between two timestamps.
+
+    The range is fetched a day at a time, so memory use does not grow with
+    the length of the gap. Only hours that ended before the end of the range
+    are imported. Returns the number of imported statistic rows.
+    """
+    start = max(start, end - BACKFILL_MAX_SECONDS)
+    start -= start % 3600
+    unique_id_base = entry.runtime_data.coordinator.data[DataKey.UUID]
+    primary_tx_id = entry.runtime_data.primary_tx_id
+    imported = 0
+    _LOGGER.debug("Backfilling statistics from %s to %s", start, end)
+    try:
+        async for chunk in entry.runtime_data.api.get_historic(start, end):
+            for (tx_id, key), series in hourly_statistics(chunk, primary_tx_id).items():
+                rows = [
+                    StatisticData(
+                        start=dt_util.utc_from_timestamp(hour),
+                        mean=total / count,
+                        min=low,
+                        max=high,
+                    )
+                    for hour, (total, count, low, high) in sorted(series.items())
+                    if hour + 3600 <= end
+                ]
+                if not rows:
+                    continue
+                metadata = StatisticMetaData(
+                    mean_type=StatisticMeanType.ARITHMETIC,
+                    has_sum=False,
+                    name=f"{entry.title} {tx_id} {key}",
+                    source=DOMAIN,
+                    statistic_id=statistic_id(unique_id_base, tx_id, key),
+                    unit_of_measurement=STATISTICS[key],
+                )
+                async_add_external_statistics(hass, metadata, rows)
+                imported += len(rows)
+    except ClientError as err:
+        _LOGGER.warning("Backfill of statistics failed: %s", err)
+    _LOGGER.debug("Imported %s hourly statistics", imported)
+    return imported
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
 import logging
 from typing import Final
 
@@ -16,9 +17,10 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import dt as dt_util
 
-from . import WLConfigEntry, get_coordinator
-from .const import CONF_API_VERSION, DISCONNECTED_AFTER_SECONDS, ApiVersion, DataKey
-from .entity import WLEntity
+from . import WLConfigEntry, WLData as WLStation, entry_stations, get_coordinator
+from .const import CONF_API_VERSION, ApiVersion, DataKey
+from .coordinator import Staleness
+from .entity import WLEntity, aux_descriptions
 from .pyweatherlink import WLData
 
 _LOGGER = logging.getLogger(__name__)
@@ -32,6 +34,7 @@ class WLBinarySensorDescription(BinarySensorEntityDescription):
     exclude_api_ver: set = ()
     exclude_data_structure: set = ()
     aux_sensors: set = ()
+    extra_tags: tuple = ()
 
 
 SENSOR_TYPES: Final[tuple[WLBinarySensorDescription, ...]] = (
@@ -57,6 +60,8 @@ SENSOR_TYPES: Final[tuple[WLBinarySensorDescription, ...]] = (
     ),
 )
 
+AUX_SENSOR_TYPES = aux_descriptions(SENSOR_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -64,11 +69,29 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the binary sensor platform."""
-    coordinator = await get_coordinator(hass, entry)
-    primary_tx_id = entry.runtime_data.primary_tx_id
+    await get_coordinator(hass, entry)
+    entities = []
+    for station in entry_stations(entry):
+        if station.coordinator.data is not None:
+            entities += station_entities(hass, entry, station)
+    async_add_entities(entities)
+
+
+def last_update_attributes(timestamp: int | None) -> dict[str, datetime] | None:
+    """Return the attributes of the connectivity of a transmitter."""
+    if timestamp is None:
+        return None
+    return {"last_update": dt_util.utc_from_timestamp(timestamp)}
+
 
+def station_entities(
+    hass: HomeAssistant, entry: WLConfigEntry, station: WLStation
+) -> list[WLBinarySensor]:
+    """Return the entities of a station."""
+    coordinator = station.coordinator
+    primary_tx_id = station.primary_tx_id
     entities = [
-        WLBinarySensor(coordinator, hass, entry, description, primary_tx_id)
+        WLBinarySensor(coordinator, hass, entry, description, primary_tx_id, station)
         for description in SENSOR_TYPES
         if (entry.data[CONF_API_VERSION] not in description.exclude_api_ver)
         and (
@@ -79,39 +102,39 @@ async def async_setup_entry(
     ]
 
     aux_entities = []
-    if entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-        for sensor in entry.runtime_data.sensors_metadata:
+    if entry.data[CONF_API_VERSION] != ApiVersion.API_V1:
+        for sensor in station.sensors_metadata:
             if sensor["tx_id"] is not None and sensor["tx_id"] != primary_tx_id:
                 aux_entities += [
                     WLBinarySensor(
-                        coordinator,
+                        station.coordinator_for(sensor["tx_id"]),
                         hass,
                         entry,
                         description,
                         sensor["tx_id"],
+                        station,
                     )
-                    for description in SENSOR_TYPES
-                    if sensor["sensor_type"] in description.aux_sensors
-                    and coordinator.data[sensor["tx_id"]].get(DataKey.DATA_STRUCTURE)
+                    for description in AUX_SENSOR_TYPES.get(sensor["sensor_type"], ())
+                    if coordinator.data[sensor["tx_id"]].get(DataKey.DATA_STRUCTURE)
                     not in description.exclude_data_structure
                 ]
             if sensor["tx_id"] is None:
                 aux_entities += [
                     WLBinarySensor(
-                        coordinator,
+                        station.coordinator_for(sensor["lsid"]),
                         hass,
                         entry,
                         description,
                         sensor["lsid"],
+                        station,
                     )
-                    for description in SENSOR_TYPES
-                    if sensor["sensor_type"] in description.aux_sensors
-                    and (
+                    for description in AUX_SENSOR_TYPES.get(sensor["sensor_type"], ())
+                    if (
                         coordinator.data[sensor["lsid"]].get(description.tag)
                         is not None
                     )
                 ]
-    async_add_entities(entities + aux_entities)
+    return entities + aux_entities
 
 
 class WLBinarySensor(WLEntity, BinarySensorEntity):
@@ -126,26 +149,18 @@ class WLBinarySensor(WLEntity, BinarySensorEntity):
         if self.entity_description.key == "TransmitterBattery":
             return self.coordinator.data[self.tx_id].get(self.entity_description.tag)
         if self.entity_description.key == "Timestamp":
-            dt_update = dt_util.utc_from_timestamp(
-                self.coordinator.data[self.tx_id].get(DataKey.TIMESTAMP)
+            return (
+                self.coordinator.staleness.get(self.tx_id, Staleness.FRESH)
+                < Staleness.DISCONNECTED
             )
-            dt_now = dt_util.now()
-            diff = dt_now - dt_update
-            return diff.total_seconds() < DISCONNECTED_AFTER_SECONDS
         return None
 
     @property
     def extra_state_attributes(self) -> dict[str, str] | None:
         """Return the state attributes, if any."""
-        if self.entity_description.key in [
-            "Timestamp",
-        ]:
-            if self.coordinator.data[self.tx_id].get(DataKey.TIMESTAMP) is None:
-                return None
-            dt_object = dt_util.utc_from_timestamp(
-                self.coordinator.data[self.tx_id].get(DataKey.TIMESTAMP)
+        if self.entity_description.key == "Timestamp":
+            return self.memoized_attributes(
+                last_update_attributes,
+                self.coordinator.data[self.tx_id].get(DataKey.TIMESTAMP),
             )
-            return {
-                "last_update": dt_object,
-            }
         return None
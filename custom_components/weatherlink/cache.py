@@ -0,0 +1,114 @@
+"""Coalescing and caching of Weatherlink API v2 responses.
+
+Identical requests in flight at the same time share one fetch, so that the
+config flow, diagnostics and coordinators refreshing at the same moment make
+one round trip. Metadata responses are also kept for a short time, with the
+least recently used evicted first. Cached responses are shared between
+callers and must not be modified.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from functools import partial
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+CACHE_MAX_ENTRIES = 16
+METADATA_TTL = 60.0
+
+RESPONSE_CACHES: HassKey[dict[tuple[str, str], WLResponseCache]] = HassKey(
+    f"{DOMAIN}_response_caches"
+)
+
+
+class WLResponseCache:
+    """Single flight of identical requests and a TTL cache with LRU eviction."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES) -> None:
+        """Initialize."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    async def get(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: float = 0
+    ) -> Any:
+        """Return the response of a request, fetching it once for all callers.
+
+        The fetch runs as a task of its own, so a caller that is cancelled does
+        not cancel it for the others. With a ttl the response is cached.
+        """
+        if (entry := self._entries.get(key)) is not None:
+            expires, value = entry
+            if monotonic() < expires:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        if (task := self._inflight.get(key)) is None:
+            self.misses += 1
+            task = self._inflight[key] = asyncio.create_task(fetch())
+            task.add_done_callback(partial(self._async_done, key, ttl))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    @callback
+    def _async_done(self, key: Hashable, ttl: float, task: asyncio.Task[Any]) -> None:
+        """Release a finished fetch and cache its response."""
+        del self._inflight[key]
+        if task.cancelled() or task.exception() is not None or ttl <= 0:
+            return
+        self._entries[key] = (monotonic() + ttl, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the counters of the cache, for diagnostics."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
+@callback
+def async_get_response_cache(
+    hass: HomeAssistant, api_key: str, api_secret: str
+) -> WLResponseCache:
+    """Get or create the response cache shared by hubs with the same credentials.
+
+    The secret is part of the key so that a request with a wrong secret is
+    never answered from a request with the right one.
+    """
+    caches = hass.data.setdefault(RESPONSE_CACHES, {})
+    if (cache := caches.get((api_key, api_secret))) is None:
+        cache = caches[api_key, api_secret] = WLResponseCache()
+    return cache
+
+
+@callback
+def async_remove_response_caches(hass: HomeAssistant, api_key: str) -> None:
+    """Remove the response caches of an API key no entry uses any more."""
+    caches = hass.data.get(RESPONSE_CACHES, {})
+    for key in [key for key in caches if key[0] == api_key]:
+        caches.pop(key).clear()
+    if not caches:
+        hass.data.pop(RESPONSE_CACHES, None)
@@ -2,38 +2,51 @@
 
 from __future__ import annotations
 
+import asyncio
+from hashlib import sha256
 import logging
 from typing import Any
 
+from aiohttp import ClientError
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
     SelectOptionDict,
     SelectSelector,
     SelectSelectorConfig,
     TextSelector,
 )
 
+from .account import async_create_hub
 from .const import (
+    ALL_STATIONS,
     CONF_API_KEY_V2,
     CONF_API_SECRET,
     CONF_API_TOKEN,
     CONF_API_VERSION,
+    CONF_REALTIME,
+    CONF_REALTIME_INTERVAL,
     CONF_STATION_ID,
+    DEFAULT_REALTIME_INTERVAL,
     DOMAIN,
     ApiVersion,
 )
-from .pyweatherlink import WLHub, WLHubV2
+from .decoder import local_product_name
+from .pyweatherlink import WLHub, WLHubLocal
 
 _LOGGER = logging.getLogger(__name__)
 
-API_VERSIONS = [ApiVersion.API_V2, ApiVersion.API_V1]
+API_VERSIONS = [ApiVersion.API_V2, ApiVersion.API_V1, ApiVersion.API_LOCAL]
 
 STEP_USER_APIVER_SCHEMA = vol.Schema(
     {
@@ -64,6 +77,12 @@ STEP_USER_DATA_SCHEMA_V2_B = vol.Schema(
     }
 )
 
+STEP_USER_DATA_SCHEMA_LOCAL = vol.Schema(
+    {
+        vol.Required(CONF_HOST): TextSelector(),
+    }
+)
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect.
@@ -97,12 +116,11 @@ async def validate_input_v2(
 
     Data has the keys from STEP_USER_DATA_SCHEMA_V2 with values provided by the user.
     """
-    websession = async_get_clientsession(hass)
-    hub = WLHubV2(
-        station_id=data.get(CONF_STATION_ID),
-        api_key_v2=data[CONF_API_KEY_V2],
-        api_secret=data[CONF_API_SECRET],
-        websession=websession,
+    hub = async_create_hub(
+        hass,
+        data[CONF_API_KEY_V2],
+        data[CONF_API_SECRET],
+        data.get(CONF_STATION_ID),
     )
 
     if not await hub.authenticate():
@@ -118,12 +136,11 @@ async def validate_input_v2b(
 
     Data has the keys from STEP_USER_DATA_SCHEMA_V2 with values provided by the user.
     """
-    websession = async_get_clientsession(hass)
-    hub = WLHubV2(
-        station_id=data.get(CONF_STATION_ID),
-        api_key_v2=data[CONF_API_KEY_V2],
-        api_secret=data[CONF_API_SECRET],
-        websession=websession,
+    hub = async_create_hub(
+        hass,
+        data[CONF_API_KEY_V2],
+        data[CONF_API_SECRET],
+        data.get(CONF_STATION_ID),
     )
 
     # Return info that you want to store in the config entry.
@@ -134,6 +151,37 @@ async def validate_input_v2b(
     return {"title": station_name}
 
 
+async def validate_input_local(
+    hass: HomeAssistant, data: dict[str, Any]
+) -> dict[str, Any]:
+    """Validate that the device answers on the local API.
+
+    Data has the keys from STEP_USER_DATA_SCHEMA_LOCAL with values provided by the user.
+    """
+    websession = async_get_clientsession(hass)
+    hub = WLHubLocal(host=data[CONF_HOST], websession=websession)
+
+    try:
+        async with asyncio.timeout(10):
+            conditions = await hub.get_data()
+    except (ClientError, TimeoutError) as err:
+        raise CannotConnect from err
+
+    # Return info that you want to store in the config entry.
+    did = conditions["data"]["did"]
+    name = conditions["data"].get("name") or f"{local_product_name(conditions)} {did}"
+
+    return {"title": name, "did": did}
+
+
+def all_stations_unique_id(api_key: str) -> str:
+    """Return the unique id of the all stations entry of an API key.
+
+    The key is hashed so that it is not stored in the entry registry.
+    """
+    return f"{ALL_STATIONS}-{sha256(api_key.encode()).hexdigest()[:16]}"
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Weatherlink."""
 
@@ -141,6 +189,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     user_data_2 = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(
+        cls, config_entry: config_entries.ConfigEntry
+    ) -> bool:
+        """Return options flow support for this handler."""
+        return config_entry.data[CONF_API_VERSION] == ApiVersion.API_LOCAL
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -153,6 +217,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input[CONF_API_VERSION] == ApiVersion.API_V1:
             return await self.async_step_user_1()
+        if user_input[CONF_API_VERSION] == ApiVersion.API_LOCAL:
+            return await self.async_step_user_local()
         return await self.async_step_user_2()
 
     async def async_step_user_1(
@@ -184,6 +250,35 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user_1", data_schema=data_schema, errors=errors
         )
 
+    async def async_step_user_local(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the step for the local API."""
+        data_schema = STEP_USER_DATA_SCHEMA_LOCAL
+        if user_input is None:
+            return self.async_show_form(step_id="user_local", data_schema=data_schema)
+
+        errors = {}
+
+        user_input[CONF_API_VERSION] = ApiVersion.API_LOCAL
+        try:
+            info = await validate_input_local(self.hass, user_input)
+        except CannotConnect:
+            errors["base"] = "cannot_connect"
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception")
+            errors["base"] = "unknown"
+        else:
+            await self.async_set_unique_id(info["did"])
+            self._abort_if_unique_id_configured(
+                updates={CONF_HOST: user_input[CONF_HOST]}
+            )
+            return self.async_create_entry(title=info["title"], data=user_input)
+
+        return self.async_show_form(
+            step_id="user_local", data_schema=data_schema, errors=errors
+        )
+
     async def async_step_user_2(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -219,11 +314,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle the second step for API_V2."""
         data_schema = STEP_USER_DATA_SCHEMA_V2_B
-        websession = async_get_clientsession(self.hass)
-        _api = WLHubV2(
-            api_key_v2=self.user_data_2[CONF_API_KEY_V2],
-            api_secret=self.user_data_2[CONF_API_SECRET],
-            websession=websession,
+        _api = async_create_hub(
+            self.hass,
+            self.user_data_2[CONF_API_KEY_V2],
+            self.user_data_2[CONF_API_SECRET],
         )
         station_list_raw = await _api.get_all_stations()
         station_list = [
@@ -232,13 +326,19 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         ]
         if not station_list:
             return self.async_abort(reason="no_stations")
+        if len(station_list) > 1:
+            station_list.append(
+                SelectOptionDict(value=ALL_STATIONS, label=ALL_STATIONS)
+            )
         if user_input is None:
             return self.async_show_form(
                 step_id="user_3",
                 data_schema=vol.Schema(
                     {
                         vol.Required(CONF_STATION_ID): SelectSelector(
-                            SelectSelectorConfig(options=station_list)
+                            SelectSelectorConfig(
+                                options=station_list, translation_key="station_id"
+                            )
                         ),
                     }
                 ),
@@ -249,6 +349,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         user_input[CONF_API_KEY_V2] = self.user_data_2[CONF_API_KEY_V2]
         user_input[CONF_API_SECRET] = self.user_data_2[CONF_API_SECRET]
 
+        all_stations_id = all_stations_unique_id(user_input[CONF_API_KEY_V2])
+        if user_input[CONF_STATION_ID] == ALL_STATIONS:
+            await self.async_set_unique_id(all_stations_id)
+            self._abort_if_unique_id_configured()
+            return self.async_create_entry(
+                title="All WeatherLink stations", data=user_input
+            )
+
         try:
             info = await validate_input_v2b(self.hass, user_input)
         except CannotConnect:
@@ -261,6 +369,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         else:
             await self.async_set_unique_id(user_input[CONF_STATION_ID])
             self._abort_if_unique_id_configured()
+            # The all stations entry of the key already sets up the station
+            if self.hass.config_entries.async_entry_for_domain_unique_id(
+                DOMAIN, all_stations_id
+            ):
+                return self.async_abort(reason="station_in_all_stations")
             return self.async_create_entry(title=info["title"], data=user_input)
 
         return self.async_show_form(
@@ -271,6 +384,41 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle options of a local device."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the real-time broadcast options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_REALTIME, default=options.get(CONF_REALTIME, True)
+                ): BooleanSelector(),
+                vol.Required(
+                    CONF_REALTIME_INTERVAL,
+                    default=options.get(
+                        CONF_REALTIME_INTERVAL, DEFAULT_REALTIME_INTERVAL
+                    ),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        min=2.5,
+                        max=60,
+                        step=0.5,
+                        unit_of_measurement="s",
+                        mode=NumberSelectorMode.BOX,
+                    )
+                ),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=data_schema)
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
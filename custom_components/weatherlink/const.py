@@ -13,16 +13,78 @@ CONF_API_KEY_V2 = "api_key_v2"
 CONF_API_SECRET = "api_secret"
 CONF_API_TOKEN = "apitoken"
 CONF_STATION_ID = "station_id"
+# Station id of entries polling all stations on their API key
+ALL_STATIONS = "all"
+CONF_REALTIME = "realtime"
+CONF_REALTIME_INTERVAL = "realtime_interval"
+
+LOCAL_UPDATE_INTERVAL = 10
+# Stations of an all stations entry fetched at the same time
+STATIONS_CONCURRENCY = 8
+DEFAULT_REALTIME_INTERVAL = 5
 
 DISCONNECTED_AFTER_SECONDS = 1830
 UNAVAILABLE_AFTER_SECONDS = 3630
 
+SENSOR_TYPE_VUE_AND_VANTAGE_PRO = (
+    23,
+    24,
+    27,
+    28,
+    33,
+    34,
+    37,
+    43,
+    44,
+    45,
+    46,
+    48,
+    49,
+    50,
+    51,
+    76,
+    77,
+    78,
+    79,
+    80,
+    81,
+    82,
+    83,
+    84,
+    85,
+    87,
+)
+
+SENSOR_TYPE_AIRLINK = (
+    323,
+    326,
+)
+
+SENSOR_TYPE_SOIL_LEAF = (56,)
+
 
 class ApiVersion(StrEnum):
     """Supported API versions."""
 
     API_V1 = "api_v1"
     API_V2 = "api_v2"
+    API_LOCAL = "api_local"
+
+
+class SensorFamily(StrEnum):
+    """Sensors refreshed at the same rate."""
+
+    ISS = "iss"
+    AIRLINK = "airlink"
+    SOIL_LEAF = "soil_leaf"
+
+
+# Refresh interval of the families not refreshed with the ISS, a family only
+# fetches on its own when this is shorter than the upload period
+FAMILY_UPDATE_INTERVAL = {
+    SensorFamily.AIRLINK: 60,
+    SensorFamily.SOIL_LEAF: 900,
+}
 
 
 class DataKey(StrEnum):
@@ -32,6 +94,7 @@ class DataKey(StrEnum):
     AQI_NOWCAST_VAL = "aqi_nowcast_val"
     BAR_SEA_LEVEL = "bar_sea_level"
     BAR_TREND = "bar_trend"
+    BAR_TREND_CATEGORY = "bar_trend_category"
     DATA_STRUCTURE = "data_structure"
     DEWPOINT = "dewpoint"
     ET_DAY = "et_day"
@@ -42,6 +105,7 @@ class DataKey(StrEnum):
     HUM_EXTRA = "hum_extra"
     HUM_IN = "hum_in"
     HUM_OUT = "hum_out"
+    LAST_UPDATE = "last_update"
     MOIST_SOIL = "moist_soil"
     PM_1 = "pm_1"
     PM_2P5 = "pm_2p5"
@@ -78,5 +142,7 @@ class DataKey(StrEnum):
     WET_LEAF = "wet_leaf"
     WIND_CHILL = "wind_chill"
     WIND_DIR = "wind_dir"
+    WIND_DIR_CARDINAL = "wind_dir_cardinal"
     WIND_MPH = "wind_mph"
     WIND_GUST_MPH = "wind_gust_mph"
+    WIND_GUST_MPH_VALID = "wind_gust_mph_valid"
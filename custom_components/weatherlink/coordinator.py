@@ -0,0 +1,321 @@
+"""Data update coordinator for the Weatherlink integration."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from enum import IntEnum
+from functools import partial
+import logging
+from time import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_at
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import (
+    DISCONNECTED_AFTER_SECONDS,
+    DOMAIN,
+    UNAVAILABLE_AFTER_SECONDS,
+    DataKey,
+)
+from .derived import derive_transmitter, derive_values
+from .schema import Current
+
+_LOGGER = logging.getLogger(__name__)
+
+STALE_AFTER_SECONDS = (DISCONNECTED_AFTER_SECONDS, UNAVAILABLE_AFTER_SECONDS)
+
+
+class Staleness(IntEnum):
+    """Staleness thresholds of STALE_AFTER_SECONDS a transmitter has passed."""
+
+    FRESH = 0
+    DISCONNECTED = 1
+    UNAVAILABLE = 2
+
+
+MISSING = object()
+
+
+def observation_fingerprint(indata: dict[str, Any] | Current) -> tuple:
+    """Return a fingerprint of the observations in a raw API response."""
+    if isinstance(indata, Current):
+        # The raw record spans compare equal when the records are the same
+        return tuple((sensor.lsid, sensor.data) for sensor in indata.sensors)
+    if "sensors" in indata:
+        return tuple(
+            (sensor.get("lsid"), *(record.get("ts") for record in sensor["data"]))
+            for sensor in indata["sensors"]
+            if sensor.get("data")
+        )
+    if "data" in indata:
+        return (indata["data"].get("ts"),)
+    return (indata.get("observation_time_rfc822"),)
+
+
+def staleness(data: dict, now: float) -> dict[Any, int]:
+    """Return how many staleness thresholds each transmitter has passed."""
+    return {
+        tx_id: sum(
+            now - values[DataKey.TIMESTAMP] >= limit for limit in STALE_AFTER_SECONDS
+        )
+        for tx_id, values in data.items()
+        if isinstance(values, dict) and values.get(DataKey.TIMESTAMP) is not None
+    }
+
+
+def changed_keys(previous: dict, data: dict) -> dict[Any, set[str]] | None:
+    """Return the keys that changed per transmitter.
+
+    None is returned when the set of transmitters or the station changed.
+    """
+    if previous.keys() != data.keys():
+        return None
+    changed: dict[Any, set[str]] = {}
+    for tx_id, values in data.items():
+        old = previous[tx_id]
+        if not isinstance(values, dict):
+            if values != old:
+                return None
+            continue
+        if values == old:
+            continue
+        changed[tx_id] = {
+            key for key, value in values.items() if old.get(key, MISSING) != value
+        } | (old.keys() - values.keys())
+    return changed
+
+
+def context_changed(
+    context: tuple[Any, frozenset[str]] | None, changed: dict[Any, set[str] | None]
+) -> bool:
+    """Return if a listener registered with context is affected by changed."""
+    if context is None:
+        return True
+    tx_id, tags = context
+    if tx_id not in changed:
+        return False
+    return (keys := changed[tx_id]) is None or not keys.isdisjoint(tags)
+
+
+class WLDataUpdateCoordinator(DataUpdateCoordinator[dict]):
+    """Coordinator that skips decoding and notification of unchanged data.
+
+    The update method passes the raw response to async_decode. Listeners are
+    only called when the decoded data differs from the previous refresh, or
+    when a transmitter passes one of the staleness thresholds so that
+    availability and connectivity are re-evaluated.
+
+    Entities register with a (tx_id, tags) context and are only called when
+    one of their tags changed. All entities of a transmitter are called when
+    it passes a staleness threshold, and all listeners are called after
+    failed refreshes or when the transmitters change.
+
+    Data restored from disk at startup is marked by restored until the first
+    live refresh, which calls all listeners.
+
+    The staleness of each transmitter is kept in staleness, so that entities
+    do not compare clocks when read. A timer is scheduled for the next
+    threshold each transmitter passes, which calls the entities of that
+    transmitter when it does.
+
+    Values received between refreshes, like the real-time broadcast of a
+    WeatherLink Live, are merged with async_push. A coordinator sharing the
+    response of another one takes its refreshes with async_take_refresh.
+
+    The derived values of the transmitters are added to decoded, restored
+    and pushed data before listeners see it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        update_method: Callable[[], Awaitable[dict]],
+        update_interval: timedelta | None,
+        always_update: bool = False,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_method=update_method,
+            update_interval=update_interval,
+            always_update=always_update,
+        )
+        self.fingerprint: tuple | None = None
+        self.restored = False
+        self.unchanged_refreshes = 0
+        self.staleness: dict[Any, int] = {}
+        self._staleness_timers: dict[Any, CALLBACK_TYPE] = {}
+        self._changed: dict[Any, set[str] | None] | None = None
+
+    @callback
+    def async_decode(
+        self, indata: dict[str, Any], decode: Callable[[dict[str, Any]], dict]
+    ) -> dict:
+        """Decode a raw response unless it has the same observations as before."""
+        fingerprint = observation_fingerprint(indata)
+        if self.data is None or fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            data = derive_values(decode(indata))
+            self._async_set_changed(data)
+            if self.restored:
+                self.restored = False
+                self._changed = None
+                if data == self.data:
+                    self.async_update_listeners()
+            return data
+
+        self.unchanged_refreshes += 1
+        _LOGGER.debug(
+            "No new observations, %s unchanged refreshes", self.unchanged_refreshes
+        )
+        if self.last_update_success and self._async_set_changed(self.data):
+            self.async_update_listeners()
+        return self.data
+
+    @callback
+    def async_restore(self, data: dict) -> None:
+        """Use data restored from disk until the first live refresh."""
+        self.data = derive_values(data)
+        self.restored = True
+        self.staleness = self._async_track_staleness(data)
+
+    @callback
+    def async_follow(self, coordinator: WLDataUpdateCoordinator) -> None:
+        """Start from the data of another coordinator until the first refresh."""
+        self.data = coordinator.data
+        self.fingerprint = coordinator.fingerprint
+        self.restored = coordinator.restored
+        self.staleness = self._async_track_staleness(self.data)
+
+    @callback
+    def async_take_refresh(self, coordinator: WLDataUpdateCoordinator) -> None:
+        """Take the data of a refresh of another coordinator as a refresh.
+
+        Only the listeners whose tags changed are called, and a refresh of its
+        own is postponed by the update interval.
+        """
+        if coordinator.data is None or not coordinator.last_update_success:
+            return
+        self.fingerprint = coordinator.fingerprint
+        was_restored, self.restored = self.restored, coordinator.restored
+        if self._async_set_changed(coordinator.data) or (
+            was_restored and not self.restored
+        ):
+            if was_restored:
+                self._changed = None
+            self.async_set_updated_data(coordinator.data)
+            return
+        self.data = coordinator.data
+        self._async_unsub_refresh()
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_push(self, updates: dict[Any, dict[str, Any]]) -> None:
+        """Merge values of known transmitters into data and call affected listeners.
+
+        Unlike async_set_updated_data the refresh schedule is left untouched.
+        """
+        if self.data is None or not self.last_update_success:
+            return
+        data = dict(self.data)
+        for tx_id, values in updates.items():
+            if isinstance(old := data.get(tx_id), dict):
+                data[tx_id] = {**old, **values}
+                derive_transmitter(data[tx_id])
+        if not (changed := changed_keys(self.data, data)):
+            return
+        self.data = data
+        self._changed = changed
+        self.async_update_listeners()
+
+    @callback
+    def _async_set_changed(self, data: dict) -> bool:
+        """Record what changed since the data listeners last saw.
+
+        Return if any listener needs to be called.
+        """
+        current = self._async_track_staleness(data)
+        changed = (
+            changed_keys(self.data, data)
+            if self.data is not None and self.last_update_success
+            else None
+        )
+        if changed is not None:
+            for tx_id, band in current.items():
+                if band != self.staleness.get(tx_id):
+                    changed[tx_id] = None
+        self.staleness = current
+        self._changed = changed or None
+        return changed is None or bool(changed)
+
+    @callback
+    def _async_track_staleness(self, data: dict) -> dict[Any, int]:
+        """Return the staleness of the transmitters and schedule their timers."""
+        now = time()
+        current = staleness(data, now)
+        for tx_id in self._staleness_timers.keys() - current.keys():
+            self._staleness_timers.pop(tx_id)()
+        for tx_id, band in current.items():
+            self._async_schedule_staleness(
+                tx_id, data[tx_id][DataKey.TIMESTAMP], band, now
+            )
+        return current
+
+    @callback
+    def _async_schedule_staleness(
+        self, tx_id: Any, timestamp: float, band: int, now: float
+    ) -> None:
+        """Schedule the timer of the next threshold a transmitter passes."""
+        if (cancel := self._staleness_timers.pop(tx_id, None)) is not None:
+            cancel()
+        if band >= len(STALE_AFTER_SECONDS):
+            return
+        self._staleness_timers[tx_id] = async_call_at(
+            self.hass,
+            HassJob(
+                partial(self._async_staleness_passed, tx_id, timestamp),
+                f"{DOMAIN} staleness {tx_id}",
+                cancel_on_shutdown=True,
+            ),
+            self.hass.loop.time() + timestamp + STALE_AFTER_SECONDS[band] - now,
+        )
+
+    @callback
+    def _async_staleness_passed(
+        self, tx_id: Any, timestamp: float, _now: datetime
+    ) -> None:
+        """Call the listeners of a transmitter that passed a threshold."""
+        self._staleness_timers.pop(tx_id, None)
+        now = time()
+        band = sum(now - timestamp >= limit for limit in STALE_AFTER_SECONDS)
+        self._async_schedule_staleness(tx_id, timestamp, band, now)
+        if band == self.staleness.get(tx_id):
+            return
+        self.staleness[tx_id] = band
+        self._changed = {tx_id: None}
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the staleness timers and any scheduled refresh."""
+        for cancel in self._staleness_timers.values():
+            cancel()
+        self._staleness_timers.clear()
+        await super().async_shutdown()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose tags changed."""
+        changed, self._changed = self._changed, None
+        if changed is None:
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context_changed(context, changed):
+                update_callback()
@@ -0,0 +1,683 @@
+"""Decoder for Weatherlink API v2 observations and local device conditions.
+
+Each supported combination of sensor type and data structure type is described
+declaratively in OBSERVATION_MAPPINGS, for /historic in HISTORIC_MAPPINGS and
+for the local API of WeatherLink Live and AirLink in LOCAL_MAPPINGS and
+REALTIME_MAPPINGS. The mappings are compiled once at import into dispatch tables, so decoding a
+sensor is one dict lookup followed by a copy loop.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any
+
+from .const import SENSOR_TYPE_AIRLINK, SENSOR_TYPE_VUE_AND_VANTAGE_PRO, DataKey
+
+REQUIRED: Any = object()
+
+
+class Target(IntEnum):
+    """Where the decoded fields of a sensor are stored."""
+
+    TX_ID = 1
+    TX_ID_OR_1 = 2
+    LSID = 3
+    PRIMARY = 4
+
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    """Copy one value from the API record to a normalized key.
+
+    A field with default REQUIRED raises KeyError when the source key is absent.
+    """
+
+    source: str
+    key: str
+    default: Any = REQUIRED
+    transform: Callable[[Any], Any] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class StructureMapping:
+    """Fields to decode for a set of sensor types sharing a data structure."""
+
+    sensor_types: tuple[int, ...]
+    data_structure_types: tuple[int, ...]
+    target: Target
+    fields: tuple[Field, ...]
+    stamp: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPlan:
+    """Field plan for one (sensor_type, data_structure_type) combination."""
+
+    target: Target
+    stamp: bool
+    required: tuple[tuple[str, str], ...]
+    optional: tuple[tuple[str, str, Any], ...]
+    transformed: tuple[tuple[str, str, Any, Callable[[Any], Any]], ...]
+
+
+def none_to_zero(value: Any) -> Any:
+    """Replace a missing rain amount with zero."""
+    return 0.0 if value is None else value
+
+
+def per_mille(value: Any) -> Any:
+    """Scale a bar trend reported in thousandths of inHg."""
+    return None if value is None else value / 1000
+
+
+def numbered(source: str, key: str, count: int, first: int = 1) -> tuple[Field, ...]:
+    """Generate fields for numbered inputs like temp_extra_1..temp_extra_7."""
+    return tuple(
+        Field(f"{source}_{numb}", f"{key}_{numb}") for numb in range(first, count + 1)
+    )
+
+
+ISS_AND_SENSOR_SUITE = (*SENSOR_TYPE_VUE_AND_VANTAGE_PRO, 55)
+
+OBSERVATION_MAPPINGS: tuple[StructureMapping, ...] = (
+    # WeatherLink Live ISS
+    StructureMapping(
+        sensor_types=ISS_AND_SENSOR_SUITE,
+        data_structure_types=(10,),
+        target=Target.TX_ID,
+        fields=(
+            Field("temp", DataKey.TEMP_OUT),
+            Field("hum", DataKey.HUM_OUT),
+            Field("wind_speed_last", DataKey.WIND_MPH),
+            Field("wind_speed_hi_last_10_min", DataKey.WIND_GUST_MPH),
+            Field("wind_dir_last", DataKey.WIND_DIR),
+            Field("dew_point", DataKey.DEWPOINT),
+            Field("heat_index", DataKey.HEAT_INDEX),
+            Field("thw_index", DataKey.THW_INDEX),
+            Field("thsw_index", DataKey.THSW_INDEX),
+            Field("wet_bulb", DataKey.WET_BULB),
+            Field("wind_chill", DataKey.WIND_CHILL),
+            Field("rainfall_daily_in", DataKey.RAIN_DAY, 0.0),
+            Field("rain_storm_in", DataKey.RAIN_STORM, 0.0, none_to_zero),
+            Field("rain_storm_start_at", DataKey.RAIN_STORM_START, None),
+            Field("rain_storm_last_in", DataKey.RAIN_STORM_LAST, 0.0, none_to_zero),
+            Field("rain_storm_last_start_at", DataKey.RAIN_STORM_LAST_START, None),
+            Field("rain_storm_last_end_at", DataKey.RAIN_STORM_LAST_END, None),
+            Field("rain_rate_last_in", DataKey.RAIN_RATE),
+            Field("rainfall_monthly_in", DataKey.RAIN_MONTH),
+            Field("rainfall_year_in", DataKey.RAIN_YEAR),
+            Field("trans_battery_flag", DataKey.TRANS_BATTERY_FLAG),
+            Field("uv_index", DataKey.UV_INDEX),
+            Field("solar_rad", DataKey.SOLAR_RADIATION),
+            Field("et_day", DataKey.ET_DAY, None),
+            Field("et_month", DataKey.ET_MONTH, None),
+            Field("et_year", DataKey.ET_YEAR, None),
+        ),
+    ),
+    # WeatherLink IP / Vantage console
+    StructureMapping(
+        sensor_types=SENSOR_TYPE_VUE_AND_VANTAGE_PRO,
+        data_structure_types=(2,),
+        target=Target.TX_ID_OR_1,
+        fields=(
+            Field("temp_out", DataKey.TEMP_OUT),
+            Field("temp_in", DataKey.TEMP_IN),
+            *numbered("temp_extra", DataKey.TEMP_EXTRA, 7),
+            *numbered("temp_leaf", DataKey.TEMP_LEAF, 4),
+            *numbered("temp_soil", DataKey.TEMP_SOIL, 4),
+            *numbered("hum_extra", DataKey.HUM_EXTRA, 7),
+            *numbered("moist_soil", DataKey.MOIST_SOIL, 4),
+            *numbered("wet_leaf", DataKey.WET_LEAF, 4),
+            Field("bar", DataKey.BAR_SEA_LEVEL),
+            Field("bar_trend", DataKey.BAR_TREND, 0, per_mille),
+            Field("hum_out", DataKey.HUM_OUT),
+            Field("hum_in", DataKey.HUM_IN),
+            Field("wind_speed", DataKey.WIND_MPH),
+            Field("wind_gust_10_min", DataKey.WIND_GUST_MPH),
+            Field("wind_dir", DataKey.WIND_DIR),
+            Field("dew_point", DataKey.DEWPOINT),
+            Field("heat_index", DataKey.HEAT_INDEX),
+            Field("wind_chill", DataKey.WIND_CHILL),
+            Field("rain_day_in", DataKey.RAIN_DAY, None),
+            Field("rain_storm_in", DataKey.RAIN_STORM, 0.0, none_to_zero),
+            Field("rain_storm_start_date", DataKey.RAIN_STORM_START, None),
+            Field("rain_rate_in", DataKey.RAIN_RATE),
+            Field("rain_month_in", DataKey.RAIN_MONTH),
+            Field("rain_year_in", DataKey.RAIN_YEAR),
+            Field("solar_rad", DataKey.SOLAR_RADIATION),
+            Field("uv", DataKey.UV_INDEX),
+            Field("et_day", DataKey.ET_DAY),
+            Field("et_month", DataKey.ET_MONTH),
+            Field("et_year", DataKey.ET_YEAR),
+        ),
+    ),
+    # EnviroMonitor
+    StructureMapping(
+        sensor_types=SENSOR_TYPE_VUE_AND_VANTAGE_PRO,
+        data_structure_types=(6,),
+        target=Target.TX_ID_OR_1,
+        fields=(
+            Field("temp_out", DataKey.TEMP_OUT),
+            Field("bar", DataKey.BAR_SEA_LEVEL),
+            Field("bar_trend", DataKey.BAR_TREND, 0, per_mille),
+            Field("hum_out", DataKey.HUM_OUT),
+            Field("wind_speed", DataKey.WIND_MPH),
+            Field("wind_gust_10_min", DataKey.WIND_GUST_MPH),
+            Field("wind_dir", DataKey.WIND_DIR),
+            Field("dew_point", DataKey.DEWPOINT),
+            Field("heat_index", DataKey.HEAT_INDEX),
+            Field("wind_chill", DataKey.WIND_CHILL),
+            Field("rain_day_in", DataKey.RAIN_DAY, None),
+            Field("rain_storm_in", DataKey.RAIN_STORM, 0.0, none_to_zero),
+            Field("rain_storm_start_date", DataKey.RAIN_STORM_START, None),
+            Field("rain_rate_in", DataKey.RAIN_RATE),
+            Field("solar_rad", DataKey.SOLAR_RADIATION),
+            Field("uv", DataKey.UV_INDEX),
+            Field("et_day", DataKey.ET_DAY),
+            Field("thsw_index", DataKey.THSW_INDEX),
+            Field("wet_bulb", DataKey.WET_BULB),
+        ),
+    ),
+    # WeatherLink Console ISS
+    StructureMapping(
+        sensor_types=ISS_AND_SENSOR_SUITE,
+        data_structure_types=(23,),
+        target=Target.TX_ID,
+        fields=(
+            Field("temp", DataKey.TEMP_OUT),
+            Field("hum", DataKey.HUM_OUT),
+            Field("wind_speed_last", DataKey.WIND_MPH),
+            Field("wind_speed_hi_last_10_min", DataKey.WIND_GUST_MPH),
+            Field("wind_dir_last", DataKey.WIND_DIR),
+            Field("dew_point", DataKey.DEWPOINT),
+            Field("heat_index", DataKey.HEAT_INDEX),
+            Field("thw_index", DataKey.THW_INDEX),
+            Field("thsw_index", DataKey.THSW_INDEX),
+            Field("wet_bulb", DataKey.WET_BULB),
+            Field("wind_chill", DataKey.WIND_CHILL),
+            Field("rainfall_day_in", DataKey.RAIN_DAY, 0.0),
+            Field("rain_storm_current_in", DataKey.RAIN_STORM, 0.0, none_to_zero),
+            Field("rain_storm_current_start_at", DataKey.RAIN_STORM_START, None),
+            Field("rain_storm_last_in", DataKey.RAIN_STORM_LAST, 0.0, none_to_zero),
+            Field("rain_storm_last_start_at", DataKey.RAIN_STORM_LAST_START, None),
+            Field("rain_storm_last_end_at", DataKey.RAIN_STORM_LAST_END, None),
+            Field("rain_rate_last_in", DataKey.RAIN_RATE),
+            Field("rainfall_month_in", DataKey.RAIN_MONTH),
+            Field("rainfall_year_in", DataKey.RAIN_YEAR),
+            Field("trans_battery_flag", DataKey.TRANS_BATTERY_FLAG),
+            Field("trans_battery_volt", DataKey.TRANS_BATTERY_VOLT),
+            Field("supercap_volt", DataKey.SUPERCAP_VOLT),
+            Field("solar_panel_volt", DataKey.SOLAR_PANEL_VOLT),
+            Field("solar_rad", DataKey.SOLAR_RADIATION),
+            Field("uv_index", DataKey.UV_INDEX),
+            Field("et_day", DataKey.ET_DAY),
+            Field("et_month", DataKey.ET_MONTH),
+            Field("et_year", DataKey.ET_YEAR),
+        ),
+    ),
+    # Leaf/Soil station
+    StructureMapping(
+        sensor_types=(56,),
+        data_structure_types=(12,),
+        target=Target.TX_ID,
+        fields=(
+            *numbered("temp", DataKey.TEMP, 4),
+            *numbered("moist_soil", DataKey.MOIST_SOIL, 4),
+            *numbered("wet_leaf", DataKey.WET_LEAF, 2),
+        ),
+    ),
+    StructureMapping(
+        sensor_types=(56,),
+        data_structure_types=(25,),
+        target=Target.TX_ID,
+        fields=(
+            *numbered("temp", DataKey.TEMP, 4),
+            *numbered("moist_soil", DataKey.MOIST_SOIL, 4),
+            *numbered("wet_leaf", DataKey.WET_LEAF, 2),
+            Field("trans_battery_flag", DataKey.TRANS_BATTERY_FLAG),
+        ),
+    ),
+    # Inside temperature/humidity, merged into the primary transmitter
+    StructureMapping(
+        sensor_types=(365,),
+        data_structure_types=(21,),
+        target=Target.PRIMARY,
+        stamp=False,
+        fields=(
+            Field("temp_in", DataKey.TEMP_IN),
+            Field("hum_in", DataKey.HUM_IN),
+        ),
+    ),
+    StructureMapping(
+        sensor_types=(243,),
+        data_structure_types=(12,),
+        target=Target.PRIMARY,
+        stamp=False,
+        fields=(
+            Field("temp_in", DataKey.TEMP_IN),
+            Field("hum_in", DataKey.HUM_IN),
+        ),
+    ),
+    # Barometer, merged into the primary transmitter
+    StructureMapping(
+        sensor_types=(242,),
+        data_structure_types=(12, 19),
+        target=Target.PRIMARY,
+        stamp=False,
+        fields=(
+            Field("bar_sea_level", DataKey.BAR_SEA_LEVEL),
+            Field("bar_trend", DataKey.BAR_TREND),
+        ),
+    ),
+    # AirLink
+    StructureMapping(
+        sensor_types=SENSOR_TYPE_AIRLINK,
+        data_structure_types=(16,),
+        target=Target.LSID,
+        fields=(
+            Field("temp", DataKey.TEMP),
+            Field("hum", DataKey.HUM),
+            Field("dew_point", DataKey.DEWPOINT),
+            Field("heat_index", DataKey.HEAT_INDEX),
+            Field("wet_bulb", DataKey.WET_BULB),
+            Field("pm_1", DataKey.PM_1),
+            Field("pm_2p5", DataKey.PM_2P5),
+            Field("pm_2p5_24_hour", DataKey.PM_2P5_24H),
+            Field("pm_10", DataKey.PM_10),
+            Field("pm_10_24_hour", DataKey.PM_10_24H),
+            Field("aqi_val", DataKey.AQI_VAL),
+            Field("aqi_nowcast_val", DataKey.AQI_NOWCAST_VAL),
+        ),
+    ),
+)
+
+
+def compile_mappings(
+    mappings: Iterable[StructureMapping],
+) -> dict[tuple[int, int], CompiledPlan]:
+    """Compile mappings into a dispatch table keyed by (sensor_type, structure)."""
+    dispatch: dict[tuple[int, int], CompiledPlan] = {}
+    for mapping in mappings:
+        plan = CompiledPlan(
+            target=mapping.target,
+            stamp=mapping.stamp,
+            required=tuple(
+                (field.source, field.key)
+                for field in mapping.fields
+                if field.default is REQUIRED and field.transform is None
+            ),
+            optional=tuple(
+                (field.source, field.key, field.default)
+                for field in mapping.fields
+                if field.default is not REQUIRED and field.transform is None
+            ),
+            transformed=tuple(
+                (field.source, field.key, field.default, field.transform)
+                for field in mapping.fields
+                if field.transform is not None
+            ),
+        )
+        for sensor_type in mapping.sensor_types:
+            for structure in mapping.data_structure_types:
+                if (sensor_type, structure) in dispatch:
+                    raise ValueError(
+                        f"Duplicate mapping for sensor type {sensor_type}"
+                        f" and data structure {structure}"
+                    )
+                dispatch[(sensor_type, structure)] = plan
+    return dispatch
+
+
+DISPATCH = compile_mappings(OBSERVATION_MAPPINGS)
+
+
+HISTORIC_MAPPINGS: tuple[StructureMapping, ...] = (
+    # WeatherLink Live and Console ISS archive
+    StructureMapping(
+        sensor_types=ISS_AND_SENSOR_SUITE,
+        data_structure_types=(11, 24),
+        target=Target.TX_ID_OR_1,
+        fields=(
+            Field("temp_last", DataKey.TEMP_OUT, None),
+            Field("hum_last", DataKey.HUM_OUT, None),
+            Field("dew_point_last", DataKey.DEWPOINT, None),
+            Field("heat_index_last", DataKey.HEAT_INDEX, None),
+            Field("wind_chill_last", DataKey.WIND_CHILL, None),
+            Field("thw_index_last", DataKey.THW_INDEX, None),
+            Field("thsw_index_last", DataKey.THSW_INDEX, None),
+            Field("wet_bulb_last", DataKey.WET_BULB, None),
+            Field("wind_speed_avg", DataKey.WIND_MPH, None),
+            Field("wind_speed_hi", DataKey.WIND_GUST_MPH, None),
+            Field("wind_dir_of_prevail", DataKey.WIND_DIR, None),
+            Field("rain_rate_hi_in", DataKey.RAIN_RATE, None),
+            Field("solar_rad_avg", DataKey.SOLAR_RADIATION, None),
+            Field("uv_index_avg", DataKey.UV_INDEX, None),
+        ),
+    ),
+    # Inside temperature/humidity archive
+    StructureMapping(
+        sensor_types=(243, 365),
+        data_structure_types=(13, 22),
+        target=Target.PRIMARY,
+        fields=(
+            Field("temp_in_last", DataKey.TEMP_IN, None),
+            Field("hum_in_last", DataKey.HUM_IN, None),
+        ),
+    ),
+    # Barometer archive
+    StructureMapping(
+        sensor_types=(242,),
+        data_structure_types=(13, 20),
+        target=Target.PRIMARY,
+        fields=(Field("bar_sea_level", DataKey.BAR_SEA_LEVEL, None),),
+    ),
+)
+
+HISTORIC_DISPATCH = compile_mappings(HISTORIC_MAPPINGS)
+
+
+# The local API does not report sensor types
+LOCAL_SENSOR_TYPE = 0
+
+# Rain is reported locally as counts of the rain collector size, in inches
+LOCAL_RAIN_SIZES = {1: 0.01, 2: 0.2 / 25.4, 3: 0.1 / 25.4, 4: 0.001}
+LOCAL_RAIN_COUNTS = (
+    "rain_rate_last",
+    "rainfall_daily",
+    "rainfall_monthly",
+    "rainfall_year",
+    "rain_storm",
+    "rain_storm_last",
+)
+
+LOCAL_MAPPINGS: tuple[StructureMapping, ...] = (
+    # WeatherLink Live ISS
+    StructureMapping(
+        sensor_types=(LOCAL_SENSOR_TYPE,),
+        data_structure_types=(1,),
+        target=Target.TX_ID,
+        fields=(
+            Field("temp", DataKey.TEMP_OUT),
+            Field("hum", DataKey.HUM_OUT),
+            Field("wind_speed_last", DataKey.WIND_MPH),
+            Field("wind_speed_hi_last_10_min", DataKey.WIND_GUST_MPH),
+            Field("wind_dir_last", DataKey.WIND_DIR),
+            Field("dew_point", DataKey.DEWPOINT),
+            Field("heat_index", DataKey.HEAT_INDEX),
+            Field("thw_index", DataKey.THW_INDEX, None),
+            Field("thsw_index", DataKey.THSW_INDEX, None),
+            Field("wet_bulb", DataKey.WET_BULB, None),
+            Field("wind_chill", DataKey.WIND_CHILL),
+            Field("rainfall_daily", DataKey.RAIN_DAY, 0.0),
+            Field("rain_storm", DataKey.RAIN_STORM, 0.0, none_to_zero),
+            Field("rain_storm_start_at", DataKey.RAIN_STORM_START, None),
+            Field("rain_storm_last", DataKey.RAIN_STORM_LAST, 0.0, none_to_zero),
+            Field("rain_storm_last_start_at", DataKey.RAIN_STORM_LAST_START, None),
+            Field("rain_storm_last_end_at", DataKey.RAIN_STORM_LAST_END, None),
+            Field("rain_rate_last", DataKey.RAIN_RATE),
+            Field("rainfall_monthly", DataKey.RAIN_MONTH),
+            Field("rainfall_year", DataKey.RAIN_YEAR),
+            Field("trans_battery_flag", DataKey.TRANS_BATTERY_FLAG, None),
+            Field("uv_index", DataKey.UV_INDEX, None),
+            Field("solar_rad", DataKey.SOLAR_RADIATION, None),
+        ),
+    ),
+    # WeatherLink Live leaf/soil station
+    StructureMapping(
+        sensor_types=(LOCAL_SENSOR_TYPE,),
+        data_structure_types=(2,),
+        target=Target.TX_ID,
+        fields=(
+            *numbered("temp", DataKey.TEMP, 4),
+            *numbered("moist_soil", DataKey.MOIST_SOIL, 4),
+            *numbered("wet_leaf", DataKey.WET_LEAF, 2),
+            Field("trans_battery_flag", DataKey.TRANS_BATTERY_FLAG, None),
+        ),
+    ),
+    # WeatherLink Live barometer, the trend is null for the first 3 hours
+    StructureMapping(
+        sensor_types=(LOCAL_SENSOR_TYPE,),
+        data_structure_types=(3,),
+        target=Target.PRIMARY,
+        stamp=False,
+        fields=(
+            Field("bar_sea_level", DataKey.BAR_SEA_LEVEL),
+            Field("bar_trend", DataKey.BAR_TREND, None),
+        ),
+    ),
+    # WeatherLink Live inside temperature/humidity
+    StructureMapping(
+        sensor_types=(LOCAL_SENSOR_TYPE,),
+        data_structure_types=(4,),
+        target=Target.PRIMARY,
+        stamp=False,
+        fields=(
+            Field("temp_in", DataKey.TEMP_IN),
+            Field("hum_in", DataKey.HUM_IN),
+        ),
+    ),
+    # AirLink, keyed by lsid like in API v2
+    StructureMapping(
+        sensor_types=(LOCAL_SENSOR_TYPE,),
+        data_structure_types=(6,),
+        target=Target.LSID,
+        fields=(
+            Field("temp", DataKey.TEMP),
+            Field("hum", DataKey.HUM),
+            Field("dew_point", DataKey.DEWPOINT),
+            Field("heat_index", DataKey.HEAT_INDEX),
+            Field("wet_bulb", DataKey.WET_BULB),
+            Field("pm_1", DataKey.PM_1),
+            Field("pm_2p5", DataKey.PM_2P5),
+            Field("pm_2p5_last_24_hours", DataKey.PM_2P5_24H),
+            Field("pm_10", DataKey.PM_10),
+            Field("pm_10_last_24_hours", DataKey.PM_10_24H),
+        ),
+    ),
+)
+
+LOCAL_DISPATCH = compile_mappings(LOCAL_MAPPINGS)
+
+REALTIME_MAPPINGS: tuple[StructureMapping, ...] = (
+    # WeatherLink Live real-time broadcast of wind and rain
+    StructureMapping(
+        sensor_types=(LOCAL_SENSOR_TYPE,),
+        data_structure_types=(1,),
+        target=Target.TX_ID,
+        stamp=False,
+        fields=(
+            Field("wind_speed_last", DataKey.WIND_MPH),
+            Field("wind_speed_hi_last_10_min", DataKey.WIND_GUST_MPH),
+            Field("wind_dir_last", DataKey.WIND_DIR),
+            Field("rain_rate_last", DataKey.RAIN_RATE),
+            Field("rainfall_daily", DataKey.RAIN_DAY, 0.0),
+            Field("rain_storm", DataKey.RAIN_STORM, 0.0, none_to_zero),
+            Field("rain_storm_start_at", DataKey.RAIN_STORM_START, None),
+            Field("rainfall_monthly", DataKey.RAIN_MONTH),
+            Field("rainfall_year", DataKey.RAIN_YEAR),
+        ),
+    ),
+)
+
+REALTIME_DISPATCH = compile_mappings(REALTIME_MAPPINGS)
+
+
+def resolve_tx_id(
+    target: Target, sensor: dict[str, Any], data: dict[str, Any], primary_tx_id: int
+) -> Any:
+    """Return the transmitter a decoded record belongs to."""
+    if target is Target.PRIMARY:
+        return primary_tx_id
+    if target is Target.TX_ID:
+        return data["tx_id"]
+    if target is Target.TX_ID_OR_1:
+        return data.get("tx_id", 1)
+    return sensor["lsid"]
+
+
+def copy_fields(plan: CompiledPlan, data: dict[str, Any], out: dict) -> None:
+    """Copy the fields of a plan from an API record."""
+    for source, key in plan.required:
+        out[key] = data[source]
+    get = data.get
+    for source, key, default in plan.optional:
+        out[key] = get(source, default)
+    for source, key, default, transform in plan.transformed:
+        out[key] = transform(get(source, default))
+
+
+def decode_current(indata: dict[str, Any], primary_tx_id: int) -> dict[Any, Any]:
+    """Normalize a v2 /current payload into per transmitter dicts."""
+    outdata: dict[Any, Any] = {primary_tx_id: {}}
+    outdata[DataKey.UUID] = indata["station_id_uuid"]
+    for sensor in indata["sensors"]:
+        decode_current_sensor(sensor, outdata, primary_tx_id)
+    return outdata
+
+
+def decode_current_sensor(
+    sensor: dict[str, Any], outdata: dict[Any, Any], primary_tx_id: int
+) -> None:
+    """Normalize the record of one sensor of a /current payload into outdata."""
+    sensor_type = sensor["sensor_type"]
+    structure = sensor["data_structure_type"]
+    if (plan := DISPATCH.get((sensor_type, structure))) is None:
+        return
+    data = sensor["data"][0]
+
+    tx_id = resolve_tx_id(plan.target, sensor, data, primary_tx_id)
+    if (out := outdata.get(tx_id)) is None:
+        out = outdata[tx_id] = {}
+
+    if plan.stamp:
+        out[DataKey.SENSOR_TYPE] = sensor_type
+        out[DataKey.DATA_STRUCTURE] = structure
+        out[DataKey.TIMESTAMP] = data["ts"]
+    copy_fields(plan, data, out)
+
+
+def decode_historic(
+    indata: dict[str, Any], primary_tx_id: int
+) -> Iterator[tuple[Any, int, dict[str, Any]]]:
+    """Normalize the archive records of a v2 /historic payload.
+
+    Yields tx_id, timestamp and decoded values for each supported record.
+    """
+    dispatch_get = HISTORIC_DISPATCH.get
+    for sensor in indata["sensors"]:
+        plan = dispatch_get((sensor["sensor_type"], sensor["data_structure_type"]))
+        if plan is None:
+            continue
+        for data in sensor["data"]:
+            out: dict[str, Any] = {}
+            copy_fields(plan, data, out)
+            yield (
+                resolve_tx_id(plan.target, sensor, data, primary_tx_id),
+                data["ts"],
+                out,
+            )
+
+
+def local_record(condition: dict[str, Any], timestamp: int) -> dict[str, Any]:
+    """Return a local condition record with the field names of API v2."""
+    record = {**condition, "ts": timestamp}
+    if "txid" in condition:
+        record["tx_id"] = condition["txid"]
+    if (size := LOCAL_RAIN_SIZES.get(condition.get("rain_size"))) is not None:
+        for source in LOCAL_RAIN_COUNTS:
+            if (count := condition.get(source)) is not None:
+                record[source] = round(count * size, 4)
+    return record
+
+
+def decode_local(indata: dict[str, Any], primary_tx_id: int) -> dict[Any, Any]:
+    """Normalize a local /v1/current_conditions payload into per transmitter dicts."""
+    data = indata["data"]
+    outdata: dict[Any, Any] = {primary_tx_id: {}}
+    outdata[DataKey.UUID] = data["did"]
+    dispatch_get = LOCAL_DISPATCH.get
+    for condition in data["conditions"]:
+        structure = condition["data_structure_type"]
+        if (plan := dispatch_get((LOCAL_SENSOR_TYPE, structure))) is None:
+            continue
+        record = local_record(condition, data["ts"])
+        tx_id = resolve_tx_id(plan.target, condition, record, primary_tx_id)
+        if (out := outdata.get(tx_id)) is None:
+            out = outdata[tx_id] = {}
+
+        if plan.stamp:
+            out[DataKey.SENSOR_TYPE] = LOCAL_SENSOR_TYPE
+            out[DataKey.DATA_STRUCTURE] = structure
+            out[DataKey.TIMESTAMP] = record["ts"]
+        copy_fields(plan, record, out)
+
+    return outdata
+
+
+def decode_realtime(packet: dict[str, Any]) -> dict[Any, dict[str, Any]]:
+    """Normalize a real-time broadcast packet into per transmitter updates.
+
+    Only the broadcast values are returned, they are merged into the data of
+    the last full refresh.
+    """
+    outdata: dict[Any, dict[str, Any]] = {}
+    dispatch_get = REALTIME_DISPATCH.get
+    for condition in packet["conditions"]:
+        structure = condition["data_structure_type"]
+        if (plan := dispatch_get((LOCAL_SENSOR_TYPE, structure))) is None:
+            continue
+        record = local_record(condition, packet["ts"])
+        out = outdata.setdefault(resolve_tx_id(plan.target, condition, record, 0), {})
+        copy_fields(plan, record, out)
+    return outdata
+
+
+def local_product_name(indata: dict[str, Any]) -> str:
+    """Return the product name of a local device from its data structures."""
+    if any(
+        condition["data_structure_type"] == 6
+        for condition in indata["data"]["conditions"]
+    ):
+        return "AirLink"
+    return "WeatherLink Live"
+
+
+def local_metadata(
+    indata: dict[str, Any], name: str
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Describe a local device like the station and sensor metadata of API v2."""
+    data = indata["data"]
+    conditions = data["conditions"]
+    airlink = local_product_name(indata) == "AirLink"
+    station = {
+        "station_name": name,
+        "product_number": "7210" if airlink else "6100",
+        "gateway_id_hex": data["did"],
+    }
+    sensors = [
+        {
+            "lsid": condition["lsid"],
+            "tx_id": condition["txid"],
+            "sensor_type": 55 if condition["data_structure_type"] == 1 else 56,
+            "product_name": "ISS"
+            if condition["data_structure_type"] == 1
+            else "Soil/Leaf Station",
+        }
+        for condition in conditions
+        if condition["data_structure_type"] in (1, 2)
+    ]
+    sensors += [
+        {
+            "lsid": condition["lsid"],
+            "tx_id": None,
+            "sensor_type": SENSOR_TYPE_AIRLINK[0],
+            "product_name": "AirLink",
+            "parent_device_name": data["did"],
+        }
+        for condition in conditions
+        if condition["data_structure_type"] == 6
+    ]
+    return {"stations": [station]}, sensors
@@ -0,0 +1,115 @@
+"""Values derived from decoded observations for presentation.
+
+The derived values are computed once per refresh for each transmitter and
+stored next to the values they are derived from, so that entities sharing a
+transmitter only read them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import DataKey
+
+_LOGGER = logging.getLogger(__name__)
+
+CARDINAL_DIRECTIONS = (
+    "n",
+    "nne",
+    "ne",
+    "ene",
+    "e",
+    "ese",
+    "se",
+    "sse",
+    "s",
+    "ssw",
+    "sw",
+    "wsw",
+    "w",
+    "wnw",
+    "nw",
+    "nnw",
+)
+
+
+def non_negative(value: Any) -> Any:
+    """Return None for negative values, which the API uses for missing data."""
+    return None if float(value) < 0 else value
+
+
+def cardinal_direction(value: Any) -> str:
+    """Return the cardinal direction of a wind direction in degrees."""
+    return CARDINAL_DIRECTIONS[int(((float(value) + 11.25) % 360) // 22.5)]
+
+
+def bar_trend(value: Any) -> str:
+    """Return the trend category of a barometric trend or a trend text."""
+    try:
+        trend = float(value)
+    except ValueError:
+        return str(value).lower().replace(" ", "_")
+    if trend >= 0.060:
+        return "rising_rapidly"
+    if trend >= 0.020:
+        return "rising_slowly"
+    if trend > -0.020:
+        return "steady"
+    if trend > -0.060:
+        return "falling_slowly"
+    return "falling_rapidly"
+
+
+# Derived key, the key it is derived from and the derivation
+DERIVED_VALUES: tuple[tuple[DataKey, DataKey, Callable[[Any], Any]], ...] = (
+    (DataKey.BAR_TREND_CATEGORY, DataKey.BAR_TREND, bar_trend),
+    (DataKey.LAST_UPDATE, DataKey.TIMESTAMP, dt_util.utc_from_timestamp),
+    (DataKey.WIND_DIR_CARDINAL, DataKey.WIND_DIR, cardinal_direction),
+    (DataKey.WIND_GUST_MPH_VALID, DataKey.WIND_GUST_MPH, non_negative),
+)
+
+DERIVED_FROM: dict[DataKey, DataKey] = {
+    key: source for key, source, _ in DERIVED_VALUES
+}
+
+
+def derive_transmitter(values: dict[str, Any]) -> None:
+    """Add the derived values of a transmitter to its values.
+
+    A derived value is None when the value it is derived from is None or
+    cannot be converted, and absent when that is absent. One malformed value
+    only leaves its own entity without a state.
+    """
+    for key, source, derive in DERIVED_VALUES:
+        if source not in values:
+            values.pop(key, None)
+        elif (value := values[source]) is None:
+            values[key] = None
+        else:
+            try:
+                values[key] = derive(value)
+            except (TypeError, ValueError):
+                _LOGGER.debug("Cannot derive %s from %s=%r", key, source, value)
+                values[key] = None
+
+
+def derive_values(data: dict) -> dict:
+    """Add the derived values of all transmitters to decoded data."""
+    for values in data.values():
+        if isinstance(values, dict):
+            derive_transmitter(values)
+    return data
+
+
+def strip_derived(data: dict) -> dict:
+    """Return data without the derived values, as stored between restarts."""
+    return {
+        tx_id: {key: value for key, value in values.items() if key not in DERIVED_FROM}
+        if isinstance(values, dict)
+        else values
+        for tx_id, values in data.items()
+    }
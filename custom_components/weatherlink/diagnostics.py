@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+from dataclasses import asdict
+
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from . import WLConfigEntry
+from . import WLConfigEntry, WLData as WLStation
 from .const import (
     CONF_API_KEY_V2,
     CONF_API_SECRET,
@@ -15,6 +16,9 @@ from .const import (
     CONF_API_VERSION,
     ApiVersion,
 )
+from .coordinator import WLDataUpdateCoordinator
+from .schema import Current
+from .session import SESSION
 
 TO_REDACT = {
     CONF_PASSWORD,
@@ -30,14 +34,36 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: WLConfigEntry
 ) -> dict:
     """Return diagnostics for a config entry."""
-    coordinator: DataUpdateCoordinator = entry.runtime_data.coordinator
+    coordinator: WLDataUpdateCoordinator = entry.runtime_data.coordinator
     station_data = entry.runtime_data.station_data
     current = entry.runtime_data.current
+    if isinstance(current, Current):
+        current = current.as_dict()
     sensor_metadata = entry.runtime_data.sensors_metadata
 
     sensor_data = {}
+    api_data = {}
     if entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-        sensor_data = await entry.runtime_data.api.get_all_sensors()
+        api = entry.runtime_data.api
+        sensor_data = await api.get_all_sensors()
+        api_data = {
+            "requests": asdict(api.stats),
+            "requests_left": api.limiter.remaining,
+            "circuit_breaker": api.breaker.as_dict(),
+            "cache": api.cache.as_dict(),
+            "session": hass.data[SESSION].timings.as_dict(),
+        }
+
+    if stations := entry.runtime_data.stations:
+        return {
+            "info": async_redact_data(entry.data, TO_REDACT),
+            "all_sensor_data": async_redact_data(sensor_data, TO_REDACT),
+            "stations": {
+                station_id: station_diagnostics(station)
+                for station_id, station in stations.items()
+            },
+            "api": api_data,
+        }
 
     return {
         "info": async_redact_data(entry.data, TO_REDACT),
@@ -46,4 +72,19 @@ async def async_get_config_entry_diagnostics(
         "sensor_metadata": async_redact_data(sensor_metadata, TO_REDACT),
         "current_data": async_redact_data(current, TO_REDACT),
         "data": async_redact_data(coordinator.data, TO_REDACT),
+        "api": api_data,
+    }
+
+
+def station_diagnostics(station: WLStation) -> dict:
+    """Return diagnostics of a station of an all stations entry."""
+    current = station.current
+    if isinstance(current, Current):
+        current = current.as_dict()
+    return {
+        "station_data": async_redact_data(station.station_data, TO_REDACT),
+        "sensor_metadata": async_redact_data(station.sensors_metadata, TO_REDACT),
+        "current_data": async_redact_data(current, TO_REDACT),
+        "data": async_redact_data(station.coordinator.data, TO_REDACT),
+        "last_update_success": station.coordinator.last_update_success,
     }
@@ -2,33 +2,39 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 import logging
+from typing import Any
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo, EntityDescription
+from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
-
-from . import SENSOR_TYPE_AIRLINK, SENSOR_TYPE_VUE_AND_VANTAGE_PRO, WLConfigEntry
-from .const import (
-    CONF_API_VERSION,
-    CONFIG_URL,
-    DOMAIN,
-    MANUFACTURER,
-    UNAVAILABLE_AFTER_SECONDS,
-    ApiVersion,
-    DataKey,
-)
+
+from . import WLConfigEntry, WLData as WLStation
+from .coordinator import Staleness
 from .pyweatherlink import WLData
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def aux_descriptions[D: EntityDescription](
+    descriptions: tuple[D, ...],
+) -> dict[int, tuple[D, ...]]:
+    """Group descriptions by the sensor types of the auxiliary sensors they apply to."""
+    grouped: dict[int, list[D]] = {}
+    for description in descriptions:
+        for sensor_type in description.aux_sensors:
+            grouped.setdefault(sensor_type, []).append(description)
+    return {sensor_type: tuple(found) for sensor_type, found in grouped.items()}
+
+
 class WLEntity(CoordinatorEntity):
     """Representation of the base entity."""
 
     entity_description: EntityDescription
     sensor_data = WLData()
+    _attributes_key: tuple | None = None
+    _attributes: dict[str, Any] | None = None
 
     def __init__(
         self,
@@ -37,134 +43,41 @@ class WLEntity(CoordinatorEntity):
         entry: WLConfigEntry,
         description: EntityDescription,
         tx_id: int,
+        station: WLStation | None = None,
     ):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            (tx_id, frozenset((description.tag, *description.extra_tags))),
+        )
         self.hass = hass
         self.entry = entry
+        self.station = station or entry.runtime_data
         self.entity_description = description
         self.tx_id = tx_id
-        self.primary_tx_id = entry.runtime_data.primary_tx_id
+        self.primary_tx_id = self.station.primary_tx_id
         self._attr_has_entity_name = True
-        tx_id_part = f"-{self.tx_id}" if self.tx_id != self.primary_tx_id else ""
-        if (
-            self.generate_model().startswith("AirLink")
-            and coordinator.data.get(1) == {}
-        ):
-            tx_id_part = ""
-        self._attr_unique_id = (
-            f"{self.get_unique_id_base()}{tx_id_part}-{self.entity_description.key}"
-        )
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, f"{self.get_unique_id_base()}{tx_id_part}")},
-            name=self.generate_name(),
-            manufacturer=MANUFACTURER,
-            model=self.generate_model(),
-            sw_version=self.get_firmware(),
-            serial_number=self.get_serial(),
-            configuration_url=CONFIG_URL,
-            via_device=(DOMAIN, self.get_unique_id_base())
-            if tx_id_part != ""
-            else None,
-        )
+        device = self.station.topology.device(tx_id)
+        self._attr_unique_id = f"{device.device_id}-{self.entity_description.key}"
+        self._attr_device_info = device.device_info
+
+    def memoized_attributes(
+        self, build: Callable[..., dict[str, Any] | None], *key: Any
+    ) -> dict[str, Any] | None:
+        """Return the attributes built from key, reused while key is unchanged.
+
+        Unchanged attributes keep their identity, so that state writes do not
+        create new attribute objects.
+        """
+        if key != self._attributes_key:
+            self._attributes_key = key
+            self._attributes = build(*key)
+        return self._attributes
 
-    def get_unique_id_base(self):
-        """Generate base for unique_id."""
-        unique_base = None
-        if self.entry.data[CONF_API_VERSION] == ApiVersion.API_V1:
-            unique_base = self.coordinator.data[self.tx_id]["DID"]
-        if self.entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-            unique_base = self.coordinator.data[DataKey.UUID]
-        return unique_base
-
-    def get_firmware(self) -> str | None:
-        """Get firmware version."""
-        if self.entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-            return self.entry.runtime_data.station_data["stations"][0].get(
-                "firmware_version"
-            )
-        return None
-
-    def get_serial(self) -> str | None:
-        """Get serial number."""
-        if self.entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-            return self.entry.runtime_data.station_data["stations"][0].get(
-                "gateway_id_hex"
-            )
-        return None
-
-    def generate_name(self):
-        """Generate device name."""
-        if self.entry.data[CONF_API_VERSION] == ApiVersion.API_V1:
-            return self.coordinator.data[1]["station_name"]
-        if self.entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-            if self.tx_id == self.primary_tx_id:
-                return self.entry.runtime_data.station_data["stations"][0][
-                    "station_name"
-                ]
-            for sensor in self.entry.runtime_data.sensors_metadata:
-                if sensor["sensor_type"] in (55, 56) and sensor["tx_id"] == self.tx_id:
-                    return f"{sensor['product_name']} ID{sensor['tx_id']}"
-
-                if (
-                    sensor["sensor_type"] in SENSOR_TYPE_AIRLINK
-                    and sensor["lsid"] == self.tx_id
-                ):
-                    return f"{sensor['product_name']} {sensor['parent_device_name']}"
-
-        return "Unknown devicename"
-
-    def generate_model(self):
-        """Generate model string."""
-        if self.entry.data[CONF_API_VERSION] == ApiVersion.API_V1:
-            return "WeatherLink - API V1"
-        if self.entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-            model: str = self.entry.runtime_data.station_data["stations"][0].get(
-                "product_number"
-            )
-            break_out = False
-            product_name = ""
-            for sensor in self.entry.runtime_data.sensors_metadata:
-                if break_out:
-                    break
-                if (
-                    sensor["sensor_type"] in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
-                    and sensor["tx_id"] is None
-                    or sensor["tx_id"] == self.tx_id
-                ):
-                    product_name = sensor.get("product_name")
-                    break_out = True
-                    continue
-                if (
-                    sensor["sensor_type"] in SENSOR_TYPE_AIRLINK
-                    and sensor["lsid"] == self.tx_id
-                ):
-                    product_name = sensor.get("product_name")
-                    break_out = True
-                    continue
-
-            gateway_type = "WeatherLink"
-            try:
-                if model == "6555":
-                    gateway_type = f"WLIP {model}"
-                if model.startswith("6100"):
-                    gateway_type = f"WLL {model}"
-                if model.startswith("6313"):
-                    gateway_type = f"WLC {model}"
-                if model.startswith("6805"):
-                    gateway_type = f"EnviroMonitor {model}"
-                if model.startswith("7210"):
-                    gateway_type = f"AirLink {model}"
-                if model.endswith("6558"):
-                    gateway_type = f"WL {model}"
-            except AttributeError:
-                pass
-
-        return (
-            f"{gateway_type} / {product_name}"
-            if self.tx_id == self.primary_tx_id
-            else product_name
-        )
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while showing data stored before the last restart."""
+        return self.coordinator.restored
 
     @property
     def available(self):
@@ -174,11 +87,9 @@ class WLEntity(CoordinatorEntity):
             return False
 
         if self.entity_description.key != "Timestamp":
-            dt_update = dt_util.utc_from_timestamp(
-                self.coordinator.data[self.tx_id].get(DataKey.TIMESTAMP)
+            return (
+                self.coordinator.staleness.get(self.tx_id, Staleness.FRESH)
+                < Staleness.UNAVAILABLE
             )
-            dt_now = dt_util.now()
-            diff = dt_now - dt_update
-            return diff.total_seconds() < UNAVAILABLE_AFTER_SECONDS
 
         return True
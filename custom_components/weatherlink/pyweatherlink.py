@@ -3,35 +3,93 @@
 Move to pypi.org when stable
 """
 
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable
 from dataclasses import dataclass
 import logging
 from typing import Any
 import urllib.parse
 
-from aiohttp import ClientResponse, ClientResponseError, ClientSession
+from aiohttp import (
+    ClientConnectionError,
+    ClientError,
+    ClientPayloadError,
+    ClientResponse,
+    ClientResponseError,
+    ClientSession,
+    hdrs,
+)
+import msgspec
 
 from homeassistant.exceptions import ConfigEntryAuthFailed
 
+from .cache import METADATA_TTL, WLResponseCache
 from .const import VERSION
+from .ratelimit import WLRateLimiter
+from .retry import (
+    RETRY_STATUSES,
+    RequestStats,
+    RetryPolicy,
+    WLCircuitBreaker,
+    parse_retry_after,
+)
+from .schema import CURRENT_DECODER, Current
 
 API_V1_URL = "https://api.weatherlink.com/v1/NoaaExt.json"
 API_V2_URL = "https://api.weatherlink.com/v2/"
+API_V2_HOST = urllib.parse.urlsplit(API_V2_URL).hostname
+
+HISTORIC_MAX_SECONDS = 24 * 3600
+HISTORIC_CONCURRENCY = 4
+
+# Responses of at least this size are decoded in the executor when offloaded
+OFFLOAD_MIN_BYTES = 32 * 1024
 
 
 _LOGGER = logging.getLogger(__name__)
 
+JsonLoads = Callable[[bytes], Any]
+
+
+# msgspec is a requirement of the integration, its decoder is the fastest
+json_loads: JsonLoads = msgspec.json.Decoder().decode
+
+
+async def read_json(
+    res: ClientResponse, loads: JsonLoads = json_loads, offload: bool = False
+) -> Any:
+    """Read a response body once and decode it.
+
+    Invalid JSON raises ClientPayloadError. With offload large bodies are
+    decoded in the executor so that the event loop is not blocked.
+    """
+    body = await res.read()
+    try:
+        if offload and len(body) >= OFFLOAD_MIN_BYTES:
+            return await asyncio.get_running_loop().run_in_executor(None, loads, body)
+        return loads(body)
+    except ValueError as exc:
+        raise ClientPayloadError(f"Invalid JSON from {res.url}: {exc}") from exc
+
 
 class WLHub:
     """Class to get data from Wetherlink API v1."""
 
     def __init__(
-        self, username: str, password: str, apitoken: str, websession: ClientSession
+        self,
+        username: str,
+        password: str,
+        apitoken: str,
+        websession: ClientSession,
+        json_loads: JsonLoads = json_loads,
     ) -> None:
         """Initialize."""
         self.username = username
         self.password = password
         self.apitoken = apitoken
         self.websession = websession
+        self.json_loads = json_loads
 
     async def authenticate(self) -> bool:
         """Test if we can authenticate with the host."""
@@ -71,7 +129,7 @@ class WLHub:
         """Get data from api."""
         try:
             res = await self.request("GET")
-            return await res.json()
+            return await read_json(res, self.json_loads)
         except ClientResponseError as exc:
             _LOGGER.debug(
                 "API get_data failed. Status: %s, - %s", exc.code, exc.message
@@ -90,12 +148,24 @@ class WLHubV2:
         api_secret: str,
         websession: ClientSession,
         station_id: str | None = None,
+        json_loads: JsonLoads = json_loads,
+        limiter: WLRateLimiter | None = None,
+        retry: RetryPolicy = RetryPolicy(),
+        breaker: WLCircuitBreaker | None = None,
+        cache: WLResponseCache | None = None,
     ) -> None:
         """Initialize."""
         self.station_id = station_id
         self.api_key_v2 = api_key_v2
         self.api_secret = api_secret
         self.websession = websession
+        self.json_loads = json_loads
+        self.historic_semaphore = asyncio.Semaphore(HISTORIC_CONCURRENCY)
+        self.limiter = limiter or WLRateLimiter()
+        self.retry = retry
+        self.breaker = breaker or WLCircuitBreaker(API_V2_HOST)
+        self.stats = RequestStats()
+        self.cache = cache or WLResponseCache()
 
     async def authenticate(self) -> bool:
         """Test if we can authenticate with the host."""
@@ -106,14 +176,19 @@ class WLHubV2:
         return True
 
     async def request(self, method, endpoint="current/", **kwargs) -> ClientResponse:
-        """Make a request."""
+        """Make a request, retrying transient failures.
+
+        Connection errors, timeouts and the statuses in RETRY_STATUSES are
+        retried according to the retry policy. Requests fail fast with
+        WLCircuitOpenError while the circuit breaker is open.
+        """
         if headers := kwargs.pop("headers", {}):
             headers = dict(headers)
 
         headers["x-api-secret"] = self.api_secret
         headers["User-Agent"] = f"Weatherlink for Home Assistant/{VERSION}"
 
-        params = {"api-key": self.api_key_v2}
+        params = {"api-key": self.api_key_v2, **kwargs.pop("params", {})}
         params_enc = urllib.parse.urlencode(params, quote_via=urllib.parse.quote)
 
         station = (
@@ -121,31 +196,106 @@ class WLHubV2:
             if self.station_id is not None and endpoint.endswith("/")
             else ""
         )
-        res = await self.websession.request(
-            method,
-            f"{API_V2_URL}{endpoint}{station}?{params_enc}",
-            **kwargs,
-            headers=headers,
+        url = f"{API_V2_URL}{endpoint}{station}?{params_enc}"
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.before_request()
+            await self.limiter.acquire()
+            self.stats.requests += 1
+            try:
+                async with asyncio.timeout(self.retry.timeout):
+                    res = await self.websession.request(
+                        method, url, **kwargs, headers=headers
+                    )
+            except (ClientConnectionError, TimeoutError) as exc:
+                self.breaker.record_failure()
+                if (delay := self.retry.delay(attempt)) is None:
+                    self.stats.failures += 1
+                    raise
+                _LOGGER.debug(
+                    "Request to %s failed, retrying in %.1f s: %r", endpoint, delay, exc
+                )
+            else:
+                if res.status >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                if (
+                    res.status not in RETRY_STATUSES
+                    or (
+                        delay := self.retry.delay(
+                            attempt,
+                            parse_retry_after(res.headers.get(hdrs.RETRY_AFTER)),
+                        )
+                    )
+                    is None
+                ):
+                    if not res.ok:
+                        self.stats.failures += 1
+                    res.raise_for_status()
+                    return res
+                res.release()
+                _LOGGER.debug(
+                    "Request to %s returned %s, retrying in %.1f s",
+                    endpoint,
+                    res.status,
+                    delay,
+                )
+            self.stats.retries += 1
+            await asyncio.sleep(delay)
+
+    async def get_json(
+        self,
+        endpoint: str = "current/",
+        loads: JsonLoads | None = None,
+        offload: bool = False,
+        ttl: float = 0,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """Get and decode a response, shared by identical requests in flight.
+
+        With a ttl the response is cached, see WLResponseCache.
+        """
+        params = params or {}
+        loads = loads or self.json_loads
+        key = (
+            endpoint,
+            self.station_id if endpoint.endswith("/") else None,
+            tuple(sorted(params.items())),
+            loads,
         )
-        res.raise_for_status()
-        return res
+
+        async def fetch() -> Any:
+            res = await self.request("GET", endpoint=endpoint, params=params)
+            return await read_json(res, loads, offload)
+
+        return await self.cache.get(key, fetch, ttl)
 
     async def get_data(self) -> dict[str, Any]:
         """Get data from api."""
         try:
-            res = await self.request("GET")
-            return await res.json()
+            return await self.get_json()
         except ClientResponseError as exc:
             _LOGGER.debug(
                 "API get_data failed. Status: %s, - %s", exc.code, exc.message
             )
             raise
 
+    async def get_current(self) -> Current:
+        """Get data from api, decoded into typed structs."""
+        try:
+            return await self.get_json(loads=CURRENT_DECODER.decode)
+        except ClientResponseError as exc:
+            _LOGGER.debug(
+                "API get_current failed. Status: %s, - %s", exc.code, exc.message
+            )
+            raise
+
     async def get_station(self):
         """Get data from api."""
         try:
-            res = await self.request("GET", endpoint="stations/")
-            return await res.json()
+            return await self.get_json("stations/", offload=True, ttl=METADATA_TTL)
         except ClientResponseError as exc:
             _LOGGER.debug(
                 "API get_station failed. Status: %s, - %s", exc.code, exc.message
@@ -155,8 +305,7 @@ class WLHubV2:
     async def get_all_stations(self):
         """Get all stations from api."""
         try:
-            res = await self.request("GET", endpoint="stations")
-            return await res.json()
+            return await self.get_json("stations", offload=True, ttl=METADATA_TTL)
         except ClientResponseError as exc:
             _LOGGER.debug(
                 "API get_all_stations failed. Status: %s, - %s", exc.code, exc.message
@@ -168,14 +317,103 @@ class WLHubV2:
     async def get_all_sensors(self):
         """Get all sensors from api."""
         try:
-            res = await self.request("GET", endpoint="sensors")
-            return await res.json()
+            return await self.get_json("sensors", offload=True, ttl=METADATA_TTL)
         except ClientResponseError as exc:
             _LOGGER.debug(
                 "API get_all_sensors failed. Status: %s, - %s", exc.code, exc.message
             )
             raise
 
+    async def get_historic_chunk(self, start: int, end: int) -> dict[str, Any]:
+        """Get archive records from api, at most 24 hours per request."""
+        async with self.historic_semaphore:
+            try:
+                return await self.get_json(
+                    "historic/",
+                    offload=True,
+                    params={"start-timestamp": start, "end-timestamp": end},
+                )
+            except ClientResponseError as exc:
+                _LOGGER.debug(
+                    "API get_historic failed. Status: %s, - %s", exc.code, exc.message
+                )
+                raise
+
+    async def get_historic(self, start: int, end: int) -> AsyncIterator[dict[str, Any]]:
+        """Get archive records between two timestamps from api.
+
+        The range is split in chunks of at most 24 hours which are fetched
+        concurrently. A chunk ends the second before the next one starts, as
+        both ends are inclusive. Responses are yielded in chronological order and only
+        HISTORIC_CONCURRENCY chunks are held at a time.
+        """
+        chunks = (
+            (chunk_start, min(chunk_start + HISTORIC_MAX_SECONDS - 1, end))
+            for chunk_start in range(start, end, HISTORIC_MAX_SECONDS)
+        )
+        pending: deque[asyncio.Task[dict[str, Any]]] = deque()
+        try:
+            for chunk in chunks:
+                pending.append(asyncio.create_task(self.get_historic_chunk(*chunk)))
+                if len(pending) < HISTORIC_CONCURRENCY:
+                    continue
+                yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+class WLHubLocal:
+    """Class to get data from the local API of WeatherLink Live and AirLink."""
+
+    def __init__(
+        self, host: str, websession: ClientSession, json_loads: JsonLoads = json_loads
+    ) -> None:
+        """Initialize."""
+        self.host = host
+        self.websession = websession
+        self.json_loads = json_loads
+
+    async def request(
+        self, method, endpoint="v1/current_conditions", **kwargs
+    ) -> ClientResponse:
+        """Make a request."""
+        res = await self.websession.request(
+            method, f"http://{self.host}/{endpoint}", **kwargs
+        )
+        res.raise_for_status()
+        return res
+
+    async def get_data(self) -> dict[str, Any]:
+        """Get current conditions from the device."""
+        try:
+            res = await self.request("GET")
+            data = await read_json(res, self.json_loads)
+        except ClientResponseError as exc:
+            _LOGGER.debug(
+                "Local get_data failed. Status: %s, - %s", exc.code, exc.message
+            )
+            raise
+        if data.get("error"):
+            _LOGGER.debug("Local get_data failed: %s", data["error"])
+            raise WLLocalError(data["error"])
+        return data
+
+    async def start_realtime(self, duration: int) -> int:
+        """Request the real-time broadcast for duration seconds, return its port."""
+        res = await self.request("GET", "v1/real_time", params={"duration": duration})
+        data = await read_json(res, self.json_loads)
+        if data.get("error"):
+            _LOGGER.debug("Local start_realtime failed: %s", data["error"])
+            raise WLLocalError(data["error"])
+        return data["data"]["broadcast_port"]
+
+
+class WLLocalError(ClientError):
+    """Error reported by the local API of a device."""
+
 
 @dataclass
 class WLData:
@@ -0,0 +1,136 @@
+"""Rate limiting of Weatherlink API v2 requests per API key.
+
+The API allows a limited number of requests per second and per hour for each
+API key. All hubs using a key share one limiter, so requests of several config
+entries, the config flow and diagnostics are spread out instead of bursting
+when the refreshes of all stations line up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from time import monotonic
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+RATE_PER_SECOND = 10
+HOURLY_BUDGET = 1000
+BUDGET_WINDOW = 3600
+
+# Share of the hourly budget planned for refreshes, the rest is kept for the
+# config flow, metadata, backfill and retries
+REFRESH_SHARE = 0.8
+
+RATE_LIMITERS: HassKey[dict[str, WLRateLimiter]] = HassKey(f"{DOMAIN}_rate_limiters")
+
+
+class WLRateLimiter:
+    """Token bucket and hourly request budget of one API key."""
+
+    def __init__(
+        self,
+        rate: float = RATE_PER_SECOND,
+        burst: int = RATE_PER_SECOND,
+        budget: int = HOURLY_BUDGET,
+    ) -> None:
+        """Initialize."""
+        self.rate = rate
+        self.burst = burst
+        self.budget = budget
+        self.throttled = 0
+        # Tokens go negative while requests wait for them
+        self._tokens = float(burst)
+        self._updated = 0.0
+        self._requests: deque[float] = deque()
+        self._listeners: list[Callable[[], None]] = []
+        # The entry showing the budget, so that there is one sensor per key
+        self.sensor_entry_id: str | None = None
+
+    async def acquire(self) -> None:
+        """Wait for a token and count the request against the budget."""
+        now = monotonic()
+        elapsed = max(now - self._updated, 0)
+        self._tokens = min(self._tokens + elapsed * self.rate, self.burst) - 1
+        self._updated = now
+        if self._tokens < 0:
+            self.throttled += 1
+            await asyncio.sleep(-self._tokens / self.rate)
+        self._requests.append(monotonic())
+        for listener in list(self._listeners):
+            listener()
+
+    def _prune(self, now: float) -> None:
+        """Drop requests that left the budget window."""
+        while self._requests and self._requests[0] <= now - BUDGET_WINDOW:
+            self._requests.popleft()
+
+    @property
+    def used(self) -> int:
+        """Return the number of requests in the last hour."""
+        self._prune(monotonic())
+        return len(self._requests)
+
+    @property
+    def remaining(self) -> int:
+        """Return the requests left of the hourly budget."""
+        return max(self.budget - self.used, 0)
+
+    def release_delay(self, requests: int) -> float | None:
+        """Return the seconds until a number of requests have left the window.
+
+        None is returned when fewer requests are in the window.
+        """
+        now = monotonic()
+        self._prune(now)
+        if not 0 < requests <= len(self._requests):
+            return None
+        return self._requests[requests - 1] + BUDGET_WINDOW - now
+
+    def suggested_interval(self, consumers: int) -> float:
+        """Return the shortest refresh interval in seconds within the budget.
+
+        Consumers are the coordinators refreshing with this key. Each gets a
+        fair share of the budget, and all wait for the window to free up when
+        the budget reserved for other requests is being used.
+        """
+        now = monotonic()
+        self._prune(now)
+        interval = BUDGET_WINDOW * max(consumers, 1) / (self.budget * REFRESH_SHARE)
+        if self._requests and len(self._requests) >= self.budget * REFRESH_SHARE:
+            index = len(self._requests) - int(self.budget * REFRESH_SHARE)
+            interval = max(interval, self._requests[index] + BUDGET_WINDOW - now)
+        return interval
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for requests, returns a function that removes the listener."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant, api_key: str) -> WLRateLimiter:
+    """Get or create the rate limiter shared by all hubs of an API key."""
+    limiters = hass.data.setdefault(RATE_LIMITERS, {})
+    if (limiter := limiters.get(api_key)) is None:
+        limiter = limiters[api_key] = WLRateLimiter()
+    return limiter
+
+
+@callback
+def async_remove_rate_limiter(hass: HomeAssistant, api_key: str) -> None:
+    """Remove the rate limiter of an API key no entry uses any more."""
+    limiters = hass.data.get(RATE_LIMITERS, {})
+    limiters.pop(api_key, None)
+    if not limiters:
+        hass.data.pop(RATE_LIMITERS, None)
@@ -0,0 +1,135 @@
+"""Listener for the real-time UDP broadcast of a WeatherLink Live."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import json
+import logging
+import socket
+from typing import Any
+
+from aiohttp import ClientError
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .coordinator import WLDataUpdateCoordinator
+from .decoder import decode_realtime
+from .pyweatherlink import WLHubLocal
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lease requested from the device, renewed well before it runs out
+REALTIME_DURATION = 1200
+REALTIME_RENEW_INTERVAL = timedelta(seconds=REALTIME_DURATION // 2)
+REALTIME_LISTEN_HOST = "0.0.0.0"  # noqa: S104
+
+
+class WLRealtimeProtocol(asyncio.DatagramProtocol):
+    """Decode broadcast packets of one device."""
+
+    def __init__(
+        self, did: str, on_packet: Callable[[dict[Any, dict[str, Any]]], None]
+    ) -> None:
+        """Initialize the protocol."""
+        self.did = did
+        self.on_packet = on_packet
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Decode a packet and pass the values on."""
+        try:
+            packet = json.loads(data)
+            if packet.get("did") != self.did:
+                return
+            updates = decode_realtime(packet)
+        except (ValueError, KeyError, TypeError, AttributeError) as err:
+            _LOGGER.debug("Invalid real-time packet from %s: %s", addr, err)
+            return
+        self.on_packet(updates)
+
+    def error_received(self, exc: Exception) -> None:
+        """Log socket errors, the listener keeps running."""
+        _LOGGER.debug("Real-time listener error: %s", exc)
+
+
+class WLRealtimeListener:
+    """Merge the 2.5 second wind and rain broadcast into coordinator data.
+
+    The broadcast lease is renewed every REALTIME_RENEW_INTERVAL. Received
+    values are collected and pushed to the coordinator at most once per
+    interval seconds, so a fast broadcast does not write states every packet.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: WLHubLocal,
+        coordinator: WLDataUpdateCoordinator,
+        did: str,
+        interval: float,
+    ) -> None:
+        """Initialize the listener."""
+        self.hass = hass
+        self.api = api
+        self.coordinator = coordinator
+        self.did = did
+        self.interval = interval
+        self.packets = 0
+        self._pending: dict[Any, dict[str, Any]] = {}
+        self._transport: asyncio.DatagramTransport | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unsub_renew: CALLBACK_TYPE | None = None
+
+    async def async_start(self) -> None:
+        """Request the broadcast and listen on the port the device reports."""
+        port = await self.api.start_realtime(REALTIME_DURATION)
+        self._transport, _ = await self.hass.loop.create_datagram_endpoint(
+            lambda: WLRealtimeProtocol(self.did, self._async_received),
+            local_addr=(REALTIME_LISTEN_HOST, port),
+            reuse_port=hasattr(socket, "SO_REUSEPORT"),
+        )
+        self._unsub_renew = async_track_time_interval(
+            self.hass, self._async_renew, REALTIME_RENEW_INTERVAL
+        )
+        _LOGGER.debug("Listening for real-time broadcast on port %s", port)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening, the lease runs out on the device."""
+        if self._unsub_renew is not None:
+            self._unsub_renew()
+            self._unsub_renew = None
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        self._pending.clear()
+
+    async def _async_renew(self, now: datetime) -> None:
+        """Renew the broadcast lease."""
+        try:
+            await self.api.start_realtime(REALTIME_DURATION)
+        except (ClientError, TimeoutError) as err:
+            _LOGGER.debug("Renewal of real-time broadcast failed: %s", err)
+
+    @callback
+    def _async_received(self, updates: dict[Any, dict[str, Any]]) -> None:
+        """Collect the values of a packet until the next flush."""
+        self.packets += 1
+        for tx_id, values in updates.items():
+            self._pending.setdefault(tx_id, {}).update(values)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, self.interval, self._async_flush
+            )
+
+    @callback
+    def _async_flush(self, now: datetime) -> None:
+        """Push the collected values to the coordinator."""
+        self._unsub_flush = None
+        pending, self._pending = self._pending, {}
+        self.coordinator.async_push(pending)
@@ -0,0 +1,186 @@
+"""Retries and circuit breaking of Weatherlink API v2 requests.
+
+Transient failures are retried with exponential backoff and full jitter, or
+after the delay the server asks for with Retry-After. A circuit breaker per
+host counts consecutive failures and, once the API is known to be down, fails
+requests fast until a single trial request after the reset timeout succeeds.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from enum import StrEnum
+import logging
+import random
+from time import monotonic
+from typing import Any
+
+from aiohttp import ClientConnectionError
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 60.0
+
+CIRCUIT_BREAKERS: HassKey[dict[str, WLCircuitBreaker]] = HassKey(
+    f"{DOMAIN}_circuit_breakers"
+)
+
+
+class WLCircuitOpenError(ClientConnectionError):
+    """Request not made because the API is known to be down."""
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Retries of transient request failures."""
+
+    attempts: int = 3
+    backoff: float = 1.0
+    max_backoff: float = 30.0
+    timeout: float = 10.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """Return the delay before the next attempt, or None to give up.
+
+        A Retry-After longer than max_backoff gives up, the caller is better
+        off waiting for its next refresh.
+        """
+        if attempt >= self.attempts:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_backoff else None
+        return random.uniform(  # noqa: S311
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+
+    @property
+    def deadline(self) -> float:
+        """Return the longest time a request can take with all its retries."""
+        return self.attempts * self.timeout + (self.attempts - 1) * self.max_backoff
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """Counters of the requests made by a hub."""
+
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds of a Retry-After header."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max((when - datetime.now(UTC)).total_seconds(), 0)
+
+
+class WLCircuitBreaker:
+    """Circuit breaker of the requests to one host."""
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+    ) -> None:
+        """Initialize."""
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+
+    def before_request(self) -> None:
+        """Raise WLCircuitOpenError if a request should not be made."""
+        if self.state is CircuitState.CLOSED:
+            return
+        now = monotonic()
+        if now - self._opened_at < self.reset_timeout:
+            self.rejected += 1
+            raise WLCircuitOpenError(f"API at {self.host} is unavailable")
+        # Let one trial request through, the others fail fast until it returns
+        # or another reset timeout has passed
+        self.state = CircuitState.HALF_OPEN
+        self._opened_at = now
+
+    def record_success(self) -> None:
+        """Record that the host responded."""
+        if self.state is not CircuitState.CLOSED:
+            _LOGGER.info("API at %s is available again", self.host)
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failed request and open the circuit when needed."""
+        self.failures += 1
+        if (
+            self.state is CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            if self.state is CircuitState.CLOSED:
+                self.trips += 1
+                _LOGGER.warning(
+                    "API at %s failed %s times, pausing requests for %s s",
+                    self.host,
+                    self.failures,
+                    self.reset_timeout,
+                )
+            self.state = CircuitState.OPEN
+            self._opened_at = monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the breaker, for diagnostics."""
+        return {
+            "host": self.host,
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+@callback
+def async_get_circuit_breaker(hass: HomeAssistant, host: str) -> WLCircuitBreaker:
+    """Get or create the circuit breaker shared by all hubs of a host."""
+    breakers = hass.data.setdefault(CIRCUIT_BREAKERS, {})
+    if (breaker := breakers.get(host)) is None:
+        breaker = breakers[host] = WLCircuitBreaker(host)
+    return breaker
+
+
+@callback
+def async_remove_circuit_breakers(hass: HomeAssistant) -> None:
+    """Remove the circuit breakers once no entry makes requests."""
+    hass.data.pop(CIRCUIT_BREAKERS, None)
@@ -0,0 +1,90 @@
+"""Refresh scheduling aligned to the upload cadence of a station."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import timedelta
+import logging
+from time import time
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PERIOD = 300
+MIN_PERIOD = 60
+MAX_PERIOD = 3600
+# Time from the record timestamp until the record is available in the API
+UPLOAD_MARGIN = 20
+MIN_DELAY = 30
+MAX_DELAY = 900
+PERIOD_WINDOW = 6
+
+
+class UploadScheduler:
+    """Learn upload period and phase of a station from successive timestamps.
+
+    The period is the shortest of the recent steps between observed timestamps,
+    so that missed uploads do not stretch it. The window is seeded with
+    recording_interval from the station metadata. The phase is taken from the
+    latest timestamp. While timestamps stop advancing the retry delay is
+    doubled up to MAX_DELAY.
+    """
+
+    def __init__(self, recording_interval: int | None = None) -> None:
+        """Initialize the scheduler, recording_interval is in minutes."""
+        self._steps: deque[int] = deque(
+            [recording_interval * 60 if recording_interval else DEFAULT_PERIOD],
+            maxlen=PERIOD_WINDOW,
+        )
+        self.last_timestamp: int | None = None
+        self.misses = 0
+
+    @property
+    def period(self) -> int:
+        """Return the estimated upload period in seconds."""
+        return _clamp_period(min(self._steps))
+
+    def next_expected(self, now: float) -> float | None:
+        """Return the time of the first expected upload after now."""
+        if self.last_timestamp is None:
+            return None
+        period = self.period
+        uploads = int((now - self.last_timestamp) // period) + 1
+        return self.last_timestamp + max(uploads, 1) * period
+
+    def update(self, timestamp: int | None, now: float | None = None) -> timedelta:
+        """Register the newest timestamp of a refresh and return the next delay."""
+        if now is None:
+            now = time()
+
+        if timestamp is None:
+            return timedelta(seconds=self.period)
+
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            self.misses += 1
+            delay = min(MIN_DELAY * 2 ** (self.misses - 1), MAX_DELAY)
+            _LOGGER.debug(
+                "Timestamp %s not advanced after %s polls, retry in %s s",
+                timestamp,
+                self.misses,
+                delay,
+            )
+            return timedelta(seconds=delay)
+
+        if self.last_timestamp is not None:
+            self._steps.append(timestamp - self.last_timestamp)
+        self.last_timestamp = timestamp
+        self.misses = 0
+
+        expected = self.next_expected(now)
+        delay = min(max(expected + UPLOAD_MARGIN - now, MIN_DELAY), MAX_DELAY)
+        _LOGGER.debug(
+            "Upload period %s s, next upload expected at %s, refresh in %.0f s",
+            self.period,
+            expected,
+            delay,
+        )
+        return timedelta(seconds=delay)
+
+
+def _clamp_period(period: int) -> int:
+    return min(max(period, MIN_PERIOD), MAX_PERIOD)
@@ -0,0 +1,228 @@
+"""Typed schema of Weatherlink API v2 /current responses.
+
+A msgspec Struct is generated from each entry of OBSERVATION_MAPPINGS for
+every sensor type and data structure type it covers. The struct fields are
+named by DataKey and renamed from the API field names, with the defaults of
+the mapping, so decoding a record also validates it and applies defaults in
+the same pass. Fields not in the mapping are skipped by the parser.
+
+The sensor list is first decoded with the records kept as raw spans. Records
+of unsupported sensors are never parsed. A record that fails validation, like
+one with a list where a number is expected, is decoded as dicts instead, and
+only drops its own sensor if that fails too.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+import msgspec
+
+from .const import DataKey
+from .decoder import (
+    OBSERVATION_MAPPINGS,
+    REQUIRED,
+    StructureMapping,
+    Target,
+    decode_current_sensor,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+Value = bool | int | float | str | None
+
+# Struct attributes of the record fields used for stamping and targeting
+TS = "ts"
+TX_ID = "tx_id"
+
+
+class Sensor(msgspec.Struct, gc=False):
+    """A sensor of a /current response, its records are parsed on demand."""
+
+    sensor_type: int
+    data_structure_type: int
+    data: msgspec.Raw
+    lsid: int | None = None
+
+
+class Current(msgspec.Struct, gc=False):
+    """A /current response."""
+
+    station_id_uuid: str
+    sensors: list[Sensor]
+    station_id: int | None = None
+    generated_at: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the response as builtin types, for diagnostics."""
+        return {
+            "station_id": self.station_id,
+            "station_id_uuid": self.station_id_uuid,
+            "generated_at": self.generated_at,
+            "sensors": [
+                {
+                    "lsid": sensor.lsid,
+                    "sensor_type": sensor.sensor_type,
+                    "data_structure_type": sensor.data_structure_type,
+                    "data": msgspec.json.decode(sensor.data),
+                }
+                for sensor in self.sensors
+            ],
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class RecordPlan:
+    """Decoder and copy plan for one (sensor_type, data_structure_type)."""
+
+    decoder: msgspec.json.Decoder
+    target: Target
+    stamp: bool
+    keys: tuple[str, ...]
+    transformed: tuple[tuple[str, Callable[[Any], Any]], ...]
+
+
+CURRENT_DECODER = msgspec.json.Decoder(Current)
+
+
+def record_struct(
+    name: str, mapping: StructureMapping
+) -> tuple[type[msgspec.Struct], tuple[str, ...]]:
+    """Generate the record struct of a mapping and the keys it decodes to."""
+    fields: list[tuple[str, Any] | tuple[str, Any, Any]] = []
+    rename: dict[str, str] = {}
+    for field in mapping.fields:
+        if field.key in rename or field.key in (TS, TX_ID):
+            raise ValueError(f"Duplicate field {field.key} in {name}")
+        rename[str(field.key)] = field.source
+        if field.default is REQUIRED:
+            fields.append((str(field.key), Value))
+        else:
+            fields.append((str(field.key), Value, field.default))
+    keys = tuple(field.key for field in mapping.fields)
+    fields.append((TS, int) if mapping.stamp else (TS, int | None, None))
+    if mapping.target is Target.TX_ID:
+        fields.append((TX_ID, int))
+    else:
+        fields.append((TX_ID, int | None, 1))
+    struct = msgspec.defstruct(
+        name,
+        fields,
+        rename=rename,
+        kw_only=True,
+        gc=False,
+        module=__name__,
+    )
+    return struct, keys
+
+
+def compile_record_plans(
+    mappings: tuple[StructureMapping, ...],
+) -> dict[tuple[int, int], RecordPlan]:
+    """Compile mappings into record plans keyed by (sensor_type, structure)."""
+    plans: dict[tuple[int, int], RecordPlan] = {}
+    for index, mapping in enumerate(mappings):
+        struct, keys = record_struct(f"Record{index}", mapping)
+        plan = RecordPlan(
+            decoder=msgspec.json.Decoder(list[struct]),
+            target=mapping.target,
+            stamp=mapping.stamp,
+            keys=keys,
+            transformed=tuple(
+                (field.key, field.transform)
+                for field in mapping.fields
+                if field.transform is not None
+            ),
+        )
+        for sensor_type in mapping.sensor_types:
+            for structure in mapping.data_structure_types:
+                plans[(sensor_type, structure)] = plan
+    return plans
+
+
+RECORD_PLANS = compile_record_plans(OBSERVATION_MAPPINGS)
+
+
+def decode_current_struct(current: Current, primary_tx_id: int) -> dict[Any, Any]:
+    """Normalize a typed /current response into per transmitter dicts.
+
+    The result is the same as decode_current of the response as dicts.
+    """
+    outdata: dict[Any, Any] = {primary_tx_id: {}}
+    outdata[DataKey.UUID] = current.station_id_uuid
+    plans_get = RECORD_PLANS.get
+    astuple = msgspec.structs.astuple
+    for sensor in current.sensors:
+        sensor_type = sensor.sensor_type
+        structure = sensor.data_structure_type
+        if (plan := plans_get((sensor_type, structure))) is None:
+            continue
+        try:
+            record = plan.decoder.decode(sensor.data)[0]
+        except msgspec.ValidationError as err:
+            _LOGGER.debug(
+                "Decoding sensor %s of type %s/%s as dicts: %s",
+                sensor.lsid,
+                sensor_type,
+                structure,
+                err,
+            )
+            decode_sensor_dict(sensor, outdata, primary_tx_id)
+            continue
+        except IndexError:
+            continue
+
+        values = astuple(record)
+        if plan.target is Target.PRIMARY:
+            tx_id = primary_tx_id
+        elif plan.target is Target.LSID:
+            tx_id = sensor.lsid
+        else:
+            tx_id = values[-1]
+        if (out := outdata.get(tx_id)) is None:
+            out = outdata[tx_id] = {}
+
+        if plan.stamp:
+            out[DataKey.SENSOR_TYPE] = sensor_type
+            out[DataKey.DATA_STRUCTURE] = structure
+            out[DataKey.TIMESTAMP] = values[-2]
+        out.update(zip(plan.keys, values, strict=False))
+        for key, transform in plan.transformed:
+            out[key] = transform(out[key])
+
+    return outdata
+
+
+def decode_sensor_dict(
+    sensor: Sensor, outdata: dict[Any, Any], primary_tx_id: int
+) -> None:
+    """Decode a sensor whose record failed validation with the dict decoder.
+
+    The values are merged into outdata only when the whole record decoded.
+    """
+    decoded: dict[Any, Any] = {}
+    try:
+        decode_current_sensor(
+            {
+                "lsid": sensor.lsid,
+                "sensor_type": sensor.sensor_type,
+                "data_structure_type": sensor.data_structure_type,
+                "data": msgspec.json.decode(sensor.data),
+            },
+            decoded,
+            primary_tx_id,
+        )
+    except (KeyError, IndexError, TypeError, ValueError) as err:
+        _LOGGER.debug(
+            "Skipping sensor %s of type %s/%s: %s",
+            sensor.lsid,
+            sensor.sensor_type,
+            sensor.data_structure_type,
+            err,
+        )
+        return
+    for tx_id, values in decoded.items():
+        outdata.setdefault(tx_id, {}).update(values)
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -24,15 +26,21 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfVolumetricFlux,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 
-from . import WLConfigEntry, get_coordinator
-from .const import CONF_API_VERSION, ApiVersion, DataKey
-from .entity import WLEntity
+from . import WLConfigEntry, WLData as WLStation, entry_stations, get_coordinator
+from .const import CONF_API_VERSION, DOMAIN, ApiVersion, DataKey
+from .derived import DERIVED_FROM
+from .entity import WLEntity, aux_descriptions
 from .pyweatherlink import WLData
+from .ratelimit import WLRateLimiter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,6 +55,30 @@ class WLSensorDescription(SensorEntityDescription):
     exclude_api_ver: tuple = ()
     exclude_data_structure: tuple = ()
     aux_sensors: tuple = ()
+    extra_tags: tuple = ()
+
+
+def value_accessor(
+    coordinator: DataUpdateCoordinator[dict],
+    tx_id: int,
+    description: WLSensorDescription,
+) -> Callable[[], Any]:
+    """Return a getter of the value of a sensor.
+
+    Values needing conversion are derived once per refresh by the
+    coordinator, so the getter only reads the tag.
+    """
+    tag = description.tag
+
+    def get_value() -> Any:
+        return coordinator.data[tx_id].get(tag)
+
+    return get_value
+
+
+def source_tag(description: WLSensorDescription) -> DataKey | None:
+    """Return the tag that a sensor is derived from, or its tag."""
+    return DERIVED_FROM.get(description.tag, description.tag)
 
 
 SENSOR_TYPES: tuple[WLSensorDescription, ...] = (
@@ -99,7 +131,7 @@ SENSOR_TYPES: tuple[WLSensorDescription, ...] = (
     ),
     WLSensorDescription(
         key="BarTrend",
-        tag=DataKey.BAR_TREND,
+        tag=DataKey.BAR_TREND_CATEGORY,
         icon="mdi:trending-up",
         translation_key="bar_trend",
     ),
@@ -115,7 +147,7 @@ SENSOR_TYPES: tuple[WLSensorDescription, ...] = (
     ),
     WLSensorDescription(
         key="WindGust",
-        tag=DataKey.WIND_GUST_MPH,
+        tag=DataKey.WIND_GUST_MPH_VALID,
         device_class=SensorDeviceClass.WIND_SPEED,
         translation_key="wind_gust",
         suggested_display_precision=1,
@@ -125,7 +157,7 @@ SENSOR_TYPES: tuple[WLSensorDescription, ...] = (
     ),
     WLSensorDescription(
         key="WindDir",
-        tag=DataKey.WIND_DIR,
+        tag=DataKey.WIND_DIR_CARDINAL,
         icon="mdi:compass-outline",
         translation_key="wind_direction",
         aux_sensors=(55,),
@@ -163,6 +195,7 @@ SENSOR_TYPES: tuple[WLSensorDescription, ...] = (
     WLSensorDescription(
         key="RainStorm",
         tag=DataKey.RAIN_STORM,
+        extra_tags=(DataKey.RAIN_STORM_START,),
         translation_key="rain_storm",
         device_class=SensorDeviceClass.PRECIPITATION,
         native_unit_of_measurement=UnitOfPrecipitationDepth.INCHES,
@@ -172,6 +205,7 @@ SENSOR_TYPES: tuple[WLSensorDescription, ...] = (
     WLSensorDescription(
         key="RainStormLast",
         tag=DataKey.RAIN_STORM_LAST,
+        extra_tags=(DataKey.RAIN_STORM_LAST_START, DataKey.RAIN_STORM_LAST_END),
         translation_key="rain_storm_last",
         device_class=SensorDeviceClass.PRECIPITATION,
         native_unit_of_measurement=UnitOfPrecipitationDepth.INCHES,
@@ -578,13 +612,26 @@ SENSOR_TYPES: tuple[WLSensorDescription, ...] = (
     WLSensorDescription(
         key="LastUpdate",
         translation_key="last_update",
-        tag=DataKey.TIMESTAMP,
+        tag=DataKey.LAST_UPDATE,
         entity_category=EntityCategory.DIAGNOSTIC,
         device_class=SensorDeviceClass.TIMESTAMP,
         aux_sensors=(323, 326),
     ),
 )
 
+AUX_SENSOR_TYPES = aux_descriptions(SENSOR_TYPES)
+
+
+# Requests made with the API key between two writes of the budget state
+API_BUDGET_STEP = 10
+
+API_BUDGET_DESCRIPTION = SensorEntityDescription(
+    key="ApiBudget",
+    translation_key="api_budget",
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -592,52 +639,103 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    coordinator = await get_coordinator(hass, entry)
-    primary_tx_id = entry.runtime_data.primary_tx_id
+    await get_coordinator(hass, entry)
+    entities = []
+    for station in entry_stations(entry):
+        if station.coordinator.data is not None:
+            entities += station_entities(hass, entry, station)
+
+    if entry.data[CONF_API_VERSION] == ApiVersion.API_V2 and entities:
+        limiter = entry.runtime_data.api.limiter
+        unique_id_base = entities[0].station.topology.unique_id_base
+        # Entries sharing an API key share the budget, the first one shows it
+        if limiter.sensor_entry_id in (None, entry.entry_id):
+            limiter.sensor_entry_id = entry.entry_id
+            entities.append(WLApiBudgetSensor(limiter, entry.entry_id, unique_id_base))
+        else:
+            entity_registry = er.async_get(hass)
+            if (
+                entity_id := entity_registry.async_get_entity_id(
+                    "sensor",
+                    DOMAIN,
+                    f"{unique_id_base}-{API_BUDGET_DESCRIPTION.key}",
+                )
+            ) is not None and entity_registry.async_get(
+                entity_id
+            ).config_entry_id == entry.entry_id:
+                entity_registry.async_remove(entity_id)
+    async_add_entities(entities)
+
+
+def rain_storm_attributes(start: int | None) -> dict[str, datetime] | None:
+    """Return the attributes of the current rain storm."""
+    if start is None:
+        return None
+    return {"rain_storm_start": datetime.fromtimestamp(start)}
+
+
+def rain_storm_last_attributes(
+    start: int | None, end: int | None
+) -> dict[str, datetime] | None:
+    """Return the attributes of the last rain storm."""
+    if start is None or end is None:
+        return None
+    return {
+        "rain_storm_start": dt_util.utc_from_timestamp(start),
+        "rain_storm_end": dt_util.utc_from_timestamp(end),
+    }
+
+
+def station_entities(
+    hass: HomeAssistant, entry: WLConfigEntry, station: WLStation
+) -> list[WLSensor]:
+    """Return the entities of a station."""
+    coordinator = station.coordinator
+    primary_tx_id = station.primary_tx_id
     entities = [
-        WLSensor(coordinator, hass, entry, description, primary_tx_id)
+        WLSensor(coordinator, hass, entry, description, primary_tx_id, station)
         for description in SENSOR_TYPES
         if (entry.data[CONF_API_VERSION] not in description.exclude_api_ver)
         and (
             coordinator.data[primary_tx_id].get(DataKey.DATA_STRUCTURE)
             not in description.exclude_data_structure
         )
-        and (coordinator.data[primary_tx_id].get(description.tag) is not None)
+        and (coordinator.data[primary_tx_id].get(source_tag(description)) is not None)
     ]
 
     aux_entities = []
-    if entry.data[CONF_API_VERSION] == ApiVersion.API_V2:
-        for sensor in entry.runtime_data.sensors_metadata:
+    if entry.data[CONF_API_VERSION] != ApiVersion.API_V1:
+        for sensor in station.sensors_metadata:
             if sensor["tx_id"] is not None and sensor["tx_id"] != primary_tx_id:
                 aux_entities += [
                     WLSensor(
-                        coordinator,
+                        station.coordinator_for(sensor["tx_id"]),
                         hass,
                         entry,
                         description,
                         sensor["tx_id"],
+                        station,
                     )
-                    for description in SENSOR_TYPES
-                    if sensor["sensor_type"] in description.aux_sensors
-                    and coordinator.data[sensor["tx_id"]].get(description.tag)
+                    for description in AUX_SENSOR_TYPES.get(sensor["sensor_type"], ())
+                    if coordinator.data[sensor["tx_id"]].get(source_tag(description))
                     is not None
                 ]
             if sensor["tx_id"] is None:
                 aux_entities += [
                     WLSensor(
-                        coordinator,
+                        station.coordinator_for(sensor["lsid"]),
                         hass,
                         entry,
                         description,
                         sensor["lsid"],
+                        station,
                     )
-                    for description in SENSOR_TYPES
-                    if sensor["sensor_type"] in description.aux_sensors
-                    and coordinator.data[sensor["lsid"]].get(description.tag)
+                    for description in AUX_SENSOR_TYPES.get(sensor["sensor_type"], ())
+                    if coordinator.data[sensor["lsid"]].get(source_tag(description))
                     is not None
                 ]
 
-    async_add_entities(entities + aux_entities)
+    return entities + aux_entities
 
 
 class WLSensor(WLEntity, SensorEntity):
@@ -646,145 +744,131 @@ class WLSensor(WLEntity, SensorEntity):
     entity_description: WLSensorDescription
     sensor_data = WLData()
 
+    def __init__(
+        self,
+        coordinator,
+        hass: HomeAssistant,
+        entry: WLConfigEntry,
+        description: WLSensorDescription,
+        tx_id: int,
+        station: WLStation | None = None,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, hass, entry, description, tx_id, station)
+        self._get_value = value_accessor(coordinator, tx_id, description)
+
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        # _LOGGER.debug("Key: %s", self.entity_description.key)
-        if self.entity_description.key not in [
-            "LastUpdate",
-            "WindDir",
-            "BarTrend",
-            "WindGust",
-        ]:
-            return self.coordinator.data[self.tx_id].get(self.entity_description.tag)
-
-        if self.entity_description.tag in [DataKey.WIND_GUST_MPH]:
-            if (
-                self.coordinator.data[self.tx_id].get(self.entity_description.tag)
-                is None
-                or float(
-                    self.coordinator.data[self.tx_id].get(self.entity_description.tag)
-                )
-                < 0
-            ):
-                return None
-            if (
-                float(
-                    self.coordinator.data[self.tx_id].get(self.entity_description.tag)
-                )
-                < 0
-            ):
-                return 0.0
-            return self.coordinator.data[self.tx_id].get(self.entity_description.tag)
-
-        if self.entity_description.tag in [DataKey.WIND_DIR]:
-            if self.coordinator.data[self.tx_id][self.entity_description.tag] is None:
-                return None
-
-            directions = [
-                "n",
-                "nne",
-                "ne",
-                "ene",
-                "e",
-                "ese",
-                "se",
-                "sse",
-                "s",
-                "ssw",
-                "sw",
-                "wsw",
-                "w",
-                "wnw",
-                "nw",
-                "nnw",
-            ]
-
-            index = int(
-                (
-                    (
-                        float(
-                            self.coordinator.data[self.tx_id][
-                                self.entity_description.tag
-                            ]
-                        )
-                        + 11.25
-                    )
-                    % 360
-                )
-                // 22.5
-            )
-
-            return directions[index]
-
-        if self.entity_description.key == "BarTrend":
-            bar_trend = self.coordinator.data[self.tx_id].get(
-                self.entity_description.tag
-            )
-            if bar_trend is None:
-                return None
-            if self.is_float(bar_trend):
-                if bar_trend >= 0.060:
-                    return "rising_rapidly"
-                if bar_trend >= 0.020:
-                    return "rising_slowly"
-                if bar_trend > -0.020:
-                    return "steady"
-                if bar_trend > -0.060:
-                    return "falling_slowly"
-                return "falling_rapidly"
-            return str(bar_trend).lower().replace(" ", "_")
-
-        if self.entity_description.key == "LastUpdate":
-            return dt_util.utc_from_timestamp(
-                self.coordinator.data[self.tx_id].get(DataKey.TIMESTAMP)
-            )
-
-        return None
-
-    def is_float(self, in_string) -> bool:
-        """Check if string is float."""
-        try:
-            float(in_string)
-        except ValueError:
-            return False
-        return True
+        return self._get_value()
 
     @property
     def extra_state_attributes(self) -> dict[str, str] | None:
         """Return the state attributes, if any."""
-        if self.entity_description.key in [
-            "RainStorm",
-        ]:
-            if self.coordinator.data[self.tx_id].get(DataKey.RAIN_STORM_START) is None:
-                return None
-            dt_object = datetime.fromtimestamp(
-                self.coordinator.data[self.tx_id].get(DataKey.RAIN_STORM_START)
-            )
-            return {
-                "rain_storm_start": dt_object,
-            }
-        if self.entity_description.key in [
-            "RainStormLast",
-        ]:
-            if (
-                self.coordinator.data[self.tx_id].get(DataKey.RAIN_STORM_LAST_START)
-                is None
-            ):
-                return None
-            dt_object = dt_util.utc_from_timestamp(
-                self.coordinator.data[self.tx_id].get(DataKey.RAIN_STORM_LAST_START)
+        if self.entity_description.key == "RainStorm":
+            return self.memoized_attributes(
+                rain_storm_attributes,
+                self.coordinator.data[self.tx_id].get(DataKey.RAIN_STORM_START),
             )
-            if (
-                self.coordinator.data[self.tx_id].get(DataKey.RAIN_STORM_LAST_END)
-                is None
-            ):
-                return None
-            dt_object_end = dt_util.utc_from_timestamp(
-                self.coordinator.data[self.tx_id].get(DataKey.RAIN_STORM_LAST_END)
+        if self.entity_description.key == "RainStormLast":
+            values = self.coordinator.data[self.tx_id]
+            return self.memoized_attributes(
+                rain_storm_last_attributes,
+                values.get(DataKey.RAIN_STORM_LAST_START),
+                values.get(DataKey.RAIN_STORM_LAST_END),
             )
-            return {
-                "rain_storm_start": dt_object,
-                "rain_storm_end": dt_object_end,
-            }
         return None
+
+
+class WLApiBudgetSensor(SensorEntity):
+    """Requests left of the hourly budget of an API key."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    entity_description = API_BUDGET_DESCRIPTION
+
+    def __init__(
+        self, limiter: WLRateLimiter, entry_id: str, unique_id_base: str
+    ) -> None:
+        """Initialize the sensor."""
+        self.limiter = limiter
+        self.entry_id = entry_id
+        self._attr_unique_id = f"{unique_id_base}-{self.entity_description.key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, unique_id_base)})
+        self._written_key: tuple[int, int] | None = None
+        self._cancel_release: CALLBACK_TYPE | None = None
+
+    def _state_key(self) -> tuple[int, int]:
+        """Return the step of the requests left and the throttled requests."""
+        return self.limiter.remaining // API_BUDGET_STEP, self.limiter.throttled
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for the requests made with the API key."""
+        self._written_key = self._state_key()
+        self.async_on_remove(self.limiter.async_add_listener(self._async_request_made))
+        self._async_schedule_release()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop waiting for requests to leave the window and release the key."""
+        if self._cancel_release is not None:
+            self._cancel_release()
+            self._cancel_release = None
+        if self.limiter.sensor_entry_id == self.entry_id:
+            self.limiter.sensor_entry_id = None
+
+    @callback
+    def _async_request_made(self) -> None:
+        """Write the state when the requests left cross a step.
+
+        Requests of all entries sharing the key are reported here, writing
+        on each of them would record a state per request.
+        """
+        if (key := self._state_key()) != self._written_key:
+            self._written_key = key
+            self.async_write_ha_state()
+            self._async_schedule_release()
+
+    @callback
+    def _async_requests_released(self, _now: datetime) -> None:
+        """Write the state when requests left the window since the last write."""
+        self._cancel_release = None
+        self._async_request_made()
+        if self._cancel_release is None:
+            self._async_schedule_release()
+
+    @callback
+    def _async_schedule_release(self) -> None:
+        """Schedule a write for when the requests left reach the next step.
+
+        Requests leave the window without a request being made, so the
+        budget would otherwise show as used until the next request.
+        """
+        if self._cancel_release is not None:
+            self._cancel_release()
+            self._cancel_release = None
+        limiter = self.limiter
+        step = (limiter.remaining // API_BUDGET_STEP + 1) * API_BUDGET_STEP
+        delay = limiter.release_delay(limiter.used - max(limiter.budget - step, 0))
+        if delay is not None:
+            self._cancel_release = async_call_later(
+                self.hass,
+                max(delay, 0),
+                HassJob(
+                    self._async_requests_released,
+                    f"{DOMAIN} budget release",
+                    cancel_on_shutdown=True,
+                ),
+            )
+
+    @property
+    def native_value(self) -> int:
+        """Return the requests left of the hourly budget."""
+        return self.limiter.remaining
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the budget and the number of throttled requests."""
+        return {
+            "hourly_budget": self.limiter.budget,
+            "throttled_requests": self.limiter.throttled,
+        }
@@ -0,0 +1,247 @@
+"""HTTP session of the integration for the Weatherlink cloud API.
+
+The session has its own connector, so that connections to the API host are
+kept alive between refreshes and host lookups are cached, independent of the
+shared session of Home Assistant. It is shared by all entries using the cloud
+API and closed when the last of them is unloaded. Connect, time to response
+headers and transfer times of recent requests are recorded for diagnostics.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+from statistics import fmean
+from time import monotonic
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import (
+    ClientSession,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionCreateStartParams,
+    TraceConnectionReuseconnParams,
+    TraceDnsResolveHostEndParams,
+    TraceDnsResolveHostStartParams,
+    TraceRequestEndParams,
+    TraceRequestExceptionParams,
+    TraceRequestStartParams,
+    TraceResponseChunkReceivedParams,
+    hdrs,
+)
+from aiohttp.compression_utils import HAS_BROTLI
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.ssl import get_default_context
+
+from .const import DOMAIN, VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+CONNECTION_LIMIT = 10
+KEEPALIVE_TIMEOUT = 120
+DNS_CACHE_TTL = 600
+RECENT_REQUESTS = 50
+
+# Brotli is only asked for when aiohttp can decode it
+ACCEPT_ENCODING = "gzip, br" if HAS_BROTLI else "gzip"
+
+SESSION: HassKey[WLSession] = HassKey(f"{DOMAIN}_session")
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """Timings of one request in seconds."""
+
+    start: float
+    dns: float | None = None
+    connect: float | None = None
+    reused: bool = False
+    headers: float | None = None
+    transfer: float | None = None
+    status: int | None = None
+
+
+class WLRequestTimings:
+    """Timings of the recent requests of a session."""
+
+    def __init__(self, maxlen: int = RECENT_REQUESTS) -> None:
+        """Initialize."""
+        self.requests = 0
+        self.recent: deque[RequestTiming] = deque(maxlen=maxlen)
+
+    def trace_config(self) -> TraceConfig:
+        """Return a trace config that records into this instance."""
+        trace_config = TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace_config.on_connection_create_start.append(self._on_connect_start)
+        trace_config.on_connection_create_end.append(self._on_connect_end)
+        trace_config.on_connection_reuseconn.append(self._on_reuse)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        trace_config.on_response_chunk_received.append(self._on_chunk)
+        return trace_config
+
+    async def _on_request_start(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceRequestStartParams,
+    ) -> None:
+        self.requests += 1
+        ctx.timing = RequestTiming(start=monotonic())
+        self.recent.append(ctx.timing)
+
+    async def _on_dns_start(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceDnsResolveHostStartParams,
+    ) -> None:
+        ctx.dns_start = monotonic()
+
+    async def _on_dns_end(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceDnsResolveHostEndParams,
+    ) -> None:
+        ctx.timing.dns = monotonic() - ctx.dns_start
+
+    async def _on_connect_start(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceConnectionCreateStartParams,
+    ) -> None:
+        ctx.connect_start = monotonic()
+
+    async def _on_connect_end(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceConnectionCreateEndParams,
+    ) -> None:
+        # Includes the host lookup and the TLS handshake
+        ctx.timing.connect = monotonic() - ctx.connect_start
+
+    async def _on_reuse(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceConnectionReuseconnParams,
+    ) -> None:
+        ctx.timing.reused = True
+
+    async def _on_request_end(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceRequestEndParams,
+    ) -> None:
+        ctx.headers_end = monotonic()
+        ctx.timing.headers = ctx.headers_end - ctx.timing.start
+        ctx.timing.status = params.response.status
+
+    async def _on_request_exception(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceRequestExceptionParams,
+    ) -> None:
+        _LOGGER.debug("Request to %s failed: %r", params.url, params.exception)
+
+    async def _on_chunk(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceResponseChunkReceivedParams,
+    ) -> None:
+        ctx.timing.transfer = monotonic() - ctx.headers_end
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return mean timings of the recent requests in ms, for diagnostics."""
+
+        def mean_ms(values: list[float | None]) -> float | None:
+            found = [value for value in values if value is not None]
+            return round(fmean(found) * 1000, 1) if found else None
+
+        recent = list(self.recent)
+        return {
+            "requests": self.requests,
+            "recent": len(recent),
+            "reused": sum(timing.reused for timing in recent),
+            "dns_ms": mean_ms([timing.dns for timing in recent]),
+            "connect_ms": mean_ms([timing.connect for timing in recent]),
+            "headers_ms": mean_ms([timing.headers for timing in recent]),
+            "transfer_ms": mean_ms([timing.transfer for timing in recent]),
+        }
+
+
+@dataclass
+class WLSession:
+    """The session of the integration and the entries using it."""
+
+    session: ClientSession
+    timings: WLRequestTimings
+    entry_ids: set[str] = field(default_factory=set)
+    remove_close_listener: CALLBACK_TYPE | None = None
+
+
+def create_session() -> tuple[ClientSession, WLRequestTimings]:
+    """Create a session with a tuned connector and request timings."""
+    timings = WLRequestTimings()
+    connector = TCPConnector(
+        limit=CONNECTION_LIMIT,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        ssl=get_default_context(),
+    )
+    session = ClientSession(
+        connector=connector,
+        headers={
+            hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING,
+            hdrs.USER_AGENT: f"Weatherlink for Home Assistant/{VERSION}",
+        },
+        trace_configs=[timings.trace_config()],
+    )
+    return session, timings
+
+
+@callback
+def async_acquire_session(hass: HomeAssistant, entry: ConfigEntry) -> WLSession:
+    """Get or create the session of the integration for a config entry."""
+    if (shared := hass.data.get(SESSION)) is None:
+        session, timings = create_session()
+        shared = hass.data[SESSION] = WLSession(session, timings)
+
+        async def async_close(event: Event) -> None:
+            shared.remove_close_listener = None
+            await shared.session.close()
+
+        shared.remove_close_listener = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, async_close
+        )
+    shared.entry_ids.add(entry.entry_id)
+    return shared
+
+
+async def async_release_session(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Release the session and close it when no entry uses it."""
+    if (shared := hass.data.get(SESSION)) is None:
+        return
+    shared.entry_ids.discard(entry.entry_id)
+    if shared.entry_ids:
+        return
+    hass.data.pop(SESSION)
+    if shared.remove_close_listener is not None:
+        shared.remove_close_listener()
+    await shared.session.close()
@@ -0,0 +1,102 @@
+"""Staggering of refreshes across config entries.
+
+Without it the coordinators of all entries refresh at the same moments: cloud
+entries just after the stations upload, which is on the same clock minute for
+stations with the same recording interval, and local entries on intervals
+started when Home Assistant set them up. Each entry is given a slot from a
+hash of its station id instead. Entries are ranked by hash and spread evenly,
+so that slots do not depend on the order of setup and are spread again when
+entries are added or removed.
+"""
+
+from __future__ import annotations
+
+from zlib import crc32
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+# Window after the expected upload that refreshes of cloud entries spread over
+STAGGER_WINDOW = 60.0
+
+STAGGER: HassKey[WLRefreshStagger] = HassKey(f"{DOMAIN}_stagger")
+
+
+def stagger_hash(station_id: str) -> int:
+    """Return a hash of a station id that is stable between restarts."""
+    return crc32(station_id.encode())
+
+
+class WLRefreshStagger:
+    """Slots of the refreshes of the config entries of the integration."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._station_ids: dict[str, str] = {}
+        self._fractions: dict[str, float] | None = None
+
+    @callback
+    def async_add(self, entry_id: str, station_id: str) -> CALLBACK_TYPE:
+        """Add an entry and return a callback that removes it."""
+        self._station_ids[entry_id] = station_id
+        self._fractions = None
+
+        @callback
+        def async_remove() -> None:
+            self._station_ids.pop(entry_id, None)
+            self._fractions = None
+
+        return async_remove
+
+    def fraction(self, entry_id: str) -> float:
+        """Return the slot of an entry as a fraction of the interval."""
+        if self._fractions is None:
+            ranked = sorted(
+                self._station_ids,
+                key=lambda key: (stagger_hash(self._station_ids[key]), key),
+            )
+            self._fractions = {
+                key: index / len(ranked) for index, key in enumerate(ranked)
+            }
+        return self._fractions.get(entry_id, 0.0)
+
+    def offset(self, entry_id: str, window: float) -> float:
+        """Return the offset of an entry in a window, in seconds."""
+        return self.fraction(entry_id) * window
+
+    def delay(self, entry_id: str, now: float, interval: float) -> float:
+        """Return the delay until the next slot of an entry, in seconds.
+
+        Slots repeat every interval from the epoch. A slot less than half an
+        interval away is skipped, so that a refresh that ran a little early
+        does not run again at once.
+        """
+        delay = (self.offset(entry_id, interval) - now) % interval
+        return delay + interval if delay < interval / 2 else delay
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._station_ids)
+
+
+@callback
+def async_get_stagger(hass: HomeAssistant) -> WLRefreshStagger:
+    """Get or create the refresh slots of the integration."""
+    if (stagger := hass.data.get(STAGGER)) is None:
+        stagger = hass.data[STAGGER] = WLRefreshStagger()
+    return stagger
+
+
+@callback
+def async_add_entry(hass: HomeAssistant, entry: ConfigEntry) -> CALLBACK_TYPE:
+    """Give a config entry a slot, keyed by its station id.
+
+    The unique id of cloud entries is the station id, and that of local
+    entries the device id.
+    """
+    return async_get_stagger(hass).async_add(
+        entry.entry_id, entry.unique_id or entry.entry_id
+    )
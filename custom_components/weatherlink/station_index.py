@@ -0,0 +1,202 @@
+"""Index of the station metadata that entities and devices are built from.
+
+Device names and models used to be found by scanning the sensor metadata for
+every entity, which made setup quadratic in the number of sensors. The index
+is built once per station after the first refresh and shared by all its
+entities. It is immutable, a change of metadata reloads the entry.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import (
+    CONFIG_URL,
+    DOMAIN,
+    MANUFACTURER,
+    SENSOR_TYPE_AIRLINK,
+    SENSOR_TYPE_VUE_AND_VANTAGE_PRO,
+    ApiVersion,
+    DataKey,
+)
+
+GATEWAY_TYPES = (
+    (lambda model: model == "6555", "WLIP"),
+    (lambda model: model.startswith("6100"), "WLL"),
+    (lambda model: model.startswith("6313"), "WLC"),
+    (lambda model: model.startswith("6805"), "EnviroMonitor"),
+    (lambda model: model.startswith("7210"), "AirLink"),
+    (lambda model: model.endswith("6558"), "WL"),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SensorInfo:
+    """Metadata of one sensor, with its position in the metadata."""
+
+    index: int
+    lsid: int | None
+    tx_id: int | None
+    sensor_type: int | None
+    product_name: str | None
+    parent_device_name: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceEntry:
+    """Identifier and device info of the device of a transmitter."""
+
+    device_id: str
+    device_info: DeviceInfo
+    is_airlink: bool
+
+
+@dataclass(frozen=True, slots=True)
+class WLTopology:
+    """Sensors of a station by tx_id and lsid, and the devices of entities."""
+
+    unique_id_base: str
+    primary_tx_id: int
+    by_tx_id: Mapping[int, tuple[SensorInfo, ...]]
+    by_lsid: Mapping[int, SensorInfo]
+    devices: Mapping[Any, DeviceEntry]
+
+    def device(self, tx_id: Any) -> DeviceEntry:
+        """Return the device of the entities of a transmitter."""
+        return self.devices[tx_id]
+
+
+def gateway_type(model: str | None) -> str:
+    """Return the gateway type of a station product number."""
+    gateway = "WeatherLink"
+    if model is None:
+        return gateway
+    for matches, name in GATEWAY_TYPES:
+        if matches(model):
+            gateway = f"{name} {model}"
+    return gateway
+
+
+def build_topology(
+    api_version: ApiVersion,
+    station_data: dict[str, Any],
+    sensors: list[dict[str, Any]],
+    primary_tx_id: int,
+    data: dict[Any, Any],
+) -> WLTopology:
+    """Index the metadata of a station and the devices of its transmitters.
+
+    Names and models are those the entities looked up before the index, the
+    first matching sensor in the metadata order wins.
+    """
+    infos = [
+        SensorInfo(
+            index,
+            sensor.get("lsid"),
+            sensor.get("tx_id"),
+            sensor.get("sensor_type"),
+            sensor.get("product_name"),
+            sensor.get("parent_device_name"),
+        )
+        for index, sensor in enumerate(sensors)
+    ]
+    by_tx_id: dict[int, list[SensorInfo]] = {}
+    by_lsid: dict[int, SensorInfo] = {}
+    first_airlink: dict[int, SensorInfo] = {}
+    first_named: dict[int, SensorInfo] = {}
+    first_vue_without_tx = None
+    for info in infos:
+        if info.tx_id is not None:
+            by_tx_id.setdefault(info.tx_id, []).append(info)
+            if info.sensor_type in (55, 56):
+                first_named.setdefault(info.tx_id, info)
+        if info.lsid is not None:
+            by_lsid.setdefault(info.lsid, info)
+        if info.sensor_type in SENSOR_TYPE_AIRLINK:
+            first_airlink.setdefault(info.lsid, info)
+        elif (
+            first_vue_without_tx is None
+            and info.sensor_type in SENSOR_TYPE_VUE_AND_VANTAGE_PRO
+            and info.tx_id is None
+        ):
+            first_vue_without_tx = info
+
+    station = (station_data.get("stations") or [{}])[0]
+
+    def first(*candidates: SensorInfo | None) -> SensorInfo | None:
+        return min(
+            (info for info in candidates if info is not None),
+            key=lambda info: info.index,
+            default=None,
+        )
+
+    def name(tx_id: Any) -> str:
+        if api_version == ApiVersion.API_V1:
+            return data[1]["station_name"]
+        if tx_id == primary_tx_id:
+            return station["station_name"]
+        info = first(first_named.get(tx_id), first_airlink.get(tx_id))
+        if info is None:
+            return "Unknown devicename"
+        if info.sensor_type in SENSOR_TYPE_AIRLINK:
+            return f"{info.product_name} {info.parent_device_name}"
+        return f"{info.product_name} ID{info.tx_id}"
+
+    def model(tx_id: Any) -> str | None:
+        if api_version == ApiVersion.API_V1:
+            return "WeatherLink - API V1"
+        first_by_tx = by_tx_id.get(tx_id, [None])[0]
+        info = first(first_vue_without_tx, first_by_tx, first_airlink.get(tx_id))
+        product_name = "" if info is None else info.product_name
+        if tx_id == primary_tx_id:
+            return f"{gateway_type(station.get('product_number'))} / {product_name}"
+        return product_name
+
+    if api_version == ApiVersion.API_V1:
+        unique_id_base = data[primary_tx_id]["DID"]
+        firmware = serial = None
+    else:
+        unique_id_base = data[DataKey.UUID]
+        firmware = station.get("firmware_version")
+        serial = station.get("gateway_id_hex")
+
+    devices: dict[Any, DeviceEntry] = {}
+    for tx_id in (
+        primary_tx_id,
+        *by_tx_id,
+        *(info.lsid for info in infos if info.tx_id is None),
+    ):
+        if tx_id in devices:
+            continue
+        device_model = model(tx_id)
+        is_airlink = (device_model or "").startswith("AirLink") and data.get(1) == {}
+        tx_id_part = f"-{tx_id}" if tx_id != primary_tx_id and not is_airlink else ""
+        devices[tx_id] = DeviceEntry(
+            device_id=f"{unique_id_base}{tx_id_part}",
+            device_info=DeviceInfo(
+                identifiers={(DOMAIN, f"{unique_id_base}{tx_id_part}")},
+                name=name(tx_id),
+                manufacturer=MANUFACTURER,
+                model=device_model,
+                sw_version=firmware,
+                serial_number=serial,
+                configuration_url=CONFIG_URL,
+                via_device=(DOMAIN, unique_id_base) if tx_id_part != "" else None,
+            ),
+            is_airlink=is_airlink,
+        )
+
+    return WLTopology(
+        unique_id_base=unique_id_base,
+        primary_tx_id=primary_tx_id,
+        by_tx_id=MappingProxyType(
+            {tx_id: tuple(sensors) for tx_id, sensors in by_tx_id.items()}
+        ),
+        by_lsid=MappingProxyType(by_lsid),
+        devices=MappingProxyType(devices),
+    )
@@ -0,0 +1,118 @@
+"""Persistent cache of station and sensor metadata."""
+
+from __future__ import annotations
+
+import logging
+from time import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .derived import strip_derived
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+METADATA_TTL = 7 * 24 * 3600
+SNAPSHOT_SAVE_DELAY = 300
+
+TOPOLOGY_STATION_KEYS = (
+    "station_id",
+    "station_name",
+    "product_number",
+    "firmware_version",
+    "gateway_id_hex",
+)
+TOPOLOGY_SENSOR_KEYS = (
+    "lsid",
+    "sensor_type",
+    "data_structure_type",
+    "tx_id",
+    "product_name",
+    "parent_device_name",
+)
+
+
+class WLMetadataStore:
+    """Station data and sensor metadata of a config entry, stored on disk."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
+
+    async def async_load(
+        self,
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]] | None:
+        """Return stored station data and sensors unless missing or expired."""
+        if (data := await self._store.async_load()) is None:
+            return None
+        if time() - data["saved_at"] > METADATA_TTL:
+            _LOGGER.debug("Stored metadata expired")
+            return None
+        return data["station_data"], data["sensors"]
+
+    async def async_save(
+        self, station_data: dict[str, Any], sensors: list[dict[str, Any]]
+    ) -> None:
+        """Store station data and sensors."""
+        await self._store.async_save(
+            {"station_data": station_data, "sensors": sensors, "saved_at": time()}
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the stored metadata."""
+        await self._store.async_remove()
+
+
+class WLSnapshotStore:
+    """Last decoded observations of a config entry, stored on disk.
+
+    The data is stored as a list of key and value pairs so that integer
+    transmitter ids survive the round trip through JSON. Derived values are
+    left out and derived again when the data is restored.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.data"
+        )
+
+    async def async_load(self) -> dict | None:
+        """Return the stored observations."""
+        if (data := await self._store.async_load()) is None:
+            return None
+        return dict(data["data"])
+
+    @callback
+    def async_schedule_save(self, data: dict) -> None:
+        """Store observations, coalescing saves of frequent refreshes."""
+        self._store.async_delay_save(
+            lambda: {"data": list(strip_derived(data).items())}, SNAPSHOT_SAVE_DELAY
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the stored observations."""
+        await self._store.async_remove()
+
+
+def topology(station_data: dict[str, Any], sensors: list[dict[str, Any]]) -> tuple:
+    """Return the parts of the metadata that entities and devices are built from."""
+    station = (station_data.get("stations") or [{}])[0]
+    return (
+        tuple(station.get(key) for key in TOPOLOGY_STATION_KEYS),
+        tuple(
+            sorted(
+                (
+                    tuple(sensor.get(key) for key in TOPOLOGY_SENSOR_KEYS)
+                    for sensor in sensors
+                ),
+                key=repr,
+            )
+        ),
+    )
@@ -1,7 +1,9 @@
 """Stub - must be here."""
 
+import msgspec
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.weatherlink.schema import CURRENT_DECODER, Current
 from homeassistant.core import HomeAssistant
 
 
@@ -11,3 +13,13 @@ async def setup_integration(hass: HomeAssistant, config_entry: MockConfigEntry)
 
     await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()  # ? Needed ?
+
+
+def as_current(payload: dict) -> Current:
+    """Decode a /current payload like WLHubV2.get_current."""
+    return CURRENT_DECODER.decode(msgspec.json.encode(payload))
+
+
+async def get_current_from_get_data(self) -> Current:
+    """Decode the payload of a mocked WLHubV2.get_data."""
+    return as_current(await self.get_data())
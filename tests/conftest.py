@@ -11,6 +11,8 @@ from syrupy import SnapshotAssertion
 from homeassistant.core import HomeAssistant
 from homeassistant.util.json import json_loads
 
+from . import get_current_from_get_data
+
 # pylint: disable=redefined-outer-name
 
 
@@ -68,9 +70,15 @@ def bypass_get_data_fixture(
     load_default_data: dict,
 ):
     """Skip calls to get data from API."""
-    with patch(
-        "custom_components.weatherlink.pyweatherlink.WLHubV2.get_data",
-        return_value=load_default_data,
+    with (
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_data",
+            return_value=load_default_data,
+        ),
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_current",
+            get_current_from_get_data,
+        ),
     ):
         yield
 
@@ -149,5 +157,9 @@ def mock_api() -> Generator[MagicMock]:
         patch(
             "custom_components.weatherlink.pyweatherlink.WLHubV2.get_data"
         ) as mock_api,
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_current",
+            get_current_from_get_data,
+        ),
     ):
         yield mock_api
@@ -0,0 +1,152 @@
+"""Test fetching archive records and backfilling statistics."""
+
+import asyncio
+import copy
+from itertools import pairwise
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.weatherlink.backfill import async_backfill
+from custom_components.weatherlink.const import DOMAIN
+from custom_components.weatherlink.pyweatherlink import (
+    HISTORIC_CONCURRENCY,
+    HISTORIC_MAX_SECONDS,
+    WLHubV2,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import setup_integration
+from .const import ENTRY_ID, MOCK_CONFIG_V2
+
+TS = 1735386900
+HOUR = 1735383600
+
+
+def historic_payload(start: int, end: int) -> dict:
+    """Return a /historic response with an ISS and a barometer record per 15 min."""
+    return {
+        "station_id": 167531,
+        "sensors": [
+            {
+                "lsid": 1,
+                "sensor_type": 37,
+                "data_structure_type": 24,
+                "data": [
+                    {"ts": ts, "tx_id": 1, "temp_last": 40.0 + (ts - start) / 900}
+                    for ts in range(start + 900, end + 1, 900)
+                ],
+            },
+            {
+                "lsid": 2,
+                "sensor_type": 242,
+                "data_structure_type": 20,
+                "data": [
+                    {"ts": ts, "bar_sea_level": 30.1}
+                    for ts in range(start + 900, end + 1, 900)
+                ],
+            },
+            {
+                "lsid": 3,
+                "sensor_type": 509,
+                "data_structure_type": 28,
+                "data": [{"ts": end}],
+            },
+        ],
+    }
+
+
+async def test_get_historic_chunks() -> None:
+    """Test that the range is fetched in concurrent chunks and yielded in order."""
+    api = WLHubV2(api_key_v2="key", api_secret="secret", websession=MagicMock())
+    running = 0
+    most_running = 0
+
+    async def get_chunk(start: int, end: int) -> dict:
+        nonlocal running, most_running
+        running += 1
+        most_running = max(most_running, running)
+        await asyncio.sleep((end - start) % 7 / 1000)
+        running -= 1
+        return {"start": start, "end": end}
+
+    end = HOUR + 10 * HISTORIC_MAX_SECONDS + 3600
+    with patch.object(api, "get_historic_chunk", side_effect=get_chunk):
+        chunks = [chunk async for chunk in api.get_historic(HOUR, end)]
+
+    assert len(chunks) == 11
+    assert chunks[0] == {"start": HOUR, "end": HOUR + HISTORIC_MAX_SECONDS - 1}
+    assert chunks[-1] == {"start": end - 3600, "end": end}
+    assert all(prev["end"] + 1 == chunk["start"] for prev, chunk in pairwise(chunks))
+    assert most_running == HISTORIC_CONCURRENCY
+
+
+async def test_backfill(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    bypass_get_all_stations,
+    bypass_get_all_sensors,
+    bypass_get_data,
+) -> None:
+    """Test that archive records are imported as hourly statistics."""
+    freezer.move_to(dt_util.utc_from_timestamp(TS + 60))
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+
+    with (
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_historic_chunk",
+            side_effect=historic_payload,
+        ),
+        patch(
+            "custom_components.weatherlink.backfill.async_add_external_statistics"
+        ) as mock_add,
+    ):
+        assert await async_backfill(hass, entry, HOUR - 7200 + 60, HOUR + 1800) == 4
+
+    metadata = {call.args[1]["statistic_id"]: call.args for call in mock_add.mock_calls}
+    assert set(metadata) == {
+        "weatherlink:03e7585a_4f29_4e7c_b6cb_d9e17313b07c_1_temp_out",
+        "weatherlink:03e7585a_4f29_4e7c_b6cb_d9e17313b07c_1_bar_sea_level",
+    }
+    _, meta, rows = metadata[
+        "weatherlink:03e7585a_4f29_4e7c_b6cb_d9e17313b07c_1_temp_out"
+    ]
+    assert meta["source"] == DOMAIN
+    assert meta["unit_of_measurement"] == "°F"
+    assert rows[0]["start"] == dt_util.utc_from_timestamp(HOUR - 7200)
+    assert (rows[0]["mean"], rows[0]["min"], rows[0]["max"]) == (42.0, 41.0, 43.0)
+    assert rows[-1]["start"] == dt_util.utc_from_timestamp(HOUR - 3600)
+
+
+async def test_backfill_after_gap(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    load_default_data: dict,
+    bypass_get_all_stations,
+    bypass_get_all_sensors,
+    mock_api: MagicMock,
+) -> None:
+    """Test that a backfill is started when observations resume after a gap."""
+    hass.config.components.add("recorder")
+    freezer.move_to(dt_util.utc_from_timestamp(TS + 60))
+    mock_api.return_value = load_default_data
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+
+    newer = copy.deepcopy(load_default_data)
+    newer["sensors"][2]["data"][0]["ts"] = TS + 3 * 3600
+    mock_api.return_value = newer
+    with patch(
+        "custom_components.weatherlink.async_backfill", new_callable=AsyncMock
+    ) as mock_backfill:
+        await entry.runtime_data.coordinator.async_refresh()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_backfill.assert_awaited_once_with(hass, entry, TS, TS + 3 * 3600)
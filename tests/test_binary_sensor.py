@@ -22,7 +22,7 @@ from .const import ENTRY_ID, MOCK_CONFIG_V2
 async def test_binary_sensor(
     hass: HomeAssistant,
     bypass_get_data,
-    bypass_get_station,
+    bypass_get_all_stations,
     bypass_get_all_sensors,
     snapshot: SnapshotAssertion,
     entity_registry: er.EntityRegistry,
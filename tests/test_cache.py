@@ -0,0 +1,123 @@
+"""Tests for coalescing and caching of API v2 responses."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.weatherlink.account import async_create_hub
+from custom_components.weatherlink.cache import WLResponseCache
+from homeassistant.core import HomeAssistant
+
+
+class FakeClock:
+    """Monotonic clock for the cache."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+async def test_coalesce_in_flight() -> None:
+    """Test that identical requests in flight share one fetch."""
+    cache = WLResponseCache()
+    release = asyncio.Event()
+    fetches = []
+
+    async def fetch() -> bool:
+        fetches.append(None)
+        return await release.wait()
+
+    first = asyncio.create_task(cache.get("key", fetch))
+    second = asyncio.create_task(cache.get("key", fetch))
+    other = asyncio.create_task(cache.get("other", fetch))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(first, second, other) == [True, True, True]
+    assert len(fetches) == 2
+    assert cache.as_dict() == {"entries": 0, "hits": 0, "misses": 2, "coalesced": 1}
+
+    # Without a ttl nothing is kept
+    await cache.get("key", fetch)
+    assert len(fetches) == 3
+
+
+async def test_cancelled_caller() -> None:
+    """Test that a cancelled caller does not cancel the fetch of the others."""
+    cache = WLResponseCache()
+    release = asyncio.Event()
+
+    async def fetch() -> str:
+        await release.wait()
+        return "value"
+
+    first = asyncio.create_task(cache.get("key", fetch))
+    second = asyncio.create_task(cache.get("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "value"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_ttl_and_eviction() -> None:
+    """Test expiry of cached responses and eviction of the least recently used."""
+    clock = FakeClock()
+    cache = WLResponseCache(max_entries=2)
+    fetch = AsyncMock(return_value={"stations": []})
+    with patch("custom_components.weatherlink.cache.monotonic", clock):
+        await cache.get("a", fetch, ttl=10)
+        await cache.get("b", fetch, ttl=10)
+        await cache.get("a", fetch, ttl=10)
+        assert fetch.await_count == 2
+
+        # b is the least recently used
+        await cache.get("c", fetch, ttl=10)
+        await cache.get("a", fetch, ttl=10)
+        assert fetch.await_count == 3
+        await cache.get("b", fetch, ttl=10)
+        assert fetch.await_count == 4
+
+        clock.now += 10
+        await cache.get("b", fetch, ttl=10)
+        assert fetch.await_count == 5
+
+
+async def test_errors_not_cached() -> None:
+    """Test that a failed fetch is not cached."""
+    cache = WLResponseCache()
+    fetch = AsyncMock(side_effect=[TimeoutError, "value"])
+    with pytest.raises(TimeoutError):
+        await cache.get("key", fetch, ttl=10)
+    assert await cache.get("key", fetch, ttl=10) == "value"
+
+
+async def test_hubs_share_metadata(hass: HomeAssistant) -> None:
+    """Test that hubs with the same credentials share metadata responses."""
+    body = json.dumps(json.loads(load_fixture("all_stations.json"))).encode()
+    request = AsyncMock(return_value=MagicMock(read=AsyncMock(return_value=body)))
+    with patch("custom_components.weatherlink.pyweatherlink.WLHubV2.request", request):
+        flow_hub = async_create_hub(hass, "key", "secret")
+        entry_hub = async_create_hub(hass, "key", "secret", "167531")
+        first, second = await asyncio.gather(
+            flow_hub.get_all_stations(), entry_hub.get_all_stations()
+        )
+        assert first is second
+        assert request.await_count == 1
+
+        await flow_hub.get_all_stations()
+        assert request.await_count == 1
+
+        # Other credentials never share responses
+        await async_create_hub(hass, "key", "wrong").get_all_stations()
+        assert request.await_count == 2
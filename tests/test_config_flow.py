@@ -3,17 +3,26 @@
 from unittest.mock import patch
 
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.weatherlink.config_flow import CannotConnect, InvalidAuth
+from custom_components.weatherlink.config_flow import (
+    CannotConnect,
+    InvalidAuth,
+    all_stations_unique_id,
+)
 from custom_components.weatherlink.const import (
+    ALL_STATIONS,
     CONF_API_KEY_V2,
     CONF_API_SECRET,
     CONF_API_TOKEN,
+    CONF_API_VERSION,
+    CONF_REALTIME,
+    CONF_REALTIME_INTERVAL,
     CONF_STATION_ID,
     DOMAIN,
 )
 from homeassistant import config_entries
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
@@ -67,6 +76,36 @@ async def test_succesful_flow(
     assert result["type"] is FlowResultType.CREATE_ENTRY
 
 
+async def test_all_stations_flow(
+    hass: HomeAssistant, bypass_get_all_stations, bypass_get_station
+) -> None:
+    """Test that stations of an all stations entry are not added again."""
+    for station_id in (ALL_STATIONS, "167531"):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"api_version": "api_v2"}
+        )
+        with patch(
+            "custom_components.weatherlink.WLHubV2.authenticate",
+            return_value=True,
+        ):
+            result = await hass.config_entries.flow.async_configure(
+                result["flow_id"], {CONF_API_KEY_V2: "123", CONF_API_SECRET: "456"}
+            )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_STATION_ID: station_id}
+        )
+        if station_id == ALL_STATIONS:
+            assert result["type"] is FlowResultType.CREATE_ENTRY
+            assert result["result"].unique_id == all_stations_unique_id("123")
+            assert "123" not in result["result"].unique_id
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "station_in_all_stations"
+
+
 @pytest.mark.parametrize(
     ("exc", "key"),
     [
@@ -297,3 +336,25 @@ async def test_failed_flow_api_1(
         )
 
     assert result["errors"] == {"base": key}
+
+
+async def test_options_flow_local(hass: HomeAssistant) -> None:
+    """Test the real-time options of a local device."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={CONF_API_VERSION: "api_local", CONF_HOST: "192.168.1.2"},
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_REALTIME: True, CONF_REALTIME_INTERVAL: 10}
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options == {CONF_REALTIME: True, CONF_REALTIME_INTERVAL: 10}
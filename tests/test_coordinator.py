@@ -0,0 +1,246 @@
+"""Test the data update coordinator."""
+
+import asyncio
+import copy
+from datetime import timedelta
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.weatherlink.const import (
+    DISCONNECTED_AFTER_SECONDS,
+    DOMAIN,
+    UNAVAILABLE_AFTER_SECONDS,
+    DataKey,
+)
+from custom_components.weatherlink.coordinator import (
+    Staleness,
+    WLDataUpdateCoordinator,
+    changed_keys,
+    observation_fingerprint,
+)
+from custom_components.weatherlink.decoder import decode_current
+from custom_components.weatherlink.storage import SNAPSHOT_SAVE_DELAY, STORAGE_VERSION
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import as_current, setup_integration
+from .const import ENTRY_ID, MOCK_CONFIG_V2
+
+TS = 1735386900
+
+
+def test_fingerprint(load_default_data: dict) -> None:
+    """Test that the fingerprint follows lsid and timestamps of sensors."""
+    newer = copy.deepcopy(load_default_data)
+    newer["sensors"][2]["data"][0]["ts"] += 60
+
+    assert observation_fingerprint(load_default_data) == observation_fingerprint(
+        copy.deepcopy(load_default_data)
+    )
+    assert observation_fingerprint(load_default_data) != observation_fingerprint(newer)
+    assert observation_fingerprint({"observation_time_rfc822": "x"}) == ("x",)
+
+
+def test_fingerprint_typed(load_default_data: dict) -> None:
+    """Test the fingerprint of typed responses."""
+    newer = copy.deepcopy(load_default_data)
+    newer["sensors"][2]["data"][0]["ts"] += 60
+    regenerated = copy.deepcopy(load_default_data)
+    regenerated["generated_at"] += 60
+
+    assert observation_fingerprint(
+        as_current(load_default_data)
+    ) == observation_fingerprint(as_current(regenerated))
+    assert observation_fingerprint(
+        as_current(load_default_data)
+    ) != observation_fingerprint(as_current(newer))
+
+
+async def test_unchanged_refresh_skipped(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    load_default_data: dict,
+    bypass_get_all_stations,
+    bypass_get_all_sensors,
+    mock_api: MagicMock,
+) -> None:
+    """Test that refreshes without new observations are not decoded or notified."""
+    freezer.move_to(dt_util.utc_from_timestamp(TS + 60))
+    mock_api.return_value = load_default_data
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+    coordinator = entry.runtime_data.coordinator
+    data = coordinator.data
+    listener = MagicMock()
+    coordinator.async_add_listener(listener)
+
+    mock_api.return_value = copy.deepcopy(load_default_data)
+    with patch("custom_components.weatherlink.decode_current_struct") as mock_decode:
+        await coordinator.async_refresh()
+
+    mock_decode.assert_not_called()
+    assert coordinator.data is data
+    assert coordinator.unchanged_refreshes == 1
+    listener.assert_not_called()
+
+    freezer.tick(DISCONNECTED_AFTER_SECONDS)
+    await coordinator.async_refresh()
+
+    assert coordinator.unchanged_refreshes == 2
+    assert listener.call_count == 1
+
+    newer = copy.deepcopy(load_default_data)
+    newer["sensors"][2]["data"][0]["ts"] = TS + 300
+    mock_api.return_value = newer
+    await coordinator.async_refresh()
+
+    assert coordinator.unchanged_refreshes == 2
+    assert coordinator.data[1][DataKey.TIMESTAMP] == TS + 300
+    assert listener.call_count == 2
+
+
+def test_changed_keys() -> None:
+    """Test the per transmitter diff of decoded data."""
+    previous = {1: {DataKey.TEMP_OUT: 40.1, DataKey.HUM_OUT: 80}, DataKey.UUID: "a"}
+
+    assert changed_keys(previous, previous) == {}
+    assert changed_keys(
+        previous, {**previous, 1: {DataKey.TEMP_OUT: 40.2, DataKey.HUM_OUT: 80}}
+    ) == {1: {DataKey.TEMP_OUT}}
+    assert changed_keys(previous, {**previous, 1: {DataKey.TEMP_OUT: 40.1}}) == {
+        1: {DataKey.HUM_OUT}
+    }
+    assert changed_keys(previous, {**previous, 2: {}}) is None
+    assert changed_keys(previous, {**previous, DataKey.UUID: "b"}) is None
+
+
+async def test_only_changed_entities_written(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    load_default_data: dict,
+    bypass_get_all_stations,
+    bypass_get_all_sensors,
+    mock_api: MagicMock,
+) -> None:
+    """Test that only entities with changed values are written on refresh."""
+    freezer.move_to(dt_util.utc_from_timestamp(TS + 60))
+    mock_api.return_value = load_default_data
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+    reported = hass.states.get("sensor.strp81_outside_humidity").last_reported
+
+    newer = copy.deepcopy(load_default_data)
+    newer["sensors"][2]["data"][0]["ts"] = TS + 300
+    newer["sensors"][2]["data"][0]["temp"] = 50.0
+    mock_api.return_value = newer
+    freezer.tick(300)
+    await entry.runtime_data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.strp81_outside_temperature").state == "10.0"
+    assert hass.states.get("sensor.strp81_last_updated").last_updated == (
+        dt_util.utcnow()
+    )
+    assert hass.states.get("sensor.strp81_outside_humidity").last_reported == reported
+
+
+async def test_restore_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+    load_default_data: dict,
+    bypass_get_all_stations,
+    bypass_get_all_sensors,
+    mock_api: MagicMock,
+) -> None:
+    """Test that stored data is used until the first live refresh."""
+    freezer.move_to(dt_util.utc_from_timestamp(TS + 60))
+    stored = decode_current(load_default_data, 1)
+    stored[1][DataKey.TEMP_OUT] = 50.0
+    hass_storage[f"{DOMAIN}.{ENTRY_ID}.data"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{ENTRY_ID}.data",
+        "data": json.loads(json.dumps({"data": list(stored.items())})),
+    }
+    release = asyncio.Event()
+
+    async def get_data() -> dict:
+        await release.wait()
+        return load_default_data
+
+    mock_api.side_effect = get_data
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+
+    state = hass.states.get("sensor.strp81_outside_temperature")
+    assert state.state == "10.0"
+    assert state.attributes["assumed_state"] is True
+    assert entry.runtime_data.coordinator.restored
+
+    release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get("sensor.strp81_outside_temperature")
+    assert state.state == "4.5"
+    assert "assumed_state" not in state.attributes
+    assert "assumed_state" not in hass.states.get("sensor.strp81_pressure").attributes
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+    assert dict(hass_storage[f"{DOMAIN}.{ENTRY_ID}.data"]["data"]["data"]) == (
+        decode_current(load_default_data, 1)
+    )
+
+
+async def test_staleness_timer(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that transmitters pass staleness thresholds without a refresh."""
+    freezer.move_to(dt_util.utc_from_timestamp(TS + 60))
+    coordinator = WLDataUpdateCoordinator(
+        hass, update_method=AsyncMock(), update_interval=None
+    )
+    coordinator.data = coordinator.async_decode(
+        {"data": {"ts": TS}},
+        lambda _: {1: {DataKey.TIMESTAMP: TS}, 2: {DataKey.TIMESTAMP: TS + 600}},
+    )
+    first = MagicMock()
+    second = MagicMock()
+    coordinator.async_add_listener(first, (1, frozenset()))
+    coordinator.async_add_listener(second, (2, frozenset()))
+    assert coordinator.staleness == {1: Staleness.FRESH, 2: Staleness.FRESH}
+
+    freezer.move_to(dt_util.utc_from_timestamp(TS + DISCONNECTED_AFTER_SECONDS))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert coordinator.staleness == {1: Staleness.DISCONNECTED, 2: Staleness.FRESH}
+    assert first.call_count == 1
+    second.assert_not_called()
+
+    freezer.move_to(dt_util.utc_from_timestamp(TS + UNAVAILABLE_AFTER_SECONDS + 600))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert coordinator.staleness == {1: Staleness.UNAVAILABLE, 2: Staleness.UNAVAILABLE}
+    assert first.call_count == 2
+    # The second transmitter passed both thresholds since the last timer
+    assert second.call_count == 1
+
+    await coordinator.async_shutdown()
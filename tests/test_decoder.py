@@ -0,0 +1,104 @@
+"""Test the decoder for API v2 current observations."""
+
+import pytest
+
+from custom_components.weatherlink.const import DataKey
+from custom_components.weatherlink.decoder import (
+    OBSERVATION_MAPPINGS,
+    compile_mappings,
+    decode_current,
+)
+
+
+def test_decode_current(load_default_data: dict) -> None:
+    """Test decoding of the default station."""
+    data = decode_current(load_default_data, 1)
+
+    assert data[DataKey.UUID] == "03e7585a-4f29-4e7c-b6cb-d9e17313b07c"
+    assert set(data) == {1, DataKey.UUID}
+    assert data[1][DataKey.SENSOR_TYPE] == 37
+    assert data[1][DataKey.DATA_STRUCTURE] == 23
+    assert data[1][DataKey.TIMESTAMP] == 1735386900
+    assert data[1][DataKey.TEMP_OUT] == 40.1
+    assert data[1][DataKey.TEMP_IN] == 70.5
+    assert data[1][DataKey.BAR_SEA_LEVEL] == 30.181
+    assert data[1][DataKey.BAR_TREND] == -0.047
+    assert data[1][DataKey.RAIN_STORM] == 0.13385826
+
+
+@pytest.mark.parametrize(
+    ("bar_trend", "expected"), [(-47, -0.047), (None, None), (..., 0.0)]
+)
+def test_decode_bar_trend_structure_2(bar_trend, expected) -> None:
+    """Test that bar trend from a WeatherLink IP is scaled."""
+    record = {
+        "ts": 1735386900,
+        "temp_out": 40.1,
+        "temp_in": 70.5,
+        "bar": 30.181,
+        "hum_out": 80,
+        "hum_in": 36,
+        "wind_speed": 1,
+        "wind_gust_10_min": 2,
+        "wind_dir": 180,
+        "dew_point": 35.0,
+        "heat_index": 40.1,
+        "wind_chill": 40.1,
+        "rain_storm_in": None,
+        "rain_rate_in": 0,
+        "rain_month_in": 1.2,
+        "rain_year_in": 20.1,
+        "solar_rad": None,
+        "uv": None,
+        "et_day": 0,
+        "et_month": 0,
+        "et_year": 0,
+        **{f"temp_extra_{numb}": None for numb in range(1, 8)},
+        **{f"hum_extra_{numb}": None for numb in range(1, 8)},
+        **{f"temp_leaf_{numb}": None for numb in range(1, 5)},
+        **{f"temp_soil_{numb}": None for numb in range(1, 5)},
+        **{f"moist_soil_{numb}": None for numb in range(1, 5)},
+        **{f"wet_leaf_{numb}": None for numb in range(1, 5)},
+    }
+    if bar_trend is not ...:
+        record["bar_trend"] = bar_trend
+    payload = {
+        "station_id_uuid": "uuid",
+        "sensors": [
+            {
+                "lsid": 1,
+                "sensor_type": 43,
+                "data_structure_type": 2,
+                "data": [record],
+            }
+        ],
+    }
+
+    data = decode_current(payload, 1)
+
+    assert data[1][DataKey.BAR_TREND] == expected
+    assert data[1][DataKey.RAIN_STORM] == 0.0
+    assert data[1][DataKey.RAIN_DAY] is None
+
+
+def test_decode_skips_unknown_sensors() -> None:
+    """Test that unsupported sensors are ignored."""
+    payload = {
+        "station_id_uuid": "uuid",
+        "sensors": [
+            {
+                "lsid": 1,
+                "sensor_type": 509,
+                "data_structure_type": 27,
+                "data": [{"ts": 1735386300}],
+            }
+        ],
+    }
+
+    assert decode_current(payload, 1) == {1: {}, DataKey.UUID: "uuid"}
+
+
+def test_compile_rejects_duplicate_mappings() -> None:
+    """Test that overlapping mappings are detected at compile time."""
+    with pytest.raises(ValueError):
+        compile_mappings((*OBSERVATION_MAPPINGS, OBSERVATION_MAPPINGS[0]))
@@ -0,0 +1,64 @@
+"""Tests for the values derived from decoded observations."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from custom_components.weatherlink.const import DataKey
+from custom_components.weatherlink.derived import derive_transmitter, derive_values
+
+
+@pytest.mark.parametrize(
+    ("source", "value", "key", "expected"),
+    [
+        (DataKey.WIND_GUST_MPH, -1.0, DataKey.WIND_GUST_MPH_VALID, None),
+        (DataKey.WIND_GUST_MPH, 12.0, DataKey.WIND_GUST_MPH_VALID, 12.0),
+        (DataKey.WIND_DIR, 350, DataKey.WIND_DIR_CARDINAL, "n"),
+        (DataKey.WIND_DIR, 236.0, DataKey.WIND_DIR_CARDINAL, "sw"),
+        (DataKey.BAR_TREND, 0.07, DataKey.BAR_TREND_CATEGORY, "rising_rapidly"),
+        (DataKey.BAR_TREND, -0.03, DataKey.BAR_TREND_CATEGORY, "falling_slowly"),
+        (
+            DataKey.BAR_TREND,
+            "Falling Slowly",
+            DataKey.BAR_TREND_CATEGORY,
+            "falling_slowly",
+        ),
+        (DataKey.TIMESTAMP, 0, DataKey.LAST_UPDATE, datetime(1970, 1, 1, tzinfo=UTC)),
+        (DataKey.TIMESTAMP, None, DataKey.LAST_UPDATE, None),
+        # Malformed values leave the derived value empty
+        (DataKey.WIND_DIR, "calm", DataKey.WIND_DIR_CARDINAL, None),
+        (DataKey.WIND_GUST_MPH, [], DataKey.WIND_GUST_MPH_VALID, None),
+        (DataKey.TIMESTAMP, "now", DataKey.LAST_UPDATE, None),
+    ],
+)
+def test_derive_transmitter(
+    source: DataKey, value: float | str | None, key: DataKey, expected
+) -> None:
+    """Test the derived values of a transmitter."""
+    values = {source: value}
+    derive_transmitter(values)
+    assert values == {source: value, key: expected}
+
+
+def test_derive_values() -> None:
+    """Test that derived values follow the values they are derived from."""
+    data = {
+        DataKey.UUID: "uuid",
+        1: {DataKey.WIND_DIR: 90, DataKey.TEMP: 50.0},
+        2: {DataKey.TEMP: 60.0},
+    }
+    assert derive_values(data) is data
+    assert data[1] == {
+        DataKey.WIND_DIR: 90,
+        DataKey.WIND_DIR_CARDINAL: "e",
+        DataKey.TEMP: 50.0,
+    }
+    assert data[2] == {DataKey.TEMP: 60.0}
+
+    # Pushed values replace the derived values of their transmitter
+    data[1][DataKey.WIND_DIR] = 180
+    derive_transmitter(data[1])
+    assert data[1][DataKey.WIND_DIR_CARDINAL] == "s"
+    del data[1][DataKey.WIND_DIR]
+    derive_transmitter(data[1])
+    assert DataKey.WIND_DIR_CARDINAL not in data[1]
@@ -21,7 +21,7 @@ async def test_diagnostics(
     hass_client: ClientSessionGenerator,
     snapshot: SnapshotAssertion,
     bypass_get_data,
-    bypass_get_station,
+    bypass_get_all_stations,
     bypass_get_all_sensors,
 ) -> None:
     """Test diagnostics."""
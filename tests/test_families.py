@@ -0,0 +1,184 @@
+"""Tests for the coordinators of sensor families."""
+
+from collections.abc import Generator
+import copy
+from datetime import timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.weatherlink import refreshing_coordinators, sensor_families
+from custom_components.weatherlink.const import DOMAIN, DataKey, SensorFamily
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from . import as_current, setup_integration
+from .const import ENTRY_ID, MOCK_CONFIG_V2
+
+# pylint: disable=redefined-outer-name
+
+AIRLINK_LSID = 716449
+TS = 1735386900
+
+
+def test_sensor_families(load_sensors: dict) -> None:
+    """Test classification of the sensors of a station."""
+    families = sensor_families(load_sensors["sensors"])
+    assert families[AIRLINK_LSID] is SensorFamily.AIRLINK
+    assert families[2] is SensorFamily.SOIL_LEAF
+    # The ISS is refreshed by the coordinator of the entry
+    assert 1 not in families
+
+
+@pytest.fixture
+def station(load_sensors: dict, load_default_data: dict) -> Generator[dict]:
+    """Add an AirLink to the Strp81 station."""
+    airlink = next(
+        sensor for sensor in load_sensors["sensors"] if sensor["lsid"] == AIRLINK_LSID
+    )
+    sensors = {
+        **load_sensors,
+        "sensors": [
+            *load_sensors["sensors"],
+            {**airlink, "station_id": 167531},
+        ],
+    }
+    current = copy.deepcopy(load_default_data)
+    current["sensors"].append(
+        {
+            "lsid": AIRLINK_LSID,
+            "sensor_type": 323,
+            "data_structure_type": 16,
+            "data": [
+                {
+                    "ts": TS,
+                    "temp": 60.1,
+                    "hum": 40.2,
+                    "dew_point": 35.0,
+                    "heat_index": 59.0,
+                    "wet_bulb": 45.0,
+                    "pm_1": 1.0,
+                    "pm_2p5": 2.5,
+                    "pm_2p5_24_hour": 3.0,
+                    "pm_10": 10.0,
+                    "pm_10_24_hour": 9.0,
+                    "aqi_val": 10.4,
+                    "aqi_nowcast_val": 11.2,
+                }
+            ],
+        }
+    )
+    requests = []
+
+    async def get_current(hub):
+        requests.append(hub.station_id)
+        return as_current(current)
+
+    with (
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_current",
+            get_current,
+        ),
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_all_sensors",
+            return_value=sensors,
+        ),
+    ):
+        yield {"current": current, "requests": requests}
+
+
+async def test_family_refresh(
+    hass: HomeAssistant,
+    bypass_get_all_stations,
+    station: dict,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that a family is refreshed and written on its own."""
+    freezer.move_to(dt_util.utc_from_timestamp(TS + 60))
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+    runtime_data = entry.runtime_data
+    airlink = runtime_data.families[SensorFamily.AIRLINK]
+    assert set(runtime_data.families) == {SensorFamily.AIRLINK}
+    assert airlink.data is runtime_data.coordinator.data
+
+    pm_entity = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{airlink.data[DataKey.UUID]}-{AIRLINK_LSID}-PM2P5"
+    )
+    temp_entity = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{airlink.data[DataKey.UUID]}-OutsideTemp"
+    )
+    assert hass.states.get(pm_entity).state == "2.5"
+    temp = hass.states.get(temp_entity).state
+
+    for sensor in station["current"]["sensors"]:
+        for record in sensor["data"]:
+            record["ts"] += 60
+            if "pm_2p5" in record:
+                record["pm_2p5"] = 5.0
+            if "temp" in record:
+                record["temp"] += 10
+
+    requests = len(station["requests"])
+    freezer.tick(timedelta(seconds=61))
+    await airlink.async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(station["requests"]) == requests + 1
+    assert hass.states.get(pm_entity).state == "5.0"
+    # The ISS waits for the next upload
+    assert hass.states.get(temp_entity).state == temp
+    assert timedelta(seconds=30) <= airlink.update_interval <= timedelta(seconds=90)
+
+
+@pytest.mark.parametrize(
+    ("interval", "consumers"), [(60, 2), (900, 1)], ids=["own_fetch", "entry_only"]
+)
+async def test_family_takes_entry_refresh(
+    hass: HomeAssistant,
+    bypass_get_all_stations,
+    station: dict,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+    interval: int,
+    consumers: int,
+) -> None:
+    """Test that a family takes the refreshes of the entry."""
+    freezer.move_to(dt_util.utc_from_timestamp(TS + 60))
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    with patch.dict(
+        "custom_components.weatherlink.FAMILY_UPDATE_INTERVAL",
+        {SensorFamily.AIRLINK: interval},
+    ):
+        await setup_integration(hass, entry)
+    runtime_data = entry.runtime_data
+    airlink = runtime_data.families[SensorFamily.AIRLINK]
+    # The upload period of the station is 10 minutes
+    assert (airlink.update_interval is not None) is (interval < 600)
+    assert refreshing_coordinators(hass, runtime_data.account) == consumers
+
+    pm_entity = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{airlink.data[DataKey.UUID]}-{AIRLINK_LSID}-PM2P5"
+    )
+    for sensor in station["current"]["sensors"]:
+        for record in sensor["data"]:
+            record["ts"] += 600
+            if "pm_2p5" in record:
+                record["pm_2p5"] = 5.0
+
+    requests = len(station["requests"])
+    freezer.tick(timedelta(seconds=600))
+    await runtime_data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(station["requests"]) == requests + 1
+    assert airlink.data is runtime_data.coordinator.data
+    assert hass.states.get(pm_entity).state == "5.0"
@@ -1,23 +1,31 @@
 """Test initial setup."""
 
-from unittest.mock import MagicMock
+from time import time
+from typing import Any
+from unittest.mock import MagicMock, patch
 
-from aiohttp import ClientResponseError
+from aiohttp import ClientError, ClientResponseError
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.weatherlink import async_unload_entry
+from custom_components.weatherlink.cache import RESPONSE_CACHES
 from custom_components.weatherlink.const import DOMAIN
+from custom_components.weatherlink.ratelimit import RATE_LIMITERS
+from custom_components.weatherlink.retry import CIRCUIT_BREAKERS
+from custom_components.weatherlink.storage import METADATA_TTL, STORAGE_VERSION
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 
 from . import setup_integration
 from .const import ENTRY_ID, MOCK_CONFIG_V2
 
 
 async def test_setup_entry(
-    hass: HomeAssistant, bypass_get_station, bypass_get_data, bypass_get_all_sensors
+    hass: HomeAssistant,
+    bypass_get_all_stations,
+    bypass_get_data,
+    bypass_get_all_sensors,
 ) -> None:
     """Test setup entry."""
     entry = MockConfigEntry(
@@ -27,13 +35,13 @@ async def test_setup_entry(
 
     assert entry.state is ConfigEntryState.LOADED
 
-    assert await async_unload_entry(hass, entry)
+    assert await hass.config_entries.async_unload(entry.entry_id)
     assert DOMAIN not in hass.data
 
 
 async def test_devices_created_count(
     hass: HomeAssistant,
-    bypass_get_station,
+    bypass_get_all_stations,
     bypass_get_data,
     bypass_get_all_sensors,
 ) -> None:
@@ -52,7 +60,7 @@ async def test_devices_created_count(
 @pytest.mark.parametrize("exception", [ClientResponseError, TimeoutError])
 async def test_api_error(
     hass: HomeAssistant,
-    bypass_get_station,
+    bypass_get_all_stations,
     bypass_get_all_sensors,
     exception: Exception,
     mock_api: MagicMock,
@@ -67,3 +75,159 @@ async def test_api_error(
     await hass.async_block_till_done()
 
     assert entry.state is ConfigEntryState.SETUP_RETRY
+
+
+async def test_account_metadata_shared(
+    hass: HomeAssistant,
+    load_all_stations: dict,
+    load_sensors: dict,
+    bypass_get_data,
+) -> None:
+    """Test that entries on the same API key fetch account metadata once."""
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=2,
+            data={**MOCK_CONFIG_V2, "station_id": station_id},
+            entry_id=f"{ENTRY_ID}_{station_id}",
+        )
+        for station_id in ("167531", "167376")
+    ]
+    with (
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_all_stations",
+            return_value=load_all_stations,
+        ) as mock_stations,
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_all_sensors",
+            return_value=load_sensors,
+        ) as mock_sensors,
+    ):
+        for entry in entries:
+            await setup_integration(hass, entry)
+
+    assert [entry.state for entry in entries] == [ConfigEntryState.LOADED] * 2
+    assert mock_stations.call_count == 1
+    assert mock_sensors.call_count == 1
+    assert [len(entry.runtime_data.sensors_metadata) for entry in entries] == [4, 4]
+    # The budget of the shared key is shown once
+    assert [
+        registry_entry.config_entry_id
+        for registry_entry in er.async_get(hass).entities.values()
+        if registry_entry.unique_id.endswith("-ApiBudget")
+    ] == [entries[0].entry_id]
+
+    await hass.config_entries.async_unload(entries[0].entry_id)
+    assert MOCK_CONFIG_V2["api_key_v2"] in hass.data[RATE_LIMITERS]
+    assert hass.data[RESPONSE_CACHES]
+
+    await hass.config_entries.async_unload(entries[1].entry_id)
+    assert DOMAIN not in hass.data
+    assert RATE_LIMITERS not in hass.data
+    assert RESPONSE_CACHES not in hass.data
+    assert CIRCUIT_BREAKERS not in hass.data
+
+
+def stored_metadata(
+    load_all_stations: dict, load_sensors: dict, saved_at: float
+) -> dict[str, Any]:
+    """Return stored metadata for the default station."""
+    return {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{ENTRY_ID}",
+        "data": {
+            "station_data": {
+                "stations": [
+                    station
+                    for station in load_all_stations["stations"]
+                    if station["station_id"] == 167531
+                ],
+                "generated_at": load_all_stations["generated_at"],
+            },
+            "sensors": [
+                sensor
+                for sensor in load_sensors["sensors"]
+                if sensor["station_id"] == 167531
+            ],
+            "saved_at": saved_at,
+        },
+    }
+
+
+async def test_setup_from_stored_metadata(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    load_all_stations: dict,
+    load_sensors: dict,
+    bypass_get_data,
+) -> None:
+    """Test that stored metadata is used while the cloud is unreachable."""
+    hass_storage[f"{DOMAIN}.{ENTRY_ID}"] = stored_metadata(
+        load_all_stations, load_sensors, time()
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    with patch(
+        "custom_components.weatherlink.pyweatherlink.WLHubV2.get_all_stations",
+        side_effect=ClientError,
+    ) as mock_stations:
+        await setup_integration(hass, entry)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert mock_stations.call_count == 1
+    assert len(entry.runtime_data.sensors_metadata) == 4
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    assert f"{DOMAIN}.{ENTRY_ID}" not in hass_storage
+
+
+async def test_expired_metadata_fetched(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    load_all_stations: dict,
+    load_sensors: dict,
+    bypass_get_data,
+) -> None:
+    """Test that expired metadata is not used."""
+    hass_storage[f"{DOMAIN}.{ENTRY_ID}"] = stored_metadata(
+        load_all_stations, load_sensors, time() - METADATA_TTL - 1
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    with patch(
+        "custom_components.weatherlink.pyweatherlink.WLHubV2.get_all_stations",
+        side_effect=ClientError,
+    ):
+        await setup_integration(hass, entry)
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+
+
+@pytest.mark.parametrize(("remove", "reloads"), [(0, 0), (1, 1)])
+async def test_revalidate_stored_metadata(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    load_all_stations: dict,
+    load_sensors: dict,
+    bypass_get_all_stations,
+    bypass_get_all_sensors,
+    bypass_get_data,
+    remove: int,
+    reloads: int,
+) -> None:
+    """Test that a changed topology reloads the entry."""
+    stored = stored_metadata(load_all_stations, load_sensors, time() - 60)
+    del stored["data"]["sensors"][:remove]
+    hass_storage[f"{DOMAIN}.{ENTRY_ID}"] = stored
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_reload:
+        await setup_integration(hass, entry)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert mock_reload.call_count == reloads
+    assert len(hass_storage[f"{DOMAIN}.{ENTRY_ID}"]["data"]["sensors"]) == 4
@@ -0,0 +1,225 @@
+"""Tests for the local API of WeatherLink Live and AirLink."""
+
+from collections.abc import AsyncGenerator
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry, load_fixture
+
+from custom_components.weatherlink.const import (
+    CONF_API_VERSION,
+    DOMAIN,
+    SENSOR_TYPE_AIRLINK,
+    DataKey,
+)
+from custom_components.weatherlink.decoder import decode_local, local_metadata
+from homeassistant import config_entries
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util.json import json_loads
+
+# pylint: disable=redefined-outer-name
+
+AIRLINK_CONDITIONS = {
+    "data": {
+        "did": "001D0A100021",
+        "ts": 1735386900,
+        "conditions": [
+            {
+                "lsid": 347824,
+                "data_structure_type": 6,
+                "temp": 78.0,
+                "hum": 41.7,
+                "dew_point": 52.6,
+                "wet_bulb": 60.0,
+                "heat_index": 77.8,
+                "pm_1": 1.0,
+                "pm_2p5": 1.3,
+                "pm_2p5_last_24_hours": 1.4,
+                "pm_10": 2.0,
+                "pm_10_last_24_hours": 2.2,
+            }
+        ],
+    },
+    "error": None,
+}
+
+
+@pytest.fixture(name="local_conditions")
+def local_conditions_fixture() -> dict:
+    """Load current conditions of a WeatherLink Live."""
+    return json_loads(load_fixture("wll_current_conditions.json"))
+
+
+@pytest.fixture(name="local_device")
+async def local_device_fixture(
+    local_conditions: dict, socket_enabled: None
+) -> AsyncGenerator[TestServer]:
+    """Serve the recorded conditions like a device on the local network."""
+
+    async def current_conditions(request: web.Request) -> web.Response:
+        requests.append(request.path)
+        return web.json_response(local_conditions)
+
+    requests: list[str] = []
+    app = web.Application()
+    app.router.add_get("/v1/current_conditions", current_conditions)
+    server = TestServer(app, host="127.0.0.1")
+    server.requests = requests
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+def test_decode_local(local_conditions: dict) -> None:
+    """Test decoding of local conditions."""
+    data = decode_local(local_conditions, 1)
+
+    assert data[DataKey.UUID] == "001D0A700002"
+    assert data[1][DataKey.TEMP_OUT] == 40.1
+    assert data[1][DataKey.TIMESTAMP] == 1735386900
+    assert data[1][DataKey.TEMP_IN] == 70.5
+    assert data[1][DataKey.BAR_SEA_LEVEL] == 30.008
+    # Rain counts of a 0.2 mm collector are converted to inches
+    assert data[1][DataKey.RAIN_DAY] == pytest.approx(10 * 0.2 / 25.4, abs=1e-4)
+    assert data[1][DataKey.RAIN_YEAR] == pytest.approx(1270 * 0.2 / 25.4, abs=1e-4)
+    assert data[3][f"{DataKey.MOIST_SOIL}_1"] == 23
+    assert data[3][f"{DataKey.TEMP}_2"] == 41.0
+
+
+def test_decode_local_without_bar_trend(local_conditions: dict) -> None:
+    """Test that a barometer without 3 hours of history is decoded."""
+    barometer = next(
+        condition
+        for condition in local_conditions["data"]["conditions"]
+        if condition["data_structure_type"] == 3
+    )
+    barometer["bar_trend"] = None
+
+    data = decode_local(local_conditions, 1)
+
+    assert data[1][DataKey.BAR_SEA_LEVEL] == 30.008
+    assert data[1][DataKey.BAR_TREND] is None
+
+
+def test_local_metadata(local_conditions: dict) -> None:
+    """Test that local devices are described like API v2 stations."""
+    station_data, sensors = local_metadata(local_conditions, "WLL")
+
+    assert station_data["stations"][0]["gateway_id_hex"] == "001D0A700002"
+    assert station_data["stations"][0]["product_number"] == "6100"
+    assert sorted((sensor["tx_id"], sensor["sensor_type"]) for sensor in sensors) == [
+        (1, 55),
+        (3, 56),
+    ]
+
+
+def test_local_airlink() -> None:
+    """Test that a local AirLink is described and decoded by its lsid."""
+    data = decode_local(AIRLINK_CONDITIONS, 1)
+    station_data, sensors = local_metadata(AIRLINK_CONDITIONS, "AirLink")
+
+    assert data[1] == {}
+    assert data[347824][DataKey.PM_2P5] == 1.3
+    assert data[347824][DataKey.TEMP] == 78.0
+    assert station_data["stations"][0]["product_number"] == "7210"
+    assert sensors == [
+        {
+            "lsid": 347824,
+            "tx_id": None,
+            "sensor_type": SENSOR_TYPE_AIRLINK[0],
+            "product_name": "AirLink",
+            "parent_device_name": "001D0A100021",
+        }
+    ]
+
+
+async def test_setup_local_entry(
+    hass: HomeAssistant, local_device: TestServer, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test setup of an entry polling a device on the local network."""
+    freezer.move_to("2024-12-28 12:00:00+00:00")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        title="WLL",
+        data={
+            CONF_API_VERSION: "api_local",
+            CONF_HOST: f"{local_device.host}:{local_device.port}",
+        },
+        unique_id="001D0A700002",
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert local_device.requests
+    assert hass.states.get("sensor.wll_outside_temperature").state == "4.5"
+    assert float(
+        hass.states.get("sensor.wll_inside_temperature").state
+    ) == pytest.approx(21.4, abs=0.05)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_local_flow(hass: HomeAssistant, local_device: TestServer) -> None:
+    """Test the config flow of a local device."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"api_version": "api_local"}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "user_local"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: "127.0.0.1:1"}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "cannot_connect"}
+
+    host = f"{local_device.host}:{local_device.port}"
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: host}
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "WeatherLink Live 001D0A700002"
+    assert result["data"] == {CONF_API_VERSION: "api_local", CONF_HOST: host}
+    assert result["result"].unique_id == "001D0A700002"
+
+
+async def test_local_airlink_entry(
+    hass: HomeAssistant,
+    local_conditions: dict,
+    local_device: TestServer,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that a local AirLink gets its own device and entities."""
+    freezer.move_to("2024-12-28 12:00:00+00:00")
+    local_conditions.update(AIRLINK_CONDITIONS)
+    host = f"{local_device.host}:{local_device.port}"
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"api_version": "api_local"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: host}
+    )
+    await hass.async_block_till_done()
+
+    assert result["title"] == "AirLink 001D0A100021"
+    device = dr.async_get(hass).async_get_device({(DOMAIN, "001D0A100021")})
+    assert device.model == "AirLink"
+    assert hass.states.get("sensor.airlink_001d0a100021_pm2_5").state == "1.3"
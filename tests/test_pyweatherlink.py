@@ -0,0 +1,72 @@
+"""Tests for the Weatherlink API library."""
+
+import json
+from unittest.mock import patch
+
+from aiohttp import ClientPayloadError, ClientSession, web
+from aiohttp.test_utils import TestServer
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.weatherlink import pyweatherlink
+from custom_components.weatherlink.pyweatherlink import read_json
+
+
+@pytest.fixture(name="server")
+async def server_fixture(socket_enabled: None):
+    """Serve the bundled fixtures as raw bytes."""
+
+    async def fixture(request: web.Request) -> web.Response:
+        return web.Response(
+            body=load_fixture(request.match_info["name"]).encode(),
+            content_type="application/json",
+        )
+
+    async def invalid(request: web.Request) -> web.Response:
+        return web.Response(body=b'{"sensors": [', content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/invalid", invalid)
+    app.router.add_get("/{name}", fixture)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.mark.parametrize("name", ["sensors.json", "strp81_current.json"])
+@pytest.mark.parametrize("loads", [pyweatherlink.json_loads, json.loads])
+async def test_read_json(server: TestServer, name: str, loads) -> None:
+    """Test that the fast and the stdlib decoder give the same result."""
+    async with ClientSession() as session:
+        res = await session.get(server.make_url(f"/{name}"))
+        data = await read_json(res, loads, offload=True)
+
+    assert data == json.loads(load_fixture(name))
+
+
+async def test_read_json_offload(server: TestServer) -> None:
+    """Test that only large responses are decoded in the executor."""
+    async with ClientSession() as session:
+        with patch.object(
+            pyweatherlink.asyncio.get_running_loop(),
+            "run_in_executor",
+            wraps=pyweatherlink.asyncio.get_running_loop().run_in_executor,
+        ) as run_in_executor:
+            res = await session.get(server.make_url("/sensors.json"))
+            await read_json(res, offload=True)
+            assert run_in_executor.call_count == 1
+
+            res = await session.get(server.make_url("/strp81_current.json"))
+            await read_json(res, offload=True)
+            res = await session.get(server.make_url("/sensors.json"))
+            await read_json(res)
+            assert run_in_executor.call_count == 1
+
+
+async def test_read_json_invalid(server: TestServer) -> None:
+    """Test that invalid JSON is reported as a client error."""
+    async with ClientSession() as session:
+        res = await session.get(server.make_url("/invalid"))
+        with pytest.raises(ClientPayloadError):
+            await read_json(res)
@@ -0,0 +1,187 @@
+"""Tests for the rate limiter shared per API key."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.weatherlink.const import DOMAIN, DataKey
+from custom_components.weatherlink.ratelimit import (
+    BUDGET_WINDOW,
+    WLRateLimiter,
+    async_get_rate_limiter,
+)
+from custom_components.weatherlink.sensor import API_BUDGET_STEP
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from . import setup_integration
+from .const import ENTRY_ID, MOCK_CONFIG_V2
+
+
+class FakeClock:
+    """Monotonic clock advanced by the sleeps of the limiter."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        """Advance the clock instead of sleeping."""
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+async def test_token_bucket() -> None:
+    """Test that a burst passes and further requests are spaced out."""
+    clock = FakeClock()
+    limiter = WLRateLimiter(rate=10, burst=5, budget=100)
+    with (
+        patch("custom_components.weatherlink.ratelimit.monotonic", clock),
+        patch("custom_components.weatherlink.ratelimit.asyncio.sleep", clock.sleep),
+    ):
+        for _ in range(5):
+            await limiter.acquire()
+        assert clock.sleeps == []
+
+        await limiter.acquire()
+        await limiter.acquire()
+        assert clock.sleeps == pytest.approx([0.1, 0.1])
+        assert limiter.throttled == 2
+
+        # The bucket refills while idle
+        clock.now += 10
+        clock.sleeps.clear()
+        for _ in range(5):
+            await limiter.acquire()
+        assert clock.sleeps == []
+
+
+async def test_hourly_budget() -> None:
+    """Test accounting of the hourly budget and the suggested interval."""
+    clock = FakeClock()
+    limiter = WLRateLimiter(rate=1000, burst=1000, budget=100)
+    calls = []
+    remove = limiter.async_add_listener(lambda: calls.append(limiter.remaining))
+    with patch("custom_components.weatherlink.ratelimit.monotonic", clock):
+        # Fair share of 80 planned refreshes per hour between two consumers
+        assert limiter.suggested_interval(2) == 90
+
+        for _ in range(80):
+            await limiter.acquire()
+            clock.now += 1
+        assert limiter.used == 80
+        assert limiter.remaining == 20
+        assert calls[-1] == 20
+
+        # The planned share is used, wait for the oldest request to expire
+        assert limiter.suggested_interval(2) == BUDGET_WINDOW - 80
+
+        # Requests expire an hour after they were made
+        clock.now = 1000 + BUDGET_WINDOW + 9.5
+        assert limiter.used == 70
+        assert limiter.suggested_interval(2) == 90
+
+    remove()
+    await limiter.acquire()
+    assert len(calls) == 80
+
+
+async def test_shared_per_api_key(
+    hass: HomeAssistant,
+    bypass_get_all_stations,
+    bypass_get_data,
+    bypass_get_all_sensors,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test that hubs of an API key share a limiter shown by a sensor."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+
+    limiter = async_get_rate_limiter(hass, MOCK_CONFIG_V2["api_key_v2"])
+    assert entry.runtime_data.api.limiter is limiter
+    assert entry.runtime_data.account.api.limiter is limiter
+
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor",
+        DOMAIN,
+        f"{entry.runtime_data.coordinator.data[DataKey.UUID]}-ApiBudget",
+    )
+    written = limiter.remaining
+    assert hass.states.get(entity_id).state == str(written)
+
+    # The state is written when the requests left cross a step
+    for _ in range(written % API_BUDGET_STEP):
+        await limiter.acquire()
+        assert hass.states.get(entity_id).state == str(written)
+    await limiter.acquire()
+    state = hass.states.get(entity_id)
+    assert state.state == str(limiter.remaining)
+    assert state.attributes["hourly_budget"] == 1000
+
+
+async def test_budget_released(
+    hass: HomeAssistant,
+    bypass_get_all_stations,
+    bypass_get_data,
+    bypass_get_all_sensors,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that the budget is written when requests leave the window."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+    limiter = async_get_rate_limiter(hass, MOCK_CONFIG_V2["api_key_v2"])
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor",
+        DOMAIN,
+        f"{entry.runtime_data.coordinator.data[DataKey.UUID]}-ApiBudget",
+    )
+    for _ in range(API_BUDGET_STEP):
+        await limiter.acquire()
+    assert int(hass.states.get(entity_id).state) < limiter.budget
+
+    freezer.tick(timedelta(seconds=BUDGET_WINDOW + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).state == str(limiter.budget)
+
+
+async def test_budget_stretches_update_interval(
+    hass: HomeAssistant,
+    bypass_get_all_stations,
+    bypass_get_data,
+    bypass_get_all_sensors,
+) -> None:
+    """Test that the coordinator waits for the budget to free up."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.update_interval < timedelta(minutes=30)
+
+    with patch.object(
+        entry.runtime_data.api.limiter,
+        "suggested_interval",
+        return_value=1800,
+    ) as suggested_interval:
+        await coordinator.async_refresh()
+
+    suggested_interval.assert_called_once_with(1)
+    assert coordinator.update_interval == timedelta(minutes=30)
@@ -0,0 +1,226 @@
+"""Tests for the real-time broadcast listener of WeatherLink Live."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+import json
+import socket
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    load_fixture,
+)
+
+from custom_components.weatherlink.const import (
+    CONF_API_VERSION,
+    CONF_REALTIME_INTERVAL,
+    DOMAIN,
+    DataKey,
+)
+from custom_components.weatherlink.decoder import decode_realtime
+from custom_components.weatherlink.realtime import REALTIME_RENEW_INTERVAL
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.json import json_loads
+
+# pylint: disable=redefined-outer-name
+
+DID = "001D0A700002"
+
+
+def realtime_packet(wind_speed: float, rainfall_daily: int = 10) -> dict:
+    """Return a real-time broadcast packet."""
+    return {
+        "did": DID,
+        "ts": 1735387200,
+        "conditions": [
+            {
+                "lsid": 48308,
+                "data_structure_type": 1,
+                "txid": 1,
+                "wind_speed_last": wind_speed,
+                "wind_dir_last": 190,
+                "wind_speed_hi_last_10_min": 9,
+                "wind_dir_at_hi_speed_last_10_min": 195,
+                "rain_size": 2,
+                "rain_rate_last": 0,
+                "rain_15_min": 0,
+                "rain_60_min": 0,
+                "rain_24_hr": 12,
+                "rain_storm": 12,
+                "rain_storm_start_at": 1735340400,
+                "rainfall_daily": rainfall_daily,
+                "rainfall_monthly": 254,
+                "rainfall_year": 1270,
+            }
+        ],
+    }
+
+
+@pytest.fixture(name="broadcast_port")
+def broadcast_port_fixture(socket_enabled: None) -> int:
+    """Return a free UDP port for the broadcast."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(name="local_device")
+async def local_device_fixture(
+    broadcast_port: int, socket_enabled: None
+) -> AsyncGenerator[TestServer]:
+    """Serve the local API of a WeatherLink Live."""
+    conditions = json_loads(load_fixture("wll_current_conditions.json"))
+    leases: list[str] = []
+
+    async def current_conditions(request: web.Request) -> web.Response:
+        return web.json_response(conditions)
+
+    async def real_time(request: web.Request) -> web.Response:
+        leases.append(request.query["duration"])
+        return web.json_response(
+            {
+                "data": {
+                    "broadcast_port": broadcast_port,
+                    "duration": int(request.query["duration"]),
+                },
+                "error": None,
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get("/v1/current_conditions", current_conditions)
+    app.router.add_get("/v1/real_time", real_time)
+    server = TestServer(app, host="127.0.0.1")
+    server.leases = leases
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+async def send_packets(port: int, packets: list[dict]) -> None:
+    """Send packets from a local UDP sender."""
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol, remote_addr=("127.0.0.1", port)
+    )
+    for packet in packets:
+        transport.sendto(json.dumps(packet).encode())
+    transport.close()
+
+
+async def wait_for_packets(listener, count: int) -> None:
+    """Wait until the listener received count packets."""
+    for _ in range(1000):
+        if listener.packets >= count:
+            return
+        await asyncio.sleep(0)
+    raise AssertionError(f"Received {listener.packets} of {count} packets")
+
+
+def test_decode_realtime() -> None:
+    """Test decoding of a broadcast packet."""
+    updates = decode_realtime(realtime_packet(12))
+
+    assert updates[1][DataKey.WIND_MPH] == 12
+    assert updates[1][DataKey.WIND_GUST_MPH] == 9
+    assert updates[1][DataKey.RAIN_DAY] == pytest.approx(10 * 0.2 / 25.4, abs=1e-4)
+    assert DataKey.TEMP_OUT not in updates[1]
+    assert DataKey.TIMESTAMP not in updates[1]
+
+
+async def test_realtime_broadcast(
+    hass: HomeAssistant,
+    local_device: TestServer,
+    broadcast_port: int,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that broadcast packets are merged and state writes coalesced."""
+    freezer.move_to("2024-12-28 12:00:00+00:00")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        title="WLL",
+        data={
+            CONF_API_VERSION: "api_local",
+            CONF_HOST: f"{local_device.host}:{local_device.port}",
+        },
+        options={CONF_REALTIME_INTERVAL: 5},
+        unique_id=DID,
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    listener = entry.runtime_data.realtime
+    assert listener is not None
+    assert local_device.leases == ["1200"]
+
+    wind_changes = []
+
+    @callback
+    def state_changed(event: Event) -> None:
+        if event.data["entity_id"] == "sensor.wll_wind":
+            wind_changes.append(event.data["new_state"].state)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+    temp = hass.states.get("sensor.wll_outside_temperature").state
+
+    await send_packets(
+        broadcast_port,
+        [realtime_packet(10), realtime_packet(14), realtime_packet(20, 15)],
+    )
+    await wait_for_packets(listener, 3)
+    await hass.async_block_till_done()
+
+    # Nothing is written until the interval has passed
+    assert wind_changes == []
+
+    freezer.tick(5)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    data = entry.runtime_data.coordinator.data
+    assert data[1][DataKey.WIND_MPH] == 20
+    assert data[1][DataKey.RAIN_DAY] == pytest.approx(15 * 0.2 / 25.4, abs=1e-4)
+    assert len(wind_changes) == 1
+    assert hass.states.get("sensor.wll_outside_temperature").state == temp
+
+    freezer.tick(REALTIME_RENEW_INTERVAL)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert local_device.leases == ["1200", "1200"]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert listener._transport is None  # noqa: SLF001
+
+
+async def test_realtime_not_available(
+    hass: HomeAssistant, local_device: TestServer, broadcast_port: int
+) -> None:
+    """Test that the entry keeps polling when the port is in use."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("0.0.0.0", broadcast_port))  # noqa: S104
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            version=2,
+            title="WLL",
+            data={
+                CONF_API_VERSION: "api_local",
+                CONF_HOST: f"{local_device.host}:{local_device.port}",
+            },
+            unique_id=DID,
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert entry.runtime_data.realtime is None
@@ -0,0 +1,184 @@
+"""Tests for retries and circuit breaking of API v2 requests."""
+
+from collections.abc import AsyncGenerator
+from unittest.mock import patch
+
+from aiohttp import ClientResponseError, ClientSession, web
+from aiohttp.test_utils import TestServer
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.weatherlink.pyweatherlink import WLHubV2
+from custom_components.weatherlink.retry import (
+    CircuitState,
+    RetryPolicy,
+    WLCircuitBreaker,
+    WLCircuitOpenError,
+    parse_retry_after,
+)
+
+# pylint: disable=redefined-outer-name
+
+FAST_RETRY = RetryPolicy(attempts=3, backoff=0.01, max_backoff=0.05, timeout=5)
+
+
+@pytest.fixture(name="server")
+async def server_fixture(socket_enabled: None) -> AsyncGenerator[TestServer]:
+    """Serve /current, answering with the queued failures first."""
+    failures: list[web.Response] = []
+    requests: list[str] = []
+
+    async def current(request: web.Request) -> web.Response:
+        requests.append(request.path)
+        if failures:
+            return failures.pop(0)
+        return web.Response(
+            body=load_fixture("strp81_current.json").encode(),
+            content_type="application/json",
+        )
+
+    app = web.Application()
+    app.router.add_get("/v2/current/{station_id}", current)
+    server = TestServer(app, host="127.0.0.1")
+    server.failures = failures
+    server.requests = requests
+    await server.start_server()
+    with patch(
+        "custom_components.weatherlink.pyweatherlink.API_V2_URL",
+        str(server.make_url("/v2/")),
+    ):
+        yield server
+    await server.close()
+
+
+def make_hub(
+    session: ClientSession,
+    retry: RetryPolicy = FAST_RETRY,
+    breaker: WLCircuitBreaker | None = None,
+) -> WLHubV2:
+    """Return a hub of the test station."""
+    return WLHubV2(
+        api_key_v2="key",
+        api_secret="secret",
+        websession=session,
+        station_id="167531",
+        retry=retry,
+        breaker=breaker,
+    )
+
+
+async def test_retry_transient_errors(server: TestServer) -> None:
+    """Test that server errors are retried until a response succeeds."""
+    server.failures.extend([web.Response(status=502), web.Response(status=503)])
+    async with ClientSession() as session:
+        hub = make_hub(session)
+        current = await hub.get_current()
+
+    assert current.station_id_uuid
+    assert len(server.requests) == 3
+    assert hub.stats.requests == 3
+    assert hub.stats.retries == 2
+    assert hub.stats.failures == 0
+    assert hub.breaker.state is CircuitState.CLOSED
+
+
+async def test_retry_gives_up(server: TestServer) -> None:
+    """Test that the last error is raised when all attempts failed."""
+    server.failures.extend([web.Response(status=500) for _ in range(3)])
+    async with ClientSession() as session:
+        hub = make_hub(session)
+        with pytest.raises(ClientResponseError) as err:
+            await hub.get_current()
+
+    assert err.value.status == 500
+    assert len(server.requests) == 3
+    assert hub.stats.failures == 1
+
+
+async def test_client_errors_not_retried(server: TestServer) -> None:
+    """Test that client errors fail at once and keep the circuit closed."""
+    server.failures.append(web.Response(status=401))
+    async with ClientSession() as session:
+        hub = make_hub(session)
+        with pytest.raises(ClientResponseError):
+            await hub.get_current()
+
+    assert len(server.requests) == 1
+    assert hub.breaker.failures == 0
+
+
+async def test_retry_after(server: TestServer) -> None:
+    """Test that Retry-After is honored and long delays are not waited for."""
+    server.failures.append(web.Response(status=429, headers={"Retry-After": "0"}))
+    async with ClientSession() as session:
+        hub = make_hub(session)
+        await hub.get_current()
+        assert len(server.requests) == 2
+
+        server.failures.append(
+            web.Response(status=429, headers={"Retry-After": "3600"})
+        )
+        with pytest.raises(ClientResponseError) as err:
+            await hub.get_current()
+
+    assert err.value.status == 429
+    assert len(server.requests) == 3
+
+
+def test_retry_policy() -> None:
+    """Test the backoff delays."""
+    policy = RetryPolicy(attempts=4, backoff=1, max_backoff=3)
+    for _ in range(20):
+        assert 0 <= policy.delay(1) <= 1
+        assert 0 <= policy.delay(2) <= 2
+        assert 0 <= policy.delay(3) <= 3
+    assert policy.delay(4) is None
+    assert policy.delay(1, retry_after=2) == 2
+    assert policy.delay(1, retry_after=10) is None
+    assert policy.deadline == 4 * 10 + 3 * 3
+
+
+def test_parse_retry_after() -> None:
+    """Test parsing of both forms of Retry-After."""
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+
+
+async def test_circuit_breaker(server: TestServer) -> None:
+    """Test that requests fail fast while the API is down."""
+    breaker = WLCircuitBreaker("api", failure_threshold=2, reset_timeout=60)
+    now = 1000.0
+    server.failures.extend([web.Response(status=503) for _ in range(3)])
+    async with ClientSession() as session:
+        hub = make_hub(session, RetryPolicy(attempts=1), breaker)
+        with patch(
+            "custom_components.weatherlink.retry.monotonic", side_effect=lambda: now
+        ):
+            for _ in range(2):
+                with pytest.raises(ClientResponseError):
+                    await hub.get_current()
+            assert breaker.state is CircuitState.OPEN
+            assert breaker.trips == 1
+
+            with pytest.raises(WLCircuitOpenError):
+                await hub.get_current()
+            assert len(server.requests) == 2
+            assert breaker.rejected == 1
+
+            # A failed trial request opens the circuit again
+            now += 60
+            with pytest.raises(ClientResponseError):
+                await hub.get_current()
+            assert breaker.state is CircuitState.OPEN
+            with pytest.raises(WLCircuitOpenError):
+                await hub.get_current()
+
+            now += 60
+            await hub.get_current()
+
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failures == 0
+    assert breaker.trips == 1
+    assert len(server.requests) == 4
@@ -0,0 +1,88 @@
+"""Test the refresh scheduler."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.weatherlink.const import DOMAIN
+from custom_components.weatherlink.scheduler import (
+    DEFAULT_PERIOD,
+    MAX_DELAY,
+    MIN_DELAY,
+    UPLOAD_MARGIN,
+    UploadScheduler,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import setup_integration
+from .const import ENTRY_ID, MOCK_CONFIG_V2
+
+TS = 1735386900
+
+
+def test_period_from_recording_interval() -> None:
+    """Test that the period is seeded from station metadata."""
+    assert UploadScheduler(15).period == 900
+    assert UploadScheduler(0).period == DEFAULT_PERIOD
+    assert UploadScheduler(None).period == DEFAULT_PERIOD
+
+
+def test_refresh_after_expected_upload() -> None:
+    """Test that the next refresh follows the next expected upload."""
+    scheduler = UploadScheduler(5)
+
+    assert scheduler.update(TS, now=TS + 40) == timedelta(
+        seconds=300 + UPLOAD_MARGIN - 40
+    )
+    assert scheduler.next_expected(TS + 40) == TS + 300
+
+
+def test_period_learned_from_timestamps() -> None:
+    """Test that the period is learned and not stretched by missed uploads."""
+    scheduler = UploadScheduler(5)
+
+    scheduler.update(TS, now=TS + 10)
+    scheduler.update(TS + 60, now=TS + 70)
+    scheduler.update(TS + 180, now=TS + 190)
+
+    assert scheduler.period == 60
+    assert scheduler.update(TS + 240, now=TS + 250) == timedelta(
+        seconds=60 + UPLOAD_MARGIN - 10
+    )
+
+
+def test_backoff_while_not_advancing() -> None:
+    """Test that refreshes back off while timestamps stay the same."""
+    scheduler = UploadScheduler(5)
+    scheduler.update(TS, now=TS + 10)
+
+    delays = [scheduler.update(TS, now=TS + 320).total_seconds() for _ in range(7)]
+
+    assert delays == [MIN_DELAY * 2**n for n in range(5)] + [MAX_DELAY] * 2
+    assert scheduler.misses == 7
+
+    assert scheduler.update(TS + 3000, now=TS + 3005) == timedelta(
+        seconds=300 + UPLOAD_MARGIN - 5
+    )
+    assert scheduler.misses == 0
+
+
+async def test_coordinator_interval_follows_upload(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    bypass_get_all_stations,
+    bypass_get_data,
+    bypass_get_all_sensors,
+) -> None:
+    """Test that the coordinator schedules the refresh after the next upload."""
+    freezer.move_to(dt_util.utc_from_timestamp(TS + 100))
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+
+    assert entry.runtime_data.coordinator.update_interval == timedelta(
+        seconds=300 + UPLOAD_MARGIN - 100
+    )
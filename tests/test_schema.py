@@ -0,0 +1,64 @@
+"""Tests for the typed decoding of /current responses."""
+
+import copy
+
+import pytest
+
+from custom_components.weatherlink.const import DataKey
+from custom_components.weatherlink.decoder import decode_current
+from custom_components.weatherlink.schema import RECORD_PLANS, decode_current_struct
+
+from . import as_current
+
+
+def test_decode_current_struct(load_default_data: dict) -> None:
+    """Test that typed decoding gives the same data as the dict decoder."""
+    assert decode_current_struct(as_current(load_default_data), 1) == decode_current(
+        load_default_data, 1
+    )
+
+
+@pytest.mark.parametrize(
+    "structure", [2, 6, 10, 12, 16, 19, 21, 23, 25], ids=lambda ds: f"ds{ds}"
+)
+def test_record_plans(structure: int) -> None:
+    """Test that each supported data structure type has a typed record."""
+    assert any(ds == structure for _, ds in RECORD_PLANS)
+
+
+def test_invalid_record_skipped(load_default_data: dict) -> None:
+    """Test that an invalid record drops only its own sensor."""
+    payload = copy.deepcopy(load_default_data)
+    # Break the ISS record and add an unknown field to the barometer record
+    del payload["sensors"][2]["data"][0]["tx_id"]
+    payload["sensors"][1]["data"][0]["unknown_field"] = {"nested": [1, 2, 3]}
+
+    data = decode_current_struct(as_current(payload), 1)
+
+    assert DataKey.TEMP_OUT not in data[1]
+    assert (
+        data[1][DataKey.BAR_SEA_LEVEL]
+        == (load_default_data["sensors"][1]["data"][0]["bar_sea_level"])
+    )
+    with pytest.raises(KeyError):
+        decode_current(payload, 1)
+
+
+def test_wrong_type_decoded_as_dicts(load_default_data: dict) -> None:
+    """Test that a record with a value of an unexpected type falls back to dicts."""
+    payload = copy.deepcopy(load_default_data)
+    payload["sensors"][2]["data"][0]["temp"] = {"value": 1}
+
+    data = decode_current_struct(as_current(payload), 1)
+
+    assert data == decode_current(payload, 1)
+    assert data[1][DataKey.TEMP_OUT] == {"value": 1}
+    assert data[1][DataKey.HUM_OUT] == load_default_data["sensors"][2]["data"][0]["hum"]
+
+
+def test_bool_value(load_default_data: dict) -> None:
+    """Test that booleans are accepted by the typed records."""
+    payload = copy.deepcopy(load_default_data)
+    payload["sensors"][2]["data"][0]["temp"] = True
+
+    assert decode_current_struct(as_current(payload), 1)[1][DataKey.TEMP_OUT] is True
@@ -1,7 +1,9 @@
 """Provide tests for weatherlink sensors."""
 
-from unittest.mock import patch
+import copy
+from unittest.mock import MagicMock, Mock, patch
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
@@ -9,20 +11,28 @@ from pytest_homeassistant_custom_component.common import (
 )
 from syrupy import SnapshotAssertion
 
-from custom_components.weatherlink.const import DOMAIN
+from custom_components.weatherlink.const import DOMAIN, DataKey
+from custom_components.weatherlink.sensor import (
+    WLSensorDescription,
+    rain_storm_attributes,
+    value_accessor,
+)
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
 
 from . import setup_integration
 from .const import ENTRY_ID, MOCK_CONFIG_V2
 
+TS = 1735386900
+
 
 @pytest.mark.usefixtures("entity_registry_enabled_by_default")
 async def test_sensor(
     hass: HomeAssistant,
     bypass_get_data,
-    bypass_get_station,
+    bypass_get_all_stations,
     bypass_get_all_sensors,
     snapshot: SnapshotAssertion,
     entity_registry: er.EntityRegistry,
@@ -59,3 +69,81 @@ async def test_sensor(
 #         await setup_integration(hass, mock_config_entry)
 
 #     await snapshot_platform(hass, entity_registry, snapshot, mock_config_entry.entry_id)
+
+
+def test_value_accessor() -> None:
+    """Test that the value getter follows the data of the coordinator."""
+    coordinator = Mock(data={1: {DataKey.WIND_DIR_CARDINAL: "sw"}})
+    description = WLSensorDescription(key="WindDir", tag=DataKey.WIND_DIR_CARDINAL)
+    get_value = value_accessor(coordinator, 1, description)
+    assert get_value() == "sw"
+
+    coordinator.data = {1: {}}
+    assert get_value() is None
+
+
+async def test_attributes_memoized(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    load_default_data: dict,
+    bypass_get_all_stations,
+    bypass_get_all_sensors,
+    mock_api: MagicMock,
+) -> None:
+    """Test that unchanged storm times reuse the attributes of an entity."""
+    freezer.move_to(dt_util.utc_from_timestamp(TS + 60))
+    mock_api.return_value = load_default_data
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    with (
+        patch("custom_components.weatherlink.PLATFORMS", [Platform.SENSOR]),
+        patch(
+            "custom_components.weatherlink.sensor.rain_storm_attributes",
+            wraps=rain_storm_attributes,
+        ) as mock_build,
+    ):
+        await setup_integration(hass, entry)
+        entity = hass.data["sensor"].get_entity("sensor.strp81_rain_storm")
+        attributes = entity.extra_state_attributes
+        assert attributes["rain_storm_start"].timestamp() == 1735331847
+
+        for rain_storm in (0.2, 0.3):
+            newer = copy.deepcopy(load_default_data)
+            newer["sensors"][2]["data"][0]["ts"] += 300
+            newer["sensors"][2]["data"][0]["rain_storm_current_in"] = rain_storm
+            mock_api.return_value = newer
+            freezer.tick(300)
+            await entry.runtime_data.coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert float(hass.states.get("sensor.strp81_rain_storm").state) == (
+                pytest.approx(rain_storm * 25.4)
+            )
+            assert entity.extra_state_attributes is attributes
+
+    # Three states were written, the attributes were built once
+    assert mock_build.call_count == 1
+
+
+async def test_device_info_shared(
+    hass: HomeAssistant,
+    bypass_get_data,
+    bypass_get_all_stations,
+    bypass_get_all_sensors,
+) -> None:
+    """Test that the entities of a transmitter share its device info."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    with patch("custom_components.weatherlink.PLATFORMS", [Platform.SENSOR]):
+        await setup_integration(hass, entry)
+
+    topology = entry.runtime_data.topology
+    entities = [
+        entity
+        for entity in hass.data["sensor"].entities
+        if getattr(entity, "tx_id", None) == entry.runtime_data.primary_tx_id
+    ]
+    assert len(entities) > 1
+    device_info = topology.device(entry.runtime_data.primary_tx_id).device_info
+    assert all(entity.device_info is device_info for entity in entities)
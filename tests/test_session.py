@@ -0,0 +1,71 @@
+"""Tests for the HTTP session of the integration."""
+
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestServer
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.weatherlink.const import DOMAIN
+from custom_components.weatherlink.session import (
+    ACCEPT_ENCODING,
+    SESSION,
+    async_acquire_session,
+    async_release_session,
+    create_session,
+)
+from homeassistant.core import HomeAssistant
+
+from .const import MOCK_CONFIG_V2
+
+
+async def test_shared_until_last_release(hass: HomeAssistant) -> None:
+    """Test that entries share the session and the last release closes it."""
+    first = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG_V2)
+    second = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG_V2)
+
+    shared = async_acquire_session(hass, first)
+    assert async_acquire_session(hass, second) is shared
+
+    await async_release_session(hass, first)
+    assert not shared.session.closed
+
+    await async_release_session(hass, second)
+    assert shared.session.closed
+    assert SESSION not in hass.data
+
+
+async def test_request_timings(socket_enabled: None) -> None:
+    """Test that timings are recorded and connections are kept alive."""
+    encodings = []
+
+    async def current(request: web.Request) -> web.Response:
+        encodings.append(request.headers[hdrs.ACCEPT_ENCODING])
+        return web.json_response({"sensors": [{"lsid": lsid} for lsid in range(500)]})
+
+    app = web.Application()
+    app.router.add_get("/v2/current", current)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+
+    session, timings = create_session()
+    try:
+        for _ in range(2):
+            async with session.get(server.make_url("/v2/current")) as res:
+                await res.read()
+    finally:
+        await session.close()
+        await server.close()
+
+    assert encodings == [ACCEPT_ENCODING] * 2
+    first, second = timings.recent
+    assert first.connect is not None
+    assert not first.reused
+    assert second.reused
+    assert second.connect is None
+    assert first.status == 200
+    assert first.headers is not None
+    assert first.transfer is not None
+
+    summary = timings.as_dict()
+    assert summary["requests"] == 2
+    assert summary["reused"] == 1
+    assert summary["connect_ms"] is not None
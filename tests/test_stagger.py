@@ -0,0 +1,82 @@
+"""Tests for staggering of refreshes across config entries."""
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.weatherlink.const import DOMAIN
+from custom_components.weatherlink.stagger import (
+    STAGGER_WINDOW,
+    WLRefreshStagger,
+    async_get_stagger,
+)
+from homeassistant.core import HomeAssistant
+
+from . import setup_integration
+from .const import ENTRY_ID, MOCK_CONFIG_V2
+
+
+def test_slots_spread_evenly() -> None:
+    """Test that slots are spread evenly and do not depend on setup order."""
+    stations = [str(station_id) for station_id in range(100000, 100200)]
+    stagger = WLRefreshStagger()
+    for station_id in stations:
+        stagger.async_add(f"entry_{station_id}", station_id)
+    fractions = sorted(stagger.fraction(f"entry_{station}") for station in stations)
+    assert fractions == [index / 200 for index in range(200)]
+
+    reversed_stagger = WLRefreshStagger()
+    for station_id in reversed(stations):
+        reversed_stagger.async_add(f"entry_{station_id}", station_id)
+    assert all(
+        reversed_stagger.fraction(f"entry_{station_id}")
+        == stagger.fraction(f"entry_{station_id}")
+        for station_id in stations
+    )
+
+
+def test_slots_respread() -> None:
+    """Test that slots are spread again when entries are added or removed."""
+    stagger = WLRefreshStagger()
+    stagger.async_add("a", "167531")
+    assert stagger.fraction("a") == 0
+
+    remove = stagger.async_add("b", "167532")
+    assert sorted((stagger.fraction("a"), stagger.fraction("b"))) == [0, 0.5]
+
+    remove()
+    assert stagger.fraction("a") == 0
+    assert len(stagger) == 1
+    assert stagger.fraction("b") == 0
+
+
+def test_delay() -> None:
+    """Test the delay until the next slot of an entry."""
+    stagger = WLRefreshStagger()
+    stagger.async_add("a", "167531")
+    stagger.async_add("b", "167532")
+    first, second = sorted(("a", "b"), key=stagger.fraction)
+
+    assert stagger.delay(first, 1000, 10) == 10
+    assert stagger.delay(second, 1000, 10) == 5
+    # A refresh that ran a little early does not run again at once
+    assert stagger.delay(second, 1004.9, 10) == pytest.approx(10.1)
+    assert stagger.delay(second, 1005.1, 10) == pytest.approx(9.9)
+
+
+async def test_entry_slot(
+    hass: HomeAssistant,
+    bypass_get_all_stations,
+    bypass_get_data,
+    bypass_get_all_sensors,
+) -> None:
+    """Test that an entry holds a slot while loaded."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2, data=MOCK_CONFIG_V2, entry_id=ENTRY_ID
+    )
+    await setup_integration(hass, entry)
+    stagger = async_get_stagger(hass)
+    assert len(stagger) == 1
+    assert stagger.offset(ENTRY_ID, STAGGER_WINDOW) == 0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert len(stagger) == 0
@@ -0,0 +1,83 @@
+"""Tests for the index of station metadata."""
+
+import pytest
+
+from custom_components.weatherlink.const import DOMAIN, ApiVersion, DataKey
+from custom_components.weatherlink.station_index import build_topology, gateway_type
+
+
+def station_metadata(
+    stations: dict, sensors: dict, station_id: int
+) -> tuple[dict, list[dict]]:
+    """Return station data and sensors of a station of the fixtures."""
+    return (
+        {
+            "stations": [
+                station
+                for station in stations["stations"]
+                if station["station_id"] == station_id
+            ]
+        },
+        [sensor for sensor in sensors["sensors"] if sensor["station_id"] == station_id],
+    )
+
+
+def test_devices(load_all_stations: dict, load_sensors: dict) -> None:
+    """Test names, models and identifiers of the devices of a station."""
+    station_data, sensors = station_metadata(load_all_stations, load_sensors, 75649)
+    topology = build_topology(
+        ApiVersion.API_V2, station_data, sensors, 7, {DataKey.UUID: "uuid"}
+    )
+
+    primary = topology.device(7)
+    assert primary.device_id == "uuid"
+    assert primary.device_info["name"] == "Weather on Tjörn"
+    assert primary.device_info["model"] == (
+        "WLL 6100EU / Vantage Pro2 Plus, includes UV & Solar Radiation Sensors"
+    )
+    assert primary.device_info["via_device"] is None
+
+    soil = topology.device(2)
+    assert soil.device_id == "uuid-2"
+    assert soil.device_info["name"] == "Leaf/Soil ID2"
+    assert soil.device_info["model"] == "Leaf/Soil"
+    assert soil.device_info["via_device"] == (DOMAIN, "uuid")
+    # All entities of a transmitter share its device info
+    assert topology.device(2).device_info is soil.device_info
+
+    assert [sensor.lsid for sensor in topology.by_tx_id[2]] == [251000]
+    assert topology.by_lsid[251000].sensor_type == 56
+    with pytest.raises(TypeError):
+        topology.by_lsid[0] = topology.by_lsid[251000]
+
+
+def test_airlink_station(load_all_stations: dict, load_sensors: dict) -> None:
+    """Test that an AirLink without an ISS is the device of the station."""
+    station_data, sensors = station_metadata(load_all_stations, load_sensors, 183139)
+    topology = build_topology(
+        ApiVersion.API_V2, station_data, sensors, 1, {DataKey.UUID: "uuid", 1: {}}
+    )
+
+    airlink = topology.device(716449)
+    assert airlink.is_airlink
+    assert airlink.device_id == "uuid"
+    assert airlink.device_info["name"] == "AirLink Saltsjö-Duvnäs AQ"
+
+
+def test_api_v1() -> None:
+    """Test the device of an API v1 station."""
+    topology = build_topology(
+        ApiVersion.API_V1, {}, [], 1, {1: {"DID": "did", "station_name": "Home"}}
+    )
+    device = topology.device(1)
+    assert device.device_id == "did"
+    assert device.device_info["name"] == "Home"
+    assert device.device_info["model"] == "WeatherLink - API V1"
+
+
+def test_gateway_type() -> None:
+    """Test gateway types of product numbers."""
+    assert gateway_type("6555") == "WLIP 6555"
+    assert gateway_type("6313ABC") == "WLC 6313ABC"
+    assert gateway_type("7210") == "AirLink 7210"
+    assert gateway_type(None) == "WeatherLink"
@@ -0,0 +1,223 @@
+"""Tests for entries polling all stations on an API key."""
+
+import asyncio
+from collections.abc import Generator
+import copy
+from unittest.mock import patch
+
+from aiohttp import ClientConnectionError
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.weatherlink.const import ALL_STATIONS, DOMAIN, DataKey
+from custom_components.weatherlink.schema import Current
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from . import as_current, setup_integration
+from .const import MOCK_CONFIG_V2
+
+# pylint: disable=redefined-outer-name
+
+STATION_IDS = ("167531", "167532", "167533")
+MOCK_CONFIG_ALL = {**MOCK_CONFIG_V2, "station_id": ALL_STATIONS}
+
+
+def station_uuid(station_id: str) -> str:
+    """Return the uuid of a test station."""
+    return f"03e7585a-4f29-4e7c-b6cb-d9e17313{station_id[-4:]}"
+
+
+class FakeApi:
+    """Copies of the Strp81 station served with failures and concurrency."""
+
+    def __init__(self, stations: dict, sensors: dict, current: dict) -> None:
+        """Initialize."""
+        strp81 = next(
+            station
+            for station in stations["stations"]
+            if station["station_id"] == 167531
+        )
+        strp81_sensors = [
+            sensor for sensor in sensors["sensors"] if sensor["station_id"] == 167531
+        ]
+        self.stations = {**stations, "stations": []}
+        self.sensors = {**sensors, "sensors": []}
+        for index, station_id in enumerate(STATION_IDS):
+            self.stations["stations"].append(
+                {
+                    **strp81,
+                    "station_id": int(station_id),
+                    "station_id_uuid": station_uuid(station_id),
+                    "station_name": f"Station {index + 1}",
+                }
+            )
+            self.sensors["sensors"] += [
+                {**sensor, "station_id": int(station_id)} for sensor in strp81_sensors
+            ]
+        self.current = current
+        self.failing: set[str] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests: list[str] = []
+
+    async def get_current(self, hub) -> Current:
+        """Return the current conditions of the station of a hub."""
+        self.requests.append(hub.station_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if hub.station_id in self.failing:
+                raise ClientConnectionError
+            current = copy.deepcopy(self.current)
+            current["station_id"] = int(hub.station_id)
+            current["station_id_uuid"] = station_uuid(hub.station_id)
+            return as_current(current)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def fake_api(
+    load_all_stations: dict, load_sensors: dict, load_default_data: dict
+) -> Generator[FakeApi]:
+    """Serve three copies of the Strp81 station."""
+    api = FakeApi(load_all_stations, load_sensors, load_default_data)
+
+    async def get_current(hub) -> Current:
+        return await api.get_current(hub)
+
+    async def get_all_stations(hub) -> dict:
+        return api.stations
+
+    async def get_all_sensors(hub) -> dict:
+        return api.sensors
+
+    with (
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_current",
+            get_current,
+        ),
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_all_stations",
+            get_all_stations,
+        ),
+        patch(
+            "custom_components.weatherlink.pyweatherlink.WLHubV2.get_all_sensors",
+            get_all_sensors,
+        ),
+    ):
+        yield api
+
+
+def temperature_entity(entity_registry: er.EntityRegistry, station_id: str) -> str:
+    """Return the outside temperature entity of a station."""
+    return entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{station_uuid(station_id)}-OutsideTemp"
+    )
+
+
+async def test_all_stations(
+    hass: HomeAssistant,
+    fake_api: FakeApi,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test that each station gets a device and entities of its own."""
+    entry = MockConfigEntry(domain=DOMAIN, version=2, data=MOCK_CONFIG_ALL)
+    await setup_integration(hass, entry)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert sorted(fake_api.requests) == list(STATION_IDS)
+    assert fake_api.max_in_flight == len(STATION_IDS)
+    for index, station_id in enumerate(STATION_IDS):
+        station = entry.runtime_data.stations[station_id]
+        assert station.coordinator.data[DataKey.UUID] == station_uuid(station_id)
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, station_uuid(station_id))}
+        )
+        assert device.name == f"Station {index + 1}"
+        assert hass.states.get(temperature_entity(entity_registry, station_id))
+
+    assert entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{station_uuid(STATION_IDS[0])}-ApiBudget"
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_concurrency_limit(hass: HomeAssistant, fake_api: FakeApi) -> None:
+    """Test that stations are fetched under a bounded semaphore."""
+    entry = MockConfigEntry(domain=DOMAIN, version=2, data=MOCK_CONFIG_ALL)
+    with patch("custom_components.weatherlink.STATIONS_CONCURRENCY", 2):
+        await setup_integration(hass, entry)
+
+    assert len(fake_api.requests) == len(STATION_IDS)
+    assert fake_api.max_in_flight == 2
+
+
+async def test_failing_station(
+    hass: HomeAssistant,
+    fake_api: FakeApi,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that a failing station does not fail the others."""
+    freezer.move_to(
+        dt_util.utc_from_timestamp(fake_api.current["sensors"][0]["data"][0]["ts"])
+    )
+    entry = MockConfigEntry(domain=DOMAIN, version=2, data=MOCK_CONFIG_ALL)
+    await setup_integration(hass, entry)
+    coordinator = entry.runtime_data.coordinator
+
+    fake_api.failing.add(STATION_IDS[1])
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    states = [
+        hass.states.get(temperature_entity(entity_registry, station_id)).state
+        for station_id in STATION_IDS
+    ]
+    assert states[1] == STATE_UNAVAILABLE
+    assert STATE_UNAVAILABLE not in (states[0], states[2])
+
+    fake_api.failing.clear()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert (
+        hass.states.get(temperature_entity(entity_registry, STATION_IDS[1])).state
+        == states[0]
+    )
+
+    # The entry only fails when no station could be fetched
+    fake_api.failing.update(STATION_IDS)
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+
+async def test_station_with_own_entry(
+    hass: HomeAssistant,
+    fake_api: FakeApi,
+    device_registry: dr.DeviceRegistry,
+) -> None:
+    """Test that stations with an entry of their own are left to it."""
+    MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data=MOCK_CONFIG_V2,
+        unique_id=STATION_IDS[0],
+    ).add_to_hass(hass)
+    entry = MockConfigEntry(domain=DOMAIN, version=2, data=MOCK_CONFIG_ALL)
+    await setup_integration(hass, entry)
+
+    assert list(entry.runtime_data.stations) == list(STATION_IDS[1:])
+    device = device_registry.async_get_device(
+        identifiers={(DOMAIN, station_uuid(STATION_IDS[0]))}
+    )
+    assert entry.entry_id not in device.config_entries